@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_enrichment_pending"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "items",
+        sa.Column(
+            "enrichment_pending",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_items_enrichment_pending", "items", ["enrichment_pending"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_enrichment_pending", table_name="items")
+    op.drop_column("items", "enrichment_pending")
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_enrichment_provenance"
+down_revision = "0002_enrichment_pending"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("classified_with", sa.String(length=128), nullable=True))
+    op.add_column("items", sa.Column("embedded_with", sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("items", "embedded_with")
+    op.drop_column("items", "classified_with")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+
+from src.db.partitions import DEFAULT_PARTITION, KEYS_TABLE, add_months, month_start, months_between
+
+revision = "0004_partition_items"
+down_revision = "0003_enrichment_provenance"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# A partitioned table can only enforce uniqueness that includes published_at,
+# so item_keys claims each source_id globally. A row whose source_id is already
+# claimed is pinned to the claimed published_at, which turns a re-ingested post
+# into a conflict on (source_id, published_at) the upsert can resolve. Rows
+# cannot move between partitions from inside the trigger (PostgreSQL 13+ is
+# required for BEFORE row triggers on partitioned tables): crud and bulk_load
+# pin published_at before inserting, and a row that still claims another month
+# (a concurrent writer) is skipped with a warning rather than failing the batch.
+CLAIM_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION items_claim_source_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    claimed timestamptz;
+BEGIN
+    INSERT INTO {KEYS_TABLE} (source_id, published_at, item_id)
+    VALUES (NEW.source_id, NEW.published_at, NEW.id)
+    ON CONFLICT (source_id) DO NOTHING;
+    IF NOT FOUND THEN
+        SELECT published_at INTO claimed FROM {KEYS_TABLE} WHERE source_id = NEW.source_id;
+        IF date_trunc('month', claimed AT TIME ZONE 'UTC')
+                <> date_trunc('month', NEW.published_at AT TIME ZONE 'UTC') THEN
+            RAISE WARNING 'items: % is stored under %, skipping row dated %',
+                NEW.source_id, claimed, NEW.published_at;
+            RETURN NULL;
+        END IF;
+        NEW.published_at := claimed;
+    END IF;
+    RETURN NEW;
+END $$
+"""
+
+RELEASE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION items_release_source_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM {KEYS_TABLE} WHERE source_id = OLD.source_id;
+        RETURN OLD;
+    END IF;
+    UPDATE {KEYS_TABLE} SET source_id = NEW.source_id, published_at = NEW.published_at
+    WHERE source_id = OLD.source_id;
+    RETURN NEW;
+END $$
+"""
+
+INDEXES = (
+    "CREATE INDEX ix_items_source_published_at ON items (source, published_at)",
+    "CREATE INDEX ix_items_topics ON items USING gin (topics)",
+    "CREATE INDEX ix_items_enrichment_pending ON items (enrichment_pending)",
+)
+INDEX_NAMES = ("ix_items_source_published_at", "ix_items_topics", "ix_items_enrichment_pending")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite keeps the plain table with a unique source_id.
+        return
+
+    op.execute("ALTER TABLE items RENAME TO items_unpartitioned")
+    # Free the constraint and index names for the new table; the old one is dropped below.
+    op.execute(
+        "ALTER TABLE items_unpartitioned DROP CONSTRAINT IF EXISTS items_pkey, "
+        "DROP CONSTRAINT IF EXISTS items_source_id_key"
+    )
+    for name in INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(
+        "CREATE TABLE items (LIKE items_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (published_at)"
+    )
+    op.execute("ALTER TABLE items ADD PRIMARY KEY (id, published_at)")
+    op.execute(
+        "ALTER TABLE items ADD CONSTRAINT uq_items_source_id_published_at "
+        "UNIQUE (source_id, published_at)"
+    )
+    for statement in INDEXES:
+        op.execute(statement)
+
+    now = datetime.now(tz=timezone.utc)
+    oldest = bind.exec_driver_sql("SELECT min(published_at) FROM items_unpartitioned").scalar()
+    for partition in months_between(oldest or now, add_months(month_start(now), MONTHS_AHEAD)):
+        op.execute(partition.create_sql())
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF items DEFAULT")
+    op.execute("INSERT INTO items SELECT * FROM items_unpartitioned")
+
+    op.execute(
+        f"CREATE TABLE {KEYS_TABLE} ("
+        "source_id varchar(255) PRIMARY KEY, "
+        "published_at timestamptz NOT NULL, "
+        "item_id uuid NOT NULL)"
+    )
+    op.execute(f"CREATE INDEX ix_{KEYS_TABLE}_published_at ON {KEYS_TABLE} (published_at)")
+    op.execute(
+        f"INSERT INTO {KEYS_TABLE} (source_id, published_at, item_id) "
+        "SELECT source_id, published_at, id FROM items"
+    )
+    op.execute(CLAIM_FUNCTION)
+    op.execute(RELEASE_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER items_claim_source_id BEFORE INSERT ON items "
+        "FOR EACH ROW EXECUTE FUNCTION items_claim_source_id()"
+    )
+    op.execute(
+        "CREATE TRIGGER items_release_source_id "
+        "AFTER UPDATE OF source_id, published_at OR DELETE ON items "
+        "FOR EACH ROW EXECUTE FUNCTION items_release_source_id()"
+    )
+    op.execute("DROP TABLE items_unpartitioned")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE TABLE items_unpartitioned (LIKE items INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO items_unpartitioned SELECT * FROM items")
+    op.execute("DROP TABLE items")
+    op.execute(f"DROP TABLE {KEYS_TABLE}")
+    op.execute("DROP FUNCTION items_claim_source_id()")
+    op.execute("DROP FUNCTION items_release_source_id()")
+    op.execute("ALTER TABLE items_unpartitioned RENAME TO items")
+    op.execute("ALTER TABLE items ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE items ADD CONSTRAINT items_source_id_key UNIQUE (source_id)")
+    for statement in INDEXES:
+        op.execute(statement)
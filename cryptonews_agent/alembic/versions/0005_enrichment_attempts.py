@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_enrichment_attempts"
+down_revision = "0004_partition_items"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "items",
+        sa.Column("enrichment_attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("items", "enrichment_attempts")
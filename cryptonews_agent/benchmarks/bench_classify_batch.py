@@ -0,0 +1,118 @@
+"""Compare per-item and batched classification throughput against a fake client.
+
+Run from the project root::
+
+    python -m benchmarks.bench_classify_batch --items 400 --batch-size 8
+
+The fake server charges a fixed per-request overhead plus prefill time per
+prompt token and decode time per output token, and serves a bounded number of
+requests at once, which is roughly how a single local inference box behaves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+
+from src.llm.classifiers import classify_batch, classify_text, pack_texts
+from src.utils.tokens import count_tokens
+
+RESULT = {"topics": ["crypto"], "sentiment": 0, "stance": "neutral", "impact": 1}
+POST_RE = re.compile(r"^Post (\d+):", re.MULTILINE)
+WORDS = "bitcoin etf sec inflation fed rate cut rally dump whale exchange listing halving".split()
+
+
+class FakeClient:
+    def __init__(
+        self,
+        slots: int,
+        request_overhead: float,
+        prefill_per_token: float,
+        decode_per_token: float,
+    ) -> None:
+        self._slots = asyncio.Semaphore(slots)
+        self._overhead = request_overhead
+        self._prefill = prefill_per_token
+        self._decode = decode_per_token
+        self.requests = 0
+        self.prompt_tokens = 0
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        prompt = "\n".join(message["content"] for message in messages)
+        indices = [int(match) for match in POST_RE.findall(prompt)]
+        if indices:
+            body = json.dumps({"results": [{**RESULT, "index": index} for index in indices]})
+        else:
+            body = json.dumps(RESULT)
+        prompt_tokens = count_tokens(prompt)
+        async with self._slots:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            await asyncio.sleep(
+                self._overhead
+                + prompt_tokens * self._prefill
+                + count_tokens(body) * self._decode
+            )
+        return body
+
+
+def _corpus(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(8, 40))) for _ in range(count)]
+
+
+async def _per_item(client: FakeClient, texts: list[str], concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def _one(text: str) -> None:
+        async with limit:
+            await classify_text(client, text)
+
+    await asyncio.gather(*(_one(text) for text in texts))
+
+
+async def _batched(
+    client: FakeClient, texts: list[str], concurrency: int, batch_size: int, token_budget: int
+) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def _pack(indices: list[int]) -> None:
+        async with limit:
+            await classify_batch(client, [texts[index] for index in indices])
+
+    await asyncio.gather(*(_pack(pack) for pack in pack_texts(texts, batch_size, token_budget)))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--token-budget", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--overhead", type=float, default=0.02)
+    parser.add_argument("--prefill", type=float, default=0.0002)
+    parser.add_argument("--decode", type=float, default=0.002)
+    args = parser.parse_args()
+
+    texts = _corpus(args.items)
+    for name in ("per-item", "batched"):
+        client = FakeClient(args.slots, args.overhead, args.prefill, args.decode)
+        started = time.perf_counter()
+        if name == "per-item":
+            await _per_item(client, texts, args.concurrency)
+        else:
+            await _batched(client, texts, args.concurrency, args.batch_size, args.token_budget)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>9}: {len(texts) / elapsed:8.1f} items/s "
+            f"requests={client.requests} prompt_tokens={client.prompt_tokens}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
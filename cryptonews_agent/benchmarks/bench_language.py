@@ -0,0 +1,106 @@
+"""Compare language detector throughput and agreement with langdetect.
+
+Run from the project root::
+
+    python -m benchmarks.bench_language --items 2000
+    python -m benchmarks.bench_language --corpus posts.jsonl
+
+``--corpus`` takes a JSONL file with a ``text`` field or plain text, one post
+per line. Without it a synthetic crypto-news corpus mixing English, Russian
+and a few other languages is generated. Agreement is measured against
+langdetect on the same inputs; for the script-only detector it is measured over
+the posts it resolves, and the share it resolves is reported as coverage.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from src.ingest.normalizer import (
+    CachedDetector,
+    LangdetectDetector,
+    LanguageDetector,
+    ScriptDetector,
+    _detect_input,
+)
+
+TEMPLATES = {
+    "en": [
+        "Bitcoin is up {n}% after the SEC said it will review the ETF filings this week",
+        "Whales moved {n}k ETH to exchanges and that could mean more selling pressure",
+        "The Fed held rates and Powell said cuts are not on the table for now",
+        "Solana fees spiked to ${n} as memecoin traders flooded the network",
+    ],
+    "ru": [
+        "Биткоин вырос на {n}% после решения SEC по спотовым ETF",
+        "Киты перевели {n} тысяч ETH на биржи, это может усилить давление продавцов",
+        "ФРС сохранила ставку, рынок ждёт снижения в следующем квартале",
+        "Банк России ужесточил правила для криптобирж и майнинга",
+    ],
+    "de": ["Bitcoin steigt um {n}% nachdem die Börsenaufsicht neue Regeln vorgestellt hat"],
+    "es": ["El precio de Bitcoin subió un {n}% después de la decisión de la SEC"],
+    "uk": ["Біткоїн зріс на {n}% після рішення регулятора щодо ETF"],
+}
+WEIGHTS = {"en": 50, "ru": 40, "de": 4, "es": 4, "uk": 2}
+
+
+def _synthetic(count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    langs = rng.choices(list(WEIGHTS), weights=list(WEIGHTS.values()), k=count)
+    return [rng.choice(TEMPLATES[lang]).format(n=rng.randint(1, 99)) for lang in langs]
+
+
+def _load(path: Path) -> list[str]:
+    texts = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            line = json.loads(line).get("text", "")
+        texts.append(line)
+    return texts
+
+
+def _run(detector: LanguageDetector, texts: list[str], batch_size: int) -> tuple[list, float]:
+    started = time.perf_counter()
+    results: list[str | None] = []
+    for start in range(0, len(texts), batch_size):
+        results.extend(detector.detect_batch(texts[start : start + batch_size]))
+    return results, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    texts = _load(args.corpus) if args.corpus else _synthetic(args.items)
+    texts = [text for text in (_detect_input(text) for text in texts) if text]
+    reference, reference_seconds = _run(LangdetectDetector(), texts, args.batch_size)
+    print(f"{len(texts)} posts; langdetect {len(texts) / reference_seconds:,.0f} items/s")
+
+    detectors: dict[str, LanguageDetector] = {
+        "script": ScriptDetector(),
+        "fast": ScriptDetector(fallback=LangdetectDetector()),
+        "fast+cache": CachedDetector(ScriptDetector(fallback=LangdetectDetector())),
+    }
+    for name, detector in detectors.items():
+        results, seconds = _run(detector, texts, args.batch_size)
+        resolved = [(got, want) for got, want in zip(results, reference) if got is not None]
+        agreement = sum(got == want for got, want in resolved) / len(resolved) if resolved else 0.0
+        print(
+            f"{name:<11} {len(texts) / seconds:>12,.0f} items/s  "
+            f"x{reference_seconds / seconds:>6.1f}  agreement {agreement:.1%}  "
+            f"coverage {len(resolved) / len(texts):.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
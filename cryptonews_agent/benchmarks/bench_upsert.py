@@ -0,0 +1,106 @@
+"""Measure storage throughput of the per-row and set-based upsert paths.
+
+Run from the project root::
+
+    python -m benchmarks.bench_upsert --items 20000
+    DB_BACKEND=postgres python -m benchmarks.bench_upsert --items 50000
+
+Without ``DB_BACKEND`` set this uses a throwaway SQLite file. Each path first
+inserts ``--items`` fresh rows, then re-stores them unchanged (the common case
+when a job re-reads posts it already has), then stores them with new sentiment.
+Rows use a ``bench:`` source_id prefix and are deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+
+from src.db import crud
+from src.db.base import Base, get_engine, get_session
+from src.db.models import Item, SourceEnum
+from src.ingest.base import NormalizedItem
+from src.llm.schema import ClassificationResult
+
+
+def _items(count: int, prefix: str) -> list[NormalizedItem]:
+    now = datetime.now(tz=timezone.utc)
+    return [
+        NormalizedItem(
+            source=SourceEnum.telegram,
+            source_id=f"bench:{prefix}:{index}",
+            text=f"BTC breaks {index} as ETF inflows continue",
+            raw={"id": index, "channel": "bench"},
+            published_at=now,
+            lang="en",
+            tickers=["BTC"],
+        )
+        for index in range(count)
+    ]
+
+
+def _classification(sentiment: int) -> ClassificationResult:
+    return ClassificationResult(
+        topics=["etf"], sentiment=sentiment, stance="bullish", impact=2, tickers=["BTC"]
+    )
+
+
+async def _per_row(items, classification, embedding, batch_size) -> None:
+    for start in range(0, len(items), batch_size):
+        async with get_session() as session:
+            for item in items[start : start + batch_size]:
+                await crud.upsert_item(session, item, classification, embedding)
+
+
+async def _bulk(items, classification, embedding, batch_size) -> None:
+    for start in range(0, len(items), batch_size):
+        async with get_session() as session:
+            await crud.upsert_items(
+                session,
+                [(item, classification, embedding) for item in items[start : start + batch_size]],
+            )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    rng = random.Random(3)
+    embedding = [rng.random() for _ in range(args.dims)]
+    print(f"{engine.dialect.name}, {args.items} rows, batches of {args.batch_size}")
+    try:
+        for name, store in (("per-row", _per_row), ("bulk", _bulk)):
+            items = _items(args.items, name)
+            for phase, sentiment in (("insert", 1), ("unchanged", 1), ("update", -1)):
+                started = time.perf_counter()
+                await store(items, _classification(sentiment), embedding, args.batch_size)
+                seconds = time.perf_counter() - started
+                print(f"{name:<8} {phase:<10} {args.items / seconds:>12,.0f} rows/s")
+    finally:
+        async with get_session() as session:
+            await session.execute(delete(Item).where(Item.source_id.like("bench:%")))
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--dims", type=int, default=32)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        if "DB_BACKEND" not in os.environ:
+            os.environ["DB_BACKEND"] = "sqlite"
+            os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench.db")
+        asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
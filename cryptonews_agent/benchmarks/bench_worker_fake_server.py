@@ -0,0 +1,102 @@
+"""Measure PipelineWorker enrichment throughput through the real client stack.
+
+Starts the bundled fake OpenAI-compatible server, points ``LMStudioClient`` at it
+and enriches a synthetic corpus into an in-memory SQLite database, so retries,
+connection pooling, adaptive concurrency and batching are all exercised::
+
+    python -m benchmarks.bench_worker_fake_server --items 500 --latency 0.2 --tps 80 --error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timezone
+
+from src.llm.fake_server import FakeLLMServer, FakeServerConfig
+
+WORDS = "bitcoin etf sec inflation fed rate cut rally dump whale exchange listing halving".split()
+
+
+def _items(count: int, seed: int = 7) -> list:
+    from src.db.models import SourceEnum
+    from src.ingest.base import NormalizedItem
+
+    rng = random.Random(seed)
+    now = datetime.now(tz=timezone.utc)
+    return [
+        NormalizedItem(
+            source=SourceEnum.reddit,
+            source_id=f"bench-{index}",
+            text=" ".join(rng.choices(WORDS, k=rng.randint(8, 40))),
+            raw={},
+            published_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean time to first token")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Log-normal sigma")
+    parser.add_argument("--tps", type=float, default=80.0, help="Decode tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--chunk", type=int, default=50, help="Items per enrich_and_store call")
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency_mean=args.latency,
+        latency_jitter=args.jitter,
+        latency_distribution="lognormal",
+        tokens_per_second=args.tps,
+        error_rate=args.error_rate,
+        slots=args.slots,
+        seed=1,
+    )
+    async with FakeLLMServer(config) as server:
+        os.environ.update(
+            {
+                "DB_BACKEND": "sqlite",
+                "SQLITE_PATH": ":memory:",
+                "LMSTUDIO_BASE_URL": f"{server.base_url};max_concurrency={args.slots * 2}",
+            }
+        )
+        from src.config import get_settings
+
+        get_settings.cache_clear()
+        from src.db.base import Base, get_engine
+        from src.llm.client import LMStudioClient
+        from src.pipeline.worker import PipelineWorker
+
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        client = LMStudioClient()
+        worker = PipelineWorker([], client, batch_size=args.chunk, concurrency=1)
+        items = _items(args.items)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker.enrich_and_store(items[start : start + args.chunk])
+                for start in range(0, len(items), args.chunk)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    stats = server.stats
+    print(f"{len(items) / elapsed:8.1f} items/s over {elapsed:.1f}s")
+    print(
+        f"requests={stats.requests} connections={stats.connections} "
+        f"errors={stats.injected_errors} peak_in_flight={stats.peak_in_flight}"
+    )
+    for limiter in client.limiter_stats():
+        print(f"{limiter.name}: limit={limiter.limit} p50={limiter.p50} p95={limiter.p95}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
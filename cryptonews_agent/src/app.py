@@ -1,25 +1,32 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich import print
 
 from src.config import get_settings
 from src.db.base import Base, get_engine, get_session
+from src.ingest.normalizer import shutdown_batch_normalizer
 from src.logging_conf import configure_logging
 from src.pipeline.scheduler import start_scheduler
 from src.pipeline.worker import PipelineWorker
 from src.search.query import SearchFilters, semantic_search
 from src.utils.time import parse_iso8601, utc_now
 
+if TYPE_CHECKING:
+    from src.ingest.replay_source import ReplaySource
+
 app = typer.Typer(help="CryptoNews Agent CLI")
 ingest_app = typer.Typer(help="Ingestion commands")
 db_app = typer.Typer(help="Database migration commands")
+relevance_app = typer.Typer(help="Relevance pre-filter commands")
 app.add_typer(ingest_app, name="ingest")
 app.add_typer(db_app, name="db")
+app.add_typer(relevance_app, name="relevance")
 
 
 async def _build_worker() -> PipelineWorker:
@@ -48,10 +55,88 @@ def ingest_run(since: Optional[str] = typer.Option(None, help="ISO8601 start tim
             await worker.enqueue(source_name, target_since)
         await asyncio.wait_for(worker.join(), timeout=None)
         await worker.stop()
+        shutdown_batch_normalizer()
 
     asyncio.run(_run())
 
 
+def _build_replay_source(
+    path: Path,
+    source: str,
+    mapping: Optional[Path],
+    field: List[str],
+    until: Optional[str],
+    limit: Optional[int],
+    page_size: int,
+) -> ReplaySource:
+    from src.db.models import SourceEnum
+    from src.ingest.replay_source import DEFAULT_MAPPINGS, FieldMapping, ReplaySource
+
+    source_enum = SourceEnum(source)
+    field_mapping = DEFAULT_MAPPINGS[source_enum]
+    if mapping is not None:
+        field_mapping = FieldMapping.load(mapping, field_mapping)
+    overrides = dict(entry.split("=", 1) for entry in field)
+    return ReplaySource(
+        path,
+        source_enum,
+        field_mapping.with_overrides(overrides),
+        get_settings().max_text_tokens,
+        page_size=page_size,
+        until=parse_iso8601(until) if until else None,
+        limit=limit,
+    )
+
+
+@ingest_app.command("replay")
+def ingest_replay(
+    path: Path = typer.Argument(..., help="JSONL(.gz/.zst) or Parquet archive, or a directory"),
+    source: str = typer.Option(..., help="Source the archive was exported from"),
+    mapping: Optional[Path] = typer.Option(None, help="JSON file overriding the field mapping"),
+    field: List[str] = typer.Option([], help="Field mapping override, e.g. text=body|title"),
+    since: Optional[str] = typer.Option(None, help="ISO8601 lower bound on published_at"),
+    until: Optional[str] = typer.Option(None, help="ISO8601 upper bound on published_at"),
+    limit: Optional[int] = typer.Option(None, help="Stop after this many items"),
+    page_size: int = typer.Option(500, help="Records read and normalized at a time"),
+    batch_size: Optional[int] = typer.Option(None, help="Items per enrichment batch"),
+    concurrency: Optional[int] = typer.Option(None, help="Enrichment batches in flight"),
+) -> None:
+    """Backfill from exported archives through the normal enrichment pipeline."""
+
+    from src.llm.client import LMStudioClient
+    from src.pipeline.replay import replay_source
+
+    configure_logging()
+    settings = get_settings()
+
+    async def _replay() -> None:
+        replay = _build_replay_source(path, source, mapping, field, until, limit, page_size)
+        client = LMStudioClient()
+        await client.warmup()
+        size = batch_size or settings.batch_size
+        worker = PipelineWorker([replay], client, size, 1)
+        start = parse_iso8601(since) if since else datetime.fromtimestamp(0, tz=timezone.utc)
+        try:
+            stats = await replay_source(
+                worker,
+                replay,
+                start,
+                size,
+                concurrency or settings.worker_concurrency,
+                on_batch=lambda s: print(f"{s.processed} items ({s.rate:.1f} items/s)"),
+            )
+        finally:
+            shutdown_batch_normalizer()
+        counters = replay.counters
+        print(
+            f"[bold]Replayed {stats.processed} items from {counters.records} records "
+            f"({counters.skipped} skipped) in {stats.elapsed:.1f}s "
+            f"({stats.rate:.1f} items/s)[/bold]"
+        )
+
+    asyncio.run(_replay())
+
+
 @app.command("scheduler")
 def scheduler_start() -> None:
     """Start the APScheduler-based pipeline."""
@@ -60,6 +145,116 @@ def scheduler_start() -> None:
     asyncio.run(start_scheduler())
 
 
+@app.command("reprocess")
+def reprocess(
+    since: Optional[str] = typer.Option(None, help="ISO8601 lower bound on published_at"),
+    until: Optional[str] = typer.Option(None, help="ISO8601 upper bound on published_at"),
+    source: Optional[str] = typer.Option(None, help="Comma-separated sources"),
+    classified_with: Optional[str] = typer.Option(None, help="Only rows classified by this model"),
+    embedded_with: Optional[str] = typer.Option(None, help="Only rows embedded by this model"),
+    stale_only: bool = typer.Option(
+        True, "--stale-only/--all", help="Skip rows already enriched with the current models"
+    ),
+    batch_size: Optional[int] = typer.Option(None, help="Rows per batch"),
+    checkpoint: Optional[Path] = typer.Option(None, help="Checkpoint file for resumable runs"),
+) -> None:
+    """Re-run classification and embeddings over stored items."""
+
+    from src.db.crud import ItemSelection
+    from src.db.models import SourceEnum
+    from src.llm.client import LMStudioClient
+    from src.pipeline.reprocess import reprocess_items
+
+    configure_logging()
+    settings = get_settings()
+
+    async def _reprocess() -> None:
+        client = LMStudioClient()
+        await client.warmup()
+        size = batch_size or settings.batch_size
+        worker = PipelineWorker([], client, size, 1)
+        selection = ItemSelection(
+            since=parse_iso8601(since) if since else None,
+            until=parse_iso8601(until) if until else None,
+            sources=[SourceEnum(name) for name in source.split(",")] if source else None,
+            classified_with=classified_with,
+            embedded_with=embedded_with,
+            stale_llm_model=client.model if stale_only else None,
+            stale_embed_model=client.embed_model if stale_only else None,
+        )
+        stats = await reprocess_items(
+            worker,
+            selection,
+            size,
+            checkpoint=checkpoint,
+            on_batch=lambda s: print(f"{s.processed} items ({s.rate:.1f} items/s)"),
+        )
+        print(
+            f"[bold]Reprocessed {stats.processed} items in {stats.elapsed:.1f}s "
+            f"({stats.rate:.1f} items/s)[/bold]"
+        )
+
+    asyncio.run(_reprocess())
+
+
+@relevance_app.command("report")
+def relevance_report(
+    sample: Path = typer.Argument(..., help='JSONL of {"text": ..., "relevant": true|false}'),
+) -> None:
+    """Estimate skip rate and false negatives of the relevance filter on a labeled sample."""
+
+    from src.llm.relevance import RelevanceFilter, evaluate, load_labeled_sample
+
+    configure_logging()
+    settings = get_settings()
+
+    async def _report() -> None:
+        relevance = RelevanceFilter.from_settings(settings)
+        samples = load_labeled_sample(sample)
+        embeddings = None
+        if relevance.model is not None:
+            from src.llm.client import LMStudioClient
+
+            embeddings = await LMStudioClient().get_embeddings([text for text, _ in samples])
+        report = evaluate(relevance, samples, embeddings)
+        print(
+            f"[bold]{report.skipped}/{report.total} LLM calls skipped ({report.skip_rate:.1%})[/bold]"
+        )
+        print(
+            f"False negatives: {report.false_negatives}/{report.relevant} relevant posts "
+            f"({report.false_negative_rate:.1%})"
+        )
+        for text in report.examples:
+            print(f"- {text[:200]}")
+
+    asyncio.run(_report())
+
+
+@relevance_app.command("train")
+def relevance_train(
+    sample: Path = typer.Argument(..., help='JSONL of {"text": ..., "relevant": true|false}'),
+    output: Path = typer.Option(Path("relevance_model.json"), help="Where to write the model"),
+) -> None:
+    """Fit the linear relevance model on embeddings of a labeled sample."""
+
+    from src.llm.client import LMStudioClient
+    from src.llm.relevance import LinearRelevanceModel, load_labeled_sample
+
+    configure_logging()
+
+    async def _train() -> None:
+        client = LMStudioClient()
+        samples = load_labeled_sample(sample)
+        embeddings = await client.get_embeddings([text for text, _ in samples])
+        model = LinearRelevanceModel.fit(
+            embeddings, [label for _, label in samples], embed_model=client.embed_model
+        )
+        model.save(output)
+        print(f"[bold]Wrote {output} from {len(samples)} samples[/bold]")
+
+    asyncio.run(_train())
+
+
 @app.command()
 def search(
     query: str = typer.Argument(..., help="Query text"),
@@ -93,6 +288,42 @@ def search(
     asyncio.run(_search())
 
 
+@app.command("fake-llm")
+def fake_llm(
+    host: str = typer.Option("127.0.0.1", help="Bind address"),
+    port: int = typer.Option(1234, help="Port"),
+    latency: float = typer.Option(0.2, help="Mean seconds to first token"),
+    jitter: float = typer.Option(0.05, help="Uniform jitter, or sigma for lognormal"),
+    distribution: str = typer.Option("uniform", help="fixed, uniform, exponential or lognormal"),
+    tokens_per_second: float = typer.Option(50.0, help="Completion decode speed"),
+    error_rate: float = typer.Option(0.0, help="Share of requests answered with --error-status"),
+    error_status: int = typer.Option(503, help="HTTP status for injected errors"),
+    hang_rate: float = typer.Option(0.0, help="Share of requests that never answer"),
+    slots: int = typer.Option(8, help="Requests generated at once"),
+    embedding_dim: int = typer.Option(768, help="Embedding dimension"),
+    seed: Optional[int] = typer.Option(None, help="Seed for reproducible latencies and errors"),
+) -> None:
+    """Serve a fake OpenAI-compatible LLM for load and latency testing."""
+
+    from src.llm.fake_server import FakeLLMServer, FakeServerConfig
+
+    configure_logging()
+    config = FakeServerConfig(
+        latency_mean=latency,
+        latency_jitter=jitter,
+        latency_distribution=distribution,  # type: ignore[arg-type]
+        tokens_per_second=tokens_per_second,
+        error_rate=error_rate,
+        error_status=error_status,
+        hang_rate=hang_rate,
+        slots=slots,
+        embedding_dim=embedding_dim,
+        seed=seed,
+    )
+    print(f"[bold]Fake LLM listening on http://{host}:{port}/v1[/bold]")
+    asyncio.run(FakeLLMServer(config).serve_forever(host, port))
+
+
 @db_app.command("init")
 def db_init() -> None:
     """Create database tables without migrations."""
@@ -107,6 +338,111 @@ def db_init() -> None:
     asyncio.run(_init())
 
 
+@db_app.command("load")
+def db_load(
+    path: Path = typer.Argument(..., help="JSONL(.gz/.zst) or Parquet archive, or a directory"),
+    source: str = typer.Option(..., help="Source the archive was exported from"),
+    mapping: Optional[Path] = typer.Option(None, help="JSON file overriding the field mapping"),
+    field: List[str] = typer.Option([], help="Field mapping override, e.g. text=body|title"),
+    since: Optional[str] = typer.Option(None, help="ISO8601 lower bound on published_at"),
+    until: Optional[str] = typer.Option(None, help="ISO8601 upper bound on published_at"),
+    limit: Optional[int] = typer.Option(None, help="Stop after this many items"),
+    page_size: int = typer.Option(500, help="Records read and normalized at a time"),
+    chunk_size: int = typer.Option(50000, help="Rows written per transaction"),
+    copy: bool = typer.Option(True, help="Use binary COPY on PostgreSQL"),
+) -> None:
+    """Bulk-load archived items without enrichment; the sweeper enriches them later."""
+
+    from src.db.bulk_load import copy_supported, load_items
+
+    configure_logging()
+
+    async def _load() -> None:
+        replay = _build_replay_source(path, source, mapping, field, until, limit, page_size)
+        start = parse_iso8601(since) if since else datetime.fromtimestamp(0, tz=timezone.utc)
+        async with get_session() as session:
+            method = "COPY" if copy and copy_supported(session) else "upsert"
+        try:
+            stats = await load_items(
+                replay.stream_since(start),
+                chunk_size,
+                copy_min_rows=1 if copy else 0,
+                on_chunk=lambda s: print(f"{s.rows} rows ({s.rate:,.0f} rows/s)"),
+            )
+        finally:
+            shutdown_batch_normalizer()
+        print(
+            f"[bold]Loaded {stats.rows} rows via {method} in {stats.elapsed:.1f}s "
+            f"({stats.rate:,.0f} rows/s)[/bold]"
+        )
+
+    asyncio.run(_load())
+
+
+@db_app.command("partitions")
+def db_partitions(
+    ahead: Optional[int] = typer.Option(None, help="Months of future partitions to create"),
+    start: Optional[str] = typer.Option(None, help="ISO8601 month to create partitions from"),
+) -> None:
+    """Create missing monthly partitions of a partitioned items table and list them."""
+
+    from src.db import partitions
+
+    configure_logging()
+    settings = get_settings()
+
+    async def _partitions() -> None:
+        async with get_session() as session:
+            if not await partitions.is_partitioned(session):
+                print("[yellow]items is not partitioned; run db upgrade on PostgreSQL[/yellow]")
+                return
+            created = await partitions.ensure_partitions(
+                session,
+                settings.partition_months_ahead if ahead is None else ahead,
+                start=parse_iso8601(start) if start else None,
+            )
+            existing = await partitions.list_partitions(session)
+        for partition in existing:
+            marker = " (new)" if partition.name in created else ""
+            span = f"{partition.start:%Y-%m-%d} - {partition.end:%Y-%m-%d}"
+            print(f"{partition.name}: {span}{marker}")
+
+    asyncio.run(_partitions())
+
+
+@db_app.command("retention")
+def db_retention(
+    keep_months: Optional[int] = typer.Option(None, help="Full months to keep before this one"),
+    mode: Optional[str] = typer.Option(None, help="detach, drop or archive"),
+    archive_dir: Optional[Path] = typer.Option(None, help="Where archive mode writes partitions"),
+    dry_run: bool = typer.Option(False, help="Only list partitions that would be retired"),
+) -> None:
+    """Detach, drop or archive monthly partitions past the retention window."""
+
+    from src.db import partitions
+
+    configure_logging()
+    settings = get_settings()
+    keep = settings.retention_months if keep_months is None else keep_months
+    retention_mode = mode or settings.retention_mode
+    if retention_mode not in ("detach", "drop", "archive"):
+        raise typer.BadParameter("mode must be detach, drop or archive")
+    if keep <= 0:
+        raise typer.BadParameter("set --keep-months or RETENTION_MONTHS to a positive value")
+
+    async def _retention() -> None:
+        retired = await partitions.apply_retention(
+            keep,
+            retention_mode,  # type: ignore[arg-type]
+            archive_dir or Path(settings.retention_archive_dir),
+            dry_run=dry_run,
+        )
+        action = "Would retire" if dry_run else f"Retired ({retention_mode})"
+        print(f"[bold]{action} {len(retired)} partitions[/bold] {' '.join(retired)}")
+
+    asyncio.run(_retention())
+
+
 @db_app.command("migrate")
 def db_migrate(message: str = typer.Argument(..., help="Migration message")) -> None:
     """Create a new Alembic revision."""
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List, Literal, Optional, Sequence
+from typing import Dict, List, Literal, Optional, Sequence
 
-from pydantic import Field, HttpUrl
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,24 +18,70 @@ class Settings(BaseSettings):
     database_url: Optional[str] = Field(default=None, validation_alias="DATABASE_URL")
     sqlite_path: str = Field(default="./data/db.sqlite", validation_alias="SQLITE_PATH")
 
-    lmstudio_base_url: HttpUrl = Field(
+    lmstudio_base_url: str = Field(
         default="http://127.0.0.1:1234/v1", validation_alias="LMSTUDIO_BASE_URL"
     )
+    lmstudio_embed_base_url: Optional[str] = Field(
+        default=None, validation_alias="LMSTUDIO_EMBED_BASE_URL"
+    )
+    endpoint_eject_after: int = Field(default=3, validation_alias="ENDPOINT_EJECT_AFTER")
+    endpoint_eject_seconds: float = Field(default=30.0, validation_alias="ENDPOINT_EJECT_SECONDS")
     lmstudio_api_key: str = Field(default="lm-studio", validation_alias="LMSTUDIO_API_KEY")
     llm_model: str = Field(default="openai/gpt-oss-20b", validation_alias="LLM_MODEL")
     embed_model: str = Field(default="nomic-embed-text", validation_alias="EMBED_MODEL")
 
+    embed_backend: Literal["lmstudio", "sentence_transformers"] = Field(
+        default="lmstudio", validation_alias="EMBED_BACKEND"
+    )
+    local_embed_model: str = Field(
+        default="sentence-transformers/all-mpnet-base-v2", validation_alias="LOCAL_EMBED_MODEL"
+    )
+    local_embed_device: str = Field(default="cpu", validation_alias="LOCAL_EMBED_DEVICE")
+    local_embed_onnx: bool = Field(default=False, validation_alias="LOCAL_EMBED_ONNX")
+    local_embed_onnx_file: Optional[str] = Field(
+        default=None, validation_alias="LOCAL_EMBED_ONNX_FILE"
+    )
+    local_embed_threads: Optional[int] = Field(default=None, validation_alias="LOCAL_EMBED_THREADS")
+    local_embed_batch_size: int = Field(default=32, validation_alias="LOCAL_EMBED_BATCH_SIZE")
+
+    llm_structured_output: bool = Field(default=True, validation_alias="LLM_STRUCTURED_OUTPUT")
+    llm_stream: bool = Field(default=True, validation_alias="LLM_STREAM")
+
+    circuit_failure_threshold: int = Field(default=5, validation_alias="CIRCUIT_FAILURE_THRESHOLD")
+    circuit_recovery_seconds: float = Field(
+        default=30.0, validation_alias="CIRCUIT_RECOVERY_SECONDS"
+    )
+    llm_requests_per_second: float = Field(default=0.0, validation_alias="LLM_REQUESTS_PER_SECOND")
+    llm_tokens_per_minute: int = Field(default=0, validation_alias="LLM_TOKENS_PER_MINUTE")
+
+    llm_min_concurrency: int = Field(default=1, validation_alias="LLM_MIN_CONCURRENCY")
+    llm_max_concurrency: int = Field(default=32, validation_alias="LLM_MAX_CONCURRENCY")
+    llm_initial_concurrency: int = Field(default=4, validation_alias="LLM_INITIAL_CONCURRENCY")
+    llm_target_latency_seconds: float = Field(
+        default=10.0, validation_alias="LLM_TARGET_LATENCY_SECONDS"
+    )
+    embed_target_latency_seconds: float = Field(
+        default=2.0, validation_alias="EMBED_TARGET_LATENCY_SECONDS"
+    )
+
     enable_telegram: bool = Field(default=True, validation_alias="ENABLE_TELEGRAM")
     telegram_api_id: Optional[int] = Field(default=None, validation_alias="TELEGRAM_API_ID")
     telegram_api_hash: Optional[str] = Field(default=None, validation_alias="TELEGRAM_API_HASH")
     telegram_channels: List[str] = Field(
         default_factory=list, validation_alias="TELEGRAM_CHANNELS"
     )
+    telegram_cursor_path: Optional[str] = Field(
+        default="./data/telegram_cursors.json", validation_alias="TELEGRAM_CURSOR_PATH"
+    )
+    telegram_push: bool = Field(default=False, validation_alias="TELEGRAM_PUSH")
+    telegram_gap_fill_seconds: int = Field(default=900, validation_alias="TELEGRAM_GAP_FILL_SECONDS")
 
     enable_twitter: bool = Field(default=False, validation_alias="ENABLE_TWITTER")
     twitter_bearer_token: Optional[str] = Field(
         default=None, validation_alias="TWITTER_BEARER_TOKEN"
     )
+    twitter_queries: List[str] = Field(default_factory=list, validation_alias="TWITTER_QUERIES")
+    twitter_max_query_length: int = Field(default=512, validation_alias="TWITTER_MAX_QUERY_LENGTH")
 
     enable_reddit: bool = Field(default=True, validation_alias="ENABLE_REDDIT")
     reddit_client_id: Optional[str] = Field(default=None, validation_alias="REDDIT_CLIENT_ID")
@@ -55,9 +101,83 @@ class Settings(BaseSettings):
     )
 
     worker_concurrency: int = Field(default=4, validation_alias="WORKER_CONCURRENCY")
+    source_fetch_concurrency: int = Field(default=4, validation_alias="SOURCE_FETCH_CONCURRENCY")
+    source_max_pages: int = Field(default=10, validation_alias="SOURCE_MAX_PAGES")
     fetch_interval_seconds: int = Field(default=120, validation_alias="FETCH_INTERVAL_SECONDS")
+    adaptive_polling: bool = Field(default=False, validation_alias="ADAPTIVE_POLLING")
+    poll_min_seconds: float = Field(default=30.0, validation_alias="POLL_MIN_SECONDS")
+    poll_max_seconds: float = Field(default=900.0, validation_alias="POLL_MAX_SECONDS")
+    poll_target_items: float = Field(default=20.0, validation_alias="POLL_TARGET_ITEMS")
+    poll_full_items: int = Field(default=100, validation_alias="POLL_FULL_ITEMS")
+    poll_ewma_alpha: float = Field(default=0.3, validation_alias="POLL_EWMA_ALPHA")
     batch_size: int = Field(default=50, validation_alias="BATCH_SIZE")
     max_text_tokens: int = Field(default=1500, validation_alias="MAX_TEXT_TOKENS")
+    entity_dictionary_path: Optional[str] = Field(
+        default=None, validation_alias="ENTITY_DICTIONARY_PATH"
+    )
+    entity_dictionary_reload_seconds: float = Field(
+        default=30.0, validation_alias="ENTITY_DICTIONARY_RELOAD_SECONDS"
+    )
+    lang_detector: Literal["fast", "script", "langdetect"] = Field(
+        default="fast", validation_alias="LANG_DETECTOR"
+    )
+    lang_detect_cache_size: int = Field(default=10_000, validation_alias="LANG_DETECT_CACHE_SIZE")
+    normalize_workers: int = Field(default=2, validation_alias="NORMALIZE_WORKERS")
+    normalize_chunk_size: int = Field(default=64, validation_alias="NORMALIZE_CHUNK_SIZE")
+    tokenizer: str = Field(default="tiktoken:o200k_base", validation_alias="TOKENIZER")
+    prompt_token_budget: int = Field(default=2048, validation_alias="PROMPT_TOKEN_BUDGET")
+    classify_output_tokens_min: int = Field(
+        default=64, validation_alias="CLASSIFY_OUTPUT_TOKENS_MIN"
+    )
+    classify_output_tokens_max: int = Field(
+        default=128, validation_alias="CLASSIFY_OUTPUT_TOKENS_MAX"
+    )
+    classify_output_tokens_per_input: float = Field(
+        default=0.05, validation_alias="CLASSIFY_OUTPUT_TOKENS_PER_INPUT"
+    )
+
+    source_weights: Dict[str, float] = Field(
+        default_factory=dict, validation_alias="SOURCE_WEIGHTS"
+    )
+    channel_weights: Dict[str, float] = Field(
+        default_factory=dict, validation_alias="CHANNEL_WEIGHTS"
+    )
+    overload_queue_depth: int = Field(default=500, validation_alias="OVERLOAD_QUEUE_DEPTH")
+    overload_min_weight: float = Field(default=1.0, validation_alias="OVERLOAD_MIN_WEIGHT")
+    overload_mode: Literal["raw", "embed_only"] = Field(
+        default="embed_only", validation_alias="OVERLOAD_MODE"
+    )
+
+    item_enrich_timeout_seconds: float = Field(
+        default=30.0, validation_alias="ITEM_ENRICH_TIMEOUT_SECONDS"
+    )
+    job_enrich_timeout_seconds: float = Field(
+        default=300.0, validation_alias="JOB_ENRICH_TIMEOUT_SECONDS"
+    )
+    classify_batch_size: int = Field(default=8, validation_alias="CLASSIFY_BATCH_SIZE")
+    classify_batch_token_budget: int = Field(
+        default=2000, validation_alias="CLASSIFY_BATCH_TOKEN_BUDGET"
+    )
+    sweep_interval_seconds: int = Field(default=300, validation_alias="SWEEP_INTERVAL_SECONDS")
+    copy_load_min_rows: int = Field(default=1000, validation_alias="COPY_LOAD_MIN_ROWS")
+    partition_months_ahead: int = Field(default=3, validation_alias="PARTITION_MONTHS_AHEAD")
+    retention_months: int = Field(default=0, validation_alias="RETENTION_MONTHS")
+    retention_mode: Literal["detach", "drop", "archive"] = Field(
+        default="detach", validation_alias="RETENTION_MODE"
+    )
+    retention_archive_dir: str = Field(
+        default="./data/archive", validation_alias="RETENTION_ARCHIVE_DIR"
+    )
+
+    relevance_filter: bool = Field(default=False, validation_alias="RELEVANCE_FILTER")
+    relevance_keywords_path: Optional[str] = Field(
+        default=None, validation_alias="RELEVANCE_KEYWORDS_PATH"
+    )
+    relevance_min_keyword_hits: int = Field(default=1, validation_alias="RELEVANCE_MIN_KEYWORD_HITS")
+    relevance_model_path: Optional[str] = Field(default=None, validation_alias="RELEVANCE_MODEL_PATH")
+    relevance_model_threshold: float = Field(
+        default=0.2, validation_alias="RELEVANCE_MODEL_THRESHOLD"
+    )
 
     class SourcesConfig(BaseSettings):
         model_config = SettingsConfigDict(extra="ignore")
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import crud, partitions
+from src.db.base import get_session
+from src.ingest.base import NormalizedItem
+from src.ingest.dedup import filter_duplicates, mark_hash
+from src.llm.schema import ClassificationResult
+
+logger = logging.getLogger(__name__)
+
+STAGE_TABLE = "items_stage"
+CLASSIFICATION_COLUMNS = ("topics", "sentiment", "stance", "impact", "classified_with")
+EMBEDDING_COLUMNS = ("embedding", "embedded_with")
+BASE_COLUMNS = (
+    "source",
+    "source_id",
+    "author",
+    "published_at",
+    "lang",
+    "text",
+    "raw",
+    "tickers",
+    "entities",
+    "enrichment_pending",
+)
+ITEM_COLUMNS = ("id", *BASE_COLUMNS, *CLASSIFICATION_COLUMNS, *EMBEDDING_COLUMNS)
+# Bits of ``update_mask``: which column groups a staged row may overwrite.
+UPDATE_CLASSIFICATION = 1
+UPDATE_EMBEDDING = 2
+
+# Staged with plain types asyncpg encodes natively in binary COPY (no enum or
+# pgvector codec needed); the merge casts them to whatever ``items`` uses.
+STAGE_DDL = f"""
+CREATE TEMPORARY TABLE IF NOT EXISTS {STAGE_TABLE} (
+    id uuid,
+    source text,
+    source_id text,
+    author text,
+    published_at timestamptz,
+    lang text,
+    text text,
+    raw jsonb,
+    tickers text[],
+    entities jsonb,
+    enrichment_pending boolean,
+    topics text[],
+    sentiment integer,
+    stance text,
+    impact integer,
+    classified_with text,
+    embedding real[],
+    embedded_with text,
+    update_mask smallint
+) ON COMMIT DROP
+"""
+
+_column_types: dict[str, dict[str, str]] = {}
+
+EnrichedItem = tuple[NormalizedItem, ClassificationResult | None, Sequence[float] | None]
+
+
+def copy_supported(session: AsyncSession) -> bool:
+    dialect = session.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "asyncpg"
+
+
+def stage_records(
+    items: Iterable[EnrichedItem],
+    pending: bool = False,
+    classified_with: str | None = None,
+    embedded_with: str | None = None,
+) -> list[tuple[Any, ...]]:
+    """Rows for ``STAGE_TABLE`` in ``ITEM_COLUMNS`` order plus ``update_mask``.
+
+    Payloads match :func:`crud.upsert_items`; a batch holding the same
+    ``source_id`` twice keeps the last copy.
+    """
+
+    payloads: dict[str, dict[str, Any]] = {}
+    for normalized, classification, embedding in items:
+        payloads[normalized.source_id] = crud.upsert_payload(
+            normalized, classification, embedding, pending, classified_with, embedded_with
+        )
+    records = []
+    for payload in payloads.values():
+        mask = (UPDATE_CLASSIFICATION if "topics" in payload else 0) | (
+            UPDATE_EMBEDDING if "embedding" in payload else 0
+        )
+        embedding = payload.get("embedding")
+        records.append(
+            (
+                uuid.uuid4(),
+                payload["source"].value,
+                payload["source_id"],
+                payload["author"],
+                payload["published_at"],
+                payload["lang"],
+                payload["text"],
+                json.dumps(payload["raw"], default=str),
+                list(payload["tickers"]),
+                json.dumps(payload["entities"], default=str),
+                payload["enrichment_pending"],
+                list(payload.get("topics") or []),
+                payload.get("sentiment"),
+                payload.get("stance"),
+                payload.get("impact"),
+                payload.get("classified_with"),
+                [float(value) for value in embedding] if embedding is not None else None,
+                payload.get("embedded_with"),
+                mask,
+            )
+        )
+    return records
+
+
+async def _target_types(session: AsyncSession) -> dict[str, str]:
+    key = str(session.get_bind().engine.url)
+    if key not in _column_types:
+        result = await session.execute(
+            text(
+                "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+                "WHERE attrelid = 'items'::regclass AND attnum > 0 AND NOT attisdropped"
+            )
+        )
+        _column_types[key] = {name: type_name for name, type_name in result.all()}
+    return _column_types[key]
+
+
+def _cast(column: str, target: str) -> str:
+    if column == "embedding" and target in ("json", "jsonb"):
+        # Without pgvector the column is JSON, which has no cast from real[].
+        return f"to_{target}(s.embedding)"
+    return f"CAST(s.{column} AS {target})"
+
+
+def _comparable(table: str, column: str, target: str) -> str:
+    # json has no equality operator; the embedding may be json or pgvector.
+    if target in ("json", "jsonb"):
+        return f"CAST({table}.{column} AS jsonb)"
+    if column == "embedding":
+        return f"CAST({table}.{column} AS text)"
+    return f"{table}.{column}"
+
+
+def _merge_sql(types: dict[str, str], mask: int, partitioned: bool) -> str:
+    updated = [column for column in BASE_COLUMNS if column not in crud.INSERT_ONLY_COLUMNS]
+    if mask & UPDATE_CLASSIFICATION:
+        updated.extend(CLASSIFICATION_COLUMNS)
+    if mask & UPDATE_EMBEDDING:
+        updated.extend(EMBEDDING_COLUMNS)
+    columns = ", ".join(ITEM_COLUMNS)
+    values = ", ".join(_cast(column, types[column]) for column in ITEM_COLUMNS)
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in updated)
+    changed = " OR ".join(
+        f"{_comparable('items', column, types[column])} "
+        f"IS DISTINCT FROM {_comparable('EXCLUDED', column, types[column])}"
+        for column in updated
+    )
+    return (
+        f"INSERT INTO items ({columns}) SELECT {values} FROM {STAGE_TABLE} s "
+        f"WHERE s.update_mask = {mask:d} "
+        f"ON CONFLICT ({', '.join(crud.conflict_columns(partitioned))}) "
+        f"DO UPDATE SET {assignments}, updated_at = now() "
+        f"WHERE {changed}"
+    )
+
+
+async def copy_upsert_items(
+    session: AsyncSession,
+    items: Iterable[EnrichedItem],
+    pending: bool = False,
+    classified_with: str | None = None,
+    embedded_with: str | None = None,
+) -> int:
+    """Upsert ``items`` through a binary ``COPY`` into a temp staging table.
+
+    PostgreSQL with asyncpg only. Rows are copied into ``STAGE_TABLE`` (temp
+    tables skip the WAL) and merged into ``items`` with one
+    ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` per update
+    mask, with the same semantics as :func:`crud.upsert_items`. Returns the
+    number of rows inserted or changed; the work commits with ``session``.
+    """
+
+    records = stage_records(items, pending, classified_with, embedded_with)
+    if not records:
+        return 0
+    types = await _target_types(session)
+    await session.execute(text(STAGE_DDL))
+    connection = await session.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    if driver is None:
+        raise RuntimeError("COPY needs an open asyncpg connection")
+    await driver.copy_records_to_table(
+        STAGE_TABLE, records=records, columns=[*ITEM_COLUMNS, "update_mask"]
+    )
+    partitioned = await partitions.is_partitioned(session)
+    if partitioned:
+        # Keep re-ingested posts in the month they were first stored under.
+        await session.execute(
+            text(
+                f"UPDATE {STAGE_TABLE} s SET published_at = k.published_at "
+                f"FROM {partitions.KEYS_TABLE} k WHERE k.source_id = s.source_id "
+                "AND k.published_at <> s.published_at"
+            )
+        )
+    written = 0
+    for mask in sorted({record[-1] for record in records}):
+        merge = text(_merge_sql(types, mask, partitioned))
+        result = cast(CursorResult[Any], await session.execute(merge))
+        written += result.rowcount
+    await session.execute(text(f"TRUNCATE {STAGE_TABLE}"))
+    return written
+
+
+async def store_items(
+    session: AsyncSession,
+    items: Iterable[EnrichedItem],
+    pending: bool = False,
+    classified_with: str | None = None,
+    embedded_with: str | None = None,
+    copy_min_rows: int = 0,
+) -> None:
+    """Upsert ``items``, via ``COPY`` for batches of at least ``copy_min_rows``.
+
+    ``copy_min_rows`` of ``0`` never uses ``COPY``; backends other than
+    PostgreSQL with asyncpg always go through :func:`crud.upsert_items`.
+    """
+
+    items = list(items)
+    if 0 < copy_min_rows <= len(items) and copy_supported(session):
+        await copy_upsert_items(session, items, pending, classified_with, embedded_with)
+    else:
+        await crud.upsert_items(session, items, pending, classified_with, embedded_with)
+
+
+@dataclass(slots=True)
+class LoadStats:
+    rows: int = 0
+    chunks: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+async def load_items(
+    stream: AsyncIterator[NormalizedItem],
+    chunk_size: int,
+    copy_min_rows: int = 1,
+    on_chunk: Callable[[LoadStats], None] | None = None,
+) -> LoadStats:
+    """Store everything ``stream`` yields, unenriched, ``chunk_size`` rows per transaction.
+
+    Rows are flagged ``enrichment_pending`` so the sweeper enriches them later.
+    """
+
+    stats = LoadStats()
+
+    async def _flush(chunk: list[NormalizedItem]) -> None:
+        mark_hash(chunk)
+        items = filter_duplicates(chunk)
+        async with get_session() as session:
+            await store_items(
+                session,
+                [(item, None, None) for item in items],
+                pending=True,
+                copy_min_rows=copy_min_rows,
+            )
+        stats.rows += len(items)
+        stats.chunks += 1
+        logger.info(
+            "Loaded chunk", extra={"rows": stats.rows, "rows_per_sec": round(stats.rate, 1)}
+        )
+        if on_chunk is not None:
+            on_chunk(stats)
+
+    chunk: list[NormalizedItem] = []
+    async for item in stream:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            await _flush(chunk)
+            chunk = []
+    if chunk:
+        await _flush(chunk)
+    return stats
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Sequence
+from typing import Any, Callable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import JSON, Row, Text, and_, cast, func, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import Item, SourceEnum
+from src.db import partitions
+from src.db.models import EmbeddingType, Item, SourceEnum
 from src.ingest.base import NormalizedItem
+from src.ingest.normalizer import extract_entities
+from src.llm.relevance import RELEVANCE_FILTER_MODEL
 from src.llm.schema import ClassificationResult
 
 
@@ -19,13 +27,38 @@ async def get_item_by_source_id(session: AsyncSession, source_id: str) -> Item |
     return result.scalar_one_or_none()
 
 
-async def upsert_item(
-    session: AsyncSession,
+def merge_tickers(extracted: Sequence[str], classified: Sequence[str]) -> list[str]:
+    """Dictionary tickers first, then any extra ones a model returned."""
+
+    return list(dict.fromkeys([*extracted, *(ticker.upper() for ticker in classified)]))
+
+
+def merge_entities(
+    extracted: Sequence[dict[str, str]], classified: Sequence[dict[str, str]]
+) -> list[dict[str, str]]:
+    seen = {(entity["type"], entity["text"].lower()) for entity in extracted}
+    merged = list(extracted)
+    for entity in classified:
+        key = (entity["type"], entity["text"].lower())
+        if key not in seen:
+            seen.add(key)
+            merged.append(entity)
+    return merged
+
+
+UPSERT_CHUNK_SIZE = 500
+# Columns written once on insert and never touched by an upsert's update.
+INSERT_ONLY_COLUMNS = frozenset({"id", "source_id", "created_at"})
+
+
+def upsert_payload(
     normalized: NormalizedItem,
     classification: ClassificationResult | None,
     embedding: Sequence[float] | None,
-) -> Item:
-    existing = await get_item_by_source_id(session, normalized.source_id)
+    pending: bool,
+    classified_with: str | None,
+    embedded_with: str | None,
+) -> dict[str, Any]:
     payload = {
         "source": SourceEnum(normalized.source),
         "source_id": normalized.source_id,
@@ -34,16 +67,48 @@ async def upsert_item(
         "lang": normalized.lang,
         "text": normalized.text,
         "raw": normalized.raw,
-        "tickers": classification.tickers if classification else [],
-        "entities": [entity.model_dump() for entity in classification.entities]
-        if classification
-        else [],
-        "topics": classification.topics if classification else [],
-        "sentiment": classification.sentiment if classification else None,
-        "stance": classification.stance if classification else None,
-        "impact": classification.impact if classification else None,
-        "embedding": list(embedding) if embedding is not None else None,
+        "enrichment_pending": pending,
+        "tickers": merge_tickers(normalized.tickers, classification.tickers if classification else []),
+        "entities": merge_entities(
+            normalized.entities,
+            [entity.model_dump() for entity in classification.entities] if classification else [],
+        ),
     }
+    # A pending upsert stores the raw post now and leaves missing enrichment to
+    # the sweeper, so it must not wipe what an earlier run already computed.
+    if classification is not None or not pending:
+        payload.update(
+            {
+                "topics": classification.topics if classification else [],
+                "sentiment": classification.sentiment if classification else None,
+                "stance": classification.stance if classification else None,
+                "impact": classification.impact if classification else None,
+                "classified_with": classified_with if classification else None,
+            }
+        )
+    if embedding is not None or not pending:
+        payload.update(
+            {
+                "embedding": list(embedding) if embedding is not None else None,
+                "embedded_with": embedded_with if embedding is not None else None,
+            }
+        )
+    return payload
+
+
+async def upsert_item(
+    session: AsyncSession,
+    normalized: NormalizedItem,
+    classification: ClassificationResult | None,
+    embedding: Sequence[float] | None,
+    pending: bool = False,
+    classified_with: str | None = None,
+    embedded_with: str | None = None,
+) -> Item:
+    existing = await get_item_by_source_id(session, normalized.source_id)
+    payload = upsert_payload(
+        normalized, classification, embedding, pending, classified_with, embedded_with
+    )
 
     if existing:
         for key, value in payload.items():
@@ -63,11 +128,223 @@ async def upsert_item(
     return item
 
 
+def conflict_columns(partitioned: bool) -> tuple[str, ...]:
+    """Upsert conflict target: a partitioned ``items`` (PostgreSQL, migration
+    0004) can only enforce unique keys that include ``published_at``."""
+
+    if partitioned:
+        return ("source_id", "published_at")
+    return ("source_id",)
+
+
+def _insert_for(dialect: str) -> Callable[..., Any]:
+    if dialect == "postgresql":
+        return postgresql_insert
+    if dialect == "sqlite":
+        return sqlite_insert
+    raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+
+
+def _comparable(expression: Any, dialect: str) -> Any:
+    # Migrated PostgreSQL schemas keep raw/entities as json, which has no
+    # equality operator, and the embedding may be json or pgvector.
+    if dialect == "postgresql":
+        if isinstance(expression.type, JSON):
+            return cast(expression, JSONB)
+        if isinstance(expression.type, EmbeddingType):
+            return cast(expression, Text)
+    return expression
+
+
+def _upsert_statement(dialect: str, table: Any, columns: Sequence[str], partitioned: bool) -> Any:
+    stmt = _insert_for(dialect)(table)
+    updated = [column for column in columns if column not in INSERT_ONLY_COLUMNS]
+    changed = [
+        _comparable(table.c[column], dialect).is_distinct_from(
+            _comparable(stmt.excluded[column], dialect)
+        )
+        for column in updated
+    ]
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[column] for column in conflict_columns(partitioned)],
+        set_={**{column: stmt.excluded[column] for column in updated}, "updated_at": func.now()},
+        where=or_(*changed),
+    ).returning(table.c.source_id, table.c.id)
+
+
 async def upsert_items(
     session: AsyncSession,
     items: Iterable[tuple[NormalizedItem, ClassificationResult | None, Sequence[float] | None]],
-) -> list[Item]:
-    results: list[Item] = []
+    pending: bool = False,
+    classified_with: str | None = None,
+    embedded_with: str | None = None,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> list[uuid.UUID]:
+    """Insert or update ``items`` by ``source_id`` and return their ids in input order.
+
+    Rows are written with one ``INSERT ... ON CONFLICT DO UPDATE`` statement
+    per chunk (grouped by which columns are set, since pending rows leave
+    enrichment columns alone). The update only fires when some column actually
+    changed, so re-storing identical rows costs no writes. Ids of rows skipped
+    that way are looked up afterwards. A batch holding the same ``source_id``
+    twice keeps the last copy. On a partitioned table a post already stored
+    keeps the ``published_at`` it was first stored with.
+    """
+
+    dialect = session.get_bind().dialect.name
+    payloads: dict[str, dict[str, Any]] = {}
+    order: list[str] = []
     for normalized, classification, embedding in items:
-        results.append(await upsert_item(session, normalized, classification, embedding))
-    return results
+        order.append(normalized.source_id)
+        payloads[normalized.source_id] = upsert_payload(
+            normalized, classification, embedding, pending, classified_with, embedded_with
+        )
+    partitioned = dialect == "postgresql" and await partitions.is_partitioned(session)
+    if partitioned:
+        keys = list(payloads)
+        for start in range(0, len(keys), chunk_size):
+            pinned = await partitions.pin_published_at(session, keys[start : start + chunk_size])
+            for source_id, published_at in pinned.items():
+                payloads[source_id]["published_at"] = published_at
+    table = Item.__table__
+    statements: dict[tuple[str, ...], Any] = {}
+    ids: dict[str, uuid.UUID] = {}
+    rows = list(payloads.values())
+    for start in range(0, len(rows), chunk_size):
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows[start : start + chunk_size]:
+            groups.setdefault(tuple(row), []).append({"id": uuid.uuid4(), **row})
+        for columns, group in groups.items():
+            stmt = statements.get(columns)
+            if stmt is None:
+                stmt = statements[columns] = _upsert_statement(
+                    dialect, table, columns, partitioned
+                )
+            # Executed as one parameter set per row so the statement compiles
+            # once; the driver layer folds it into multi-row VALUES pages.
+            for source_id, item_id in (await session.execute(stmt, group)).all():
+                ids[source_id] = item_id
+    unchanged = [source_id for source_id in payloads if source_id not in ids]
+    for start in range(0, len(unchanged), chunk_size):
+        stmt = select(Item.source_id, Item.id).where(
+            Item.source_id.in_(unchanged[start : start + chunk_size])
+        )
+        for source_id, item_id in (await session.execute(stmt)).all():
+            ids[source_id] = item_id
+    return [ids[source_id] for source_id in order]
+
+
+async def get_pending_items(session: AsyncSession, limit: int) -> list[Item]:
+    """Pending items least retried first, oldest first among equals.
+
+    Items that keep failing sink behind fresh ones instead of being retried
+    on every sweep, and a steady flow of new posts cannot starve old ones.
+    """
+
+    stmt = (
+        select(Item)
+        .where(Item.enrichment_pending.is_(True))
+        .order_by(Item.enrichment_attempts, Item.published_at)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def record_enrichment_attempts(session: AsyncSession, ids: Sequence[uuid.UUID]) -> None:
+    await session.execute(
+        update(Item)
+        .where(Item.id.in_(list(ids)))
+        .values(enrichment_attempts=Item.enrichment_attempts + 1)
+    )
+
+
+def to_normalized(row: Item | Row) -> NormalizedItem:
+    """Rebuild the item for re-enrichment, re-running extraction with the current dictionary."""
+
+    tickers, entities = extract_entities(row.text)
+    return NormalizedItem(
+        source=row.source,
+        source_id=row.source_id,
+        text=row.text,
+        raw=row.raw,
+        published_at=row.published_at,
+        author=row.author,
+        lang=row.lang,
+        tickers=tickers,
+        entities=entities,
+    )
+
+
+@dataclass(slots=True)
+class ItemSelection:
+    since: datetime | None = None
+    until: datetime | None = None
+    sources: Sequence[SourceEnum] | None = None
+    classified_with: str | None = None
+    embedded_with: str | None = None
+    stale_llm_model: str | None = None
+    stale_embed_model: str | None = None
+    after_id: str | None = None
+
+
+async def stream_items(
+    session: AsyncSession, selection: ItemSelection, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of item rows through a server-side cursor, ordered by id.
+
+    Only the columns needed to rebuild a ``NormalizedItem`` are selected so no
+    ORM identities accumulate in the session while the cursor is open. SQLite
+    keeps a shared lock for as long as a cursor is open, which would block the
+    writes made between batches, so there rows are paged by id instead.
+    """
+
+    stmt = select(
+        Item.id,
+        Item.source,
+        Item.source_id,
+        Item.author,
+        Item.published_at,
+        Item.lang,
+        Item.text,
+        Item.raw,
+    ).order_by(Item.id)
+    if selection.since is not None:
+        stmt = stmt.where(Item.published_at >= selection.since)
+    if selection.until is not None:
+        stmt = stmt.where(Item.published_at < selection.until)
+    if selection.sources:
+        stmt = stmt.where(Item.source.in_(list(selection.sources)))
+    if selection.classified_with is not None:
+        stmt = stmt.where(Item.classified_with == selection.classified_with)
+    if selection.embedded_with is not None:
+        stmt = stmt.where(Item.embedded_with == selection.embedded_with)
+    stale = []
+    if selection.stale_llm_model is not None:
+        # Posts the relevance filter skipped were never meant for the LLM.
+        stale.append(
+            and_(
+                Item.classified_with.is_distinct_from(selection.stale_llm_model),
+                Item.classified_with.is_distinct_from(RELEVANCE_FILTER_MODEL),
+            )
+        )
+    if selection.stale_embed_model is not None:
+        stale.append(Item.embedded_with.is_distinct_from(selection.stale_embed_model))
+    if stale:
+        stmt = stmt.where(or_(*stale))
+    after_id = uuid.UUID(selection.after_id) if selection.after_id else None
+
+    if session.get_bind().dialect.name == "sqlite":
+        while True:
+            page = stmt if after_id is None else stmt.where(Item.id > after_id)
+            rows = (await session.execute(page.limit(batch_size))).all()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1].id
+
+    if after_id is not None:
+        stmt = stmt.where(Item.id > after_id)
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
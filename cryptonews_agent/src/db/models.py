@@ -4,7 +4,17 @@ import enum
 import uuid
 from typing import Any, List, Sequence
 
-from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    Text,
+    false,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -26,6 +36,7 @@ class SourceEnum(str, enum.Enum):
 
 
 class StringArray(TypeDecorator[List[str]]):
+    impl = JSON
     cache_ok = True
 
     def load_dialect_impl(self, dialect):  # type: ignore[override]
@@ -47,6 +58,7 @@ class StringArray(TypeDecorator[List[str]]):
 
 
 class EmbeddingType(TypeDecorator[List[float]]):
+    impl = JSON
     cache_ok = True
 
     def load_dialect_impl(self, dialect):  # type: ignore[override]
@@ -94,6 +106,14 @@ class Item(Base):
     stance: Mapped[str | None] = mapped_column(String(16))
     impact: Mapped[int | None] = mapped_column(Integer)
     embedding: Mapped[List[float] | None] = mapped_column(EmbeddingType)
+    classified_with: Mapped[str | None] = mapped_column(String(128))
+    embedded_with: Mapped[str | None] = mapped_column(String(128))
+    enrichment_pending: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
+    enrichment_attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[Any] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -104,4 +124,5 @@ class Item(Base):
     __table_args__ = (
         Index("ix_items_source_published_at", "source", "published_at"),
         Index("ix_items_topics", "topics", postgresql_using="gin"),
+        Index("ix_items_enrichment_pending", "enrichment_pending"),
     )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Literal, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.base import get_session
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "items_p"
+DEFAULT_PARTITION = "items_default"
+KEYS_TABLE = "item_keys"
+PARTITION_NAME_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})_(\d{{2}})$")
+
+RetentionMode = Literal["detach", "drop", "archive"]
+
+
+def month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+@dataclass(slots=True)
+class Partition:
+    name: str
+    start: datetime
+
+    @property
+    def end(self) -> datetime:
+        return add_months(self.start, 1)
+
+    @classmethod
+    def for_month(cls, value: datetime) -> "Partition":
+        start = month_start(value)
+        return cls(f"{PARTITION_PREFIX}{start:%Y_%m}", start)
+
+    @classmethod
+    def from_name(cls, name: str) -> "Partition | None":
+        match = PARTITION_NAME_RE.match(name)
+        if match is None:
+            return None
+        year, month = (int(group) for group in match.groups())
+        return cls(name, datetime(year, month, 1, tzinfo=timezone.utc))
+
+    @property
+    def bounds_sql(self) -> str:
+        return f"FOR VALUES FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+
+    def create_sql(self) -> str:
+        return f"CREATE TABLE IF NOT EXISTS {self.name} PARTITION OF items {self.bounds_sql}"
+
+    def move_from_default_sql(self) -> list[str]:
+        """Statements creating this partition when ``items_default`` holds rows for it.
+
+        PostgreSQL refuses to attach a range the default partition has rows
+        in, so they are moved into a standalone table that is then attached.
+        Deleting them releases their ``source_id`` claims, which are restored.
+        """
+
+        return [
+            f"CREATE TABLE {self.name} (LIKE items INCLUDING DEFAULTS)",
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE published_at >= '{self.start.isoformat()}' "
+            f"AND published_at < '{self.end.isoformat()}' RETURNING *) "
+            f"INSERT INTO {self.name} SELECT * FROM moved",
+            f"ALTER TABLE items ATTACH PARTITION {self.name} {self.bounds_sql}",
+            f"INSERT INTO {KEYS_TABLE} (source_id, published_at, item_id) "
+            f"SELECT source_id, published_at, id FROM {self.name} "
+            "ON CONFLICT (source_id) DO NOTHING",
+        ]
+
+
+def months_between(first: datetime, last: datetime) -> list[Partition]:
+    """Monthly partitions covering ``first`` through ``last`` inclusive."""
+
+    partitions = []
+    current = month_start(first)
+    while current <= last:
+        partitions.append(Partition.for_month(current))
+        current = add_months(current, 1)
+    return partitions
+
+
+def retired(partitions: list[Partition], keep_months: int, now: datetime) -> list[Partition]:
+    """Partitions ending before the current month and the ``keep_months`` before it."""
+
+    cutoff = add_months(month_start(now), -keep_months)
+    return [partition for partition in partitions if partition.end <= cutoff]
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    result = await session.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('items'))"
+        )
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(session: AsyncSession) -> list[Partition]:
+    """Monthly partitions attached to ``items``, oldest first."""
+
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('items')"
+        )
+    )
+    partitions = [Partition.from_name(name) for name in result.scalars()]
+    return sorted((p for p in partitions if p is not None), key=lambda p: p.start)
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    months_ahead: int,
+    start: datetime | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Create missing monthly partitions from ``start`` (default: this month) on.
+
+    Partitions are created up to ``months_ahead`` months past ``now``. Rows
+    that already landed in ``items_default`` for a month, e.g. a stray
+    future-dated post, are moved into its new partition.
+    """
+
+    now = now or datetime.now(tz=timezone.utc)
+    existing = {partition.name for partition in await list_partitions(session)}
+    created = []
+    for partition in months_between(start or now, add_months(month_start(now), months_ahead)):
+        if partition.name in existing:
+            continue
+        stray = await session.execute(
+            text(
+                f"SELECT count(*) FROM {DEFAULT_PARTITION} "
+                "WHERE published_at >= :start AND published_at < :end"
+            ),
+            {"start": partition.start, "end": partition.end},
+        )
+        moved = stray.scalar() or 0
+        if moved:
+            for statement in partition.move_from_default_sql():
+                await session.execute(text(statement))
+        else:
+            await session.execute(text(partition.create_sql()))
+        created.append(partition.name)
+        logger.info("Created partition", extra={"partition": partition.name, "moved": moved})
+    return created
+
+
+async def pin_published_at(
+    session: AsyncSession, source_ids: Sequence[str]
+) -> dict[str, datetime]:
+    """``published_at`` each already-claimed source_id is stored under.
+
+    Writers use it so the claim trigger never has to move a re-ingested row
+    into another month's partition, which PostgreSQL rejects.
+    """
+
+    result = await session.execute(
+        text(f"SELECT source_id, published_at FROM {KEYS_TABLE} WHERE source_id = ANY(:ids)"),
+        {"ids": list(source_ids)},
+    )
+    return {source_id: published_at for source_id, published_at in result.all()}
+
+
+async def _archive(session: AsyncSession, partition: Partition, archive_dir: Path) -> Path:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{partition.name}.jsonl.gz"
+    rows = await session.stream(text(f"SELECT row_to_json(p)::text FROM {partition.name} p"))
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        async for (line,) in rows:
+            handle.write(line + "\n")
+    return path
+
+
+async def retire_partition(
+    session: AsyncSession,
+    partition: Partition,
+    mode: RetentionMode,
+    archive_dir: Path | None = None,
+) -> None:
+    """Detach or drop ``partition``, archiving it first in ``archive`` mode.
+
+    Its ``source_id`` claims are released, so posts from that range can be
+    stored again.
+    """
+
+    if mode == "archive":
+        if archive_dir is None:
+            raise ValueError("Archive mode needs an archive directory")
+        path = await _archive(session, partition, archive_dir)
+        logger.info("Archived partition", extra={"partition": partition.name, "path": str(path)})
+    await session.execute(
+        text(f"DELETE FROM {KEYS_TABLE} WHERE published_at >= :start AND published_at < :end"),
+        {"start": partition.start, "end": partition.end},
+    )
+    if mode == "detach":
+        await session.execute(text(f"ALTER TABLE items DETACH PARTITION {partition.name}"))
+    else:
+        await session.execute(text(f"DROP TABLE {partition.name}"))
+    logger.info("Retired partition", extra={"partition": partition.name, "mode": mode})
+
+
+async def apply_retention(
+    keep_months: int,
+    mode: RetentionMode,
+    archive_dir: Path | None = None,
+    now: datetime | None = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Retire partitions older than ``keep_months``, one transaction each."""
+
+    async with get_session() as session:
+        if not await is_partitioned(session):
+            return []
+        candidates = retired(
+            await list_partitions(session), keep_months, now or datetime.now(tz=timezone.utc)
+        )
+    if dry_run:
+        return [partition.name for partition in candidates]
+    for partition in candidates:
+        async with get_session() as session:
+            await retire_partition(session, partition, mode, archive_dir)
+    return [partition.name for partition in candidates]
+
+
+async def maintain_partitions(
+    months_ahead: int,
+    keep_months: int = 0,
+    mode: RetentionMode = "detach",
+    archive_dir: Path | None = None,
+) -> list[str]:
+    """Create upcoming partitions and, with ``keep_months`` set, retire old ones.
+
+    Does nothing unless ``items`` is partitioned. Returns retired partitions.
+    """
+
+    async with get_session() as session:
+        if not await is_partitioned(session):
+            return []
+        await ensure_partitions(session, months_ahead)
+    if keep_months <= 0:
+        return []
+    return await apply_retention(keep_months, mode, archive_dir)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import abc
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, List, Protocol
+from typing import Any, AsyncIterator, Callable, Dict, List, Protocol, Sequence, TypeVar
 
 from src.db.models import SourceEnum
 
@@ -18,6 +19,11 @@ class NormalizedItem:
     author: str | None = None
     lang: str | None = None
     content_hash: str | None = None
+    tickers: List[str] = field(default_factory=list)
+    entities: List[Dict[str, str]] = field(default_factory=list)
+
+
+T = TypeVar("T")
 
 
 class Source(Protocol):
@@ -26,6 +32,9 @@ class Source(Protocol):
     async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
         ...
 
+    def stream_since(self, since_dt: datetime) -> AsyncIterator[NormalizedItem]:
+        ...
+
     async def normalize(self, raw: Any) -> NormalizedItem:
         ...
 
@@ -39,6 +48,64 @@ class BaseSource(abc.ABC):
     async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
         raise NotImplementedError
 
+    async def stream_since(self, since_dt: datetime) -> AsyncIterator[NormalizedItem]:
+        """Yield new items as they are fetched.
+
+        This default adapter for sources that only implement :meth:`fetch_since`
+        yields its list; streaming sources override it and build
+        :meth:`fetch_since` on top with :func:`collect`.
+        """
+
+        for item in await self.fetch_since(since_dt):
+            yield item
+
     @abc.abstractmethod
     async def normalize(self, raw: Any) -> NormalizedItem:
         raise NotImplementedError
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        """Normalize a whole page of raw records; override to batch the CPU work."""
+
+        return [await self.normalize(raw) for raw in raws]
+
+
+async def collect(stream: AsyncIterator[T]) -> List[T]:
+    return [item async for item in stream]
+
+
+async def merge_streams(
+    streams: Sequence[AsyncIterator[T]],
+    on_error: Callable[[int, BaseException], None] | None = None,
+) -> AsyncIterator[T]:
+    """Drain ``streams`` concurrently and yield items in arrival order.
+
+    A stream that raises is reported to ``on_error`` with its index and the
+    others carry on. Closing the merged iterator cancels the remaining ones.
+    """
+
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(maxsize=1000)
+
+    async def _drain(index: int, stream: AsyncIterator[T]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((False, item))
+        except Exception as exc:
+            if on_error is not None:
+                on_error(index, exc)
+        # Cancelled drains skip this: the consumer has gone, and a full queue
+        # would block them for good.
+        await queue.put((True, None))
+
+    tasks = [asyncio.create_task(_drain(index, stream)) for index, stream in enumerate(streams)]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            done, item = await queue.get()
+            if done:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+CASHTAG_RE = re.compile(r"(?<![\w$])\$([A-Za-z][A-Za-z0-9]{1,9})\b")
+
+
+@dataclass(slots=True)
+class DictionaryEntry:
+    """One dictionary record: a canonical name, its aliases and an optional ticker."""
+
+    type: str
+    text: str
+    ticker: str | None = None
+    aliases: list[str] = field(default_factory=list)
+
+    def patterns(self) -> Iterator[str]:
+        yield self.text
+        if self.ticker:
+            yield self.ticker
+        yield from self.aliases
+
+
+# A small built-in dictionary so extraction works out of the box; production
+# deployments point ENTITY_DICTIONARY_PATH at the full coin/exchange list.
+DEFAULT_ENTRIES: tuple[DictionaryEntry, ...] = (
+    DictionaryEntry("COIN", "Bitcoin", "BTC", ["btc", "биткоин", "биткойн", "xbt"]),
+    DictionaryEntry("COIN", "Ethereum", "ETH", ["eth", "ether", "эфир", "эфириум"]),
+    DictionaryEntry("COIN", "Solana", "SOL"),
+    DictionaryEntry("COIN", "XRP", "XRP", ["ripple"]),
+    DictionaryEntry("COIN", "BNB", "BNB"),
+    DictionaryEntry("COIN", "Cardano", "ADA"),
+    DictionaryEntry("COIN", "Dogecoin", "DOGE"),
+    DictionaryEntry("COIN", "Toncoin", "TON"),
+    DictionaryEntry("COIN", "Tether", "USDT"),
+    DictionaryEntry("COIN", "USD Coin", "USDC"),
+    DictionaryEntry("ORG", "Binance", None, ["бинанс"]),
+    DictionaryEntry("ORG", "Coinbase"),
+    DictionaryEntry("ORG", "Kraken"),
+    DictionaryEntry("ORG", "OKX"),
+    DictionaryEntry("ORG", "Bybit"),
+    DictionaryEntry("ORG", "BlackRock"),
+    DictionaryEntry("REGULATOR", "SEC", None, ["Securities and Exchange Commission"]),
+    DictionaryEntry("REGULATOR", "CFTC"),
+    DictionaryEntry("REGULATOR", "Federal Reserve", None, ["FOMC", "the Fed", "ФРС"]),
+    DictionaryEntry("REGULATOR", "ECB", None, ["European Central Bank"]),
+    DictionaryEntry("REGULATOR", "Bank of Russia", None, ["ЦБ РФ", "Банк России"]),
+)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over lower-cased text, built once and shared read-only.
+
+    Matches must start and end on word boundaries. Patterns that are short and
+    fully upper-case in the dictionary (tickers such as ``SOL`` or ``ONE``) must
+    also match case exactly, so ordinary words do not turn into tickers.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, Any]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, str, Any]]] = [[]]
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._build()
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for char in pattern.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        exact = pattern if pattern.isupper() and len(pattern) <= 5 else ""
+        self._out[state].append((len(pattern), exact, payload))
+
+    def _build(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> Iterator[tuple[int, int, Any]]:
+        """Yield ``(start, end, payload)`` for every whole-word match in ``text``."""
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare case-folding that changes length; fall back to the original.
+            lowered = text
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if not self._out[state]:
+                continue
+            end = index + 1
+            for length, exact, payload in self._out[state]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]):
+                    continue
+                if exact and text[start:end] != exact:
+                    continue
+                yield start, end, payload
+
+
+class EntityExtractor:
+    """Extract tickers and entities with cashtags plus a compiled dictionary.
+
+    When built from a file the dictionary is reloaded (and recompiled off to the
+    side, then swapped in) whenever the file's mtime changes, checked at most
+    every ``reload_seconds``.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[DictionaryEntry] = DEFAULT_ENTRIES,
+        path: str | Path | None = None,
+        reload_seconds: float = 30.0,
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._checked = time.monotonic()
+        self._matcher = self._compile(list(entries))
+        if self._path is not None:
+            self.reload()
+
+    @staticmethod
+    def _compile(entries: list[DictionaryEntry]) -> AhoCorasick:
+        return AhoCorasick(
+            (pattern, entry) for entry in entries for pattern in entry.patterns()
+        )
+
+    def reload(self) -> bool:
+        """Recompile from the dictionary file if it changed; return True if reloaded."""
+
+        if self._path is None:
+            return False
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                mtime = os.stat(self._path).st_mtime
+            except OSError as exc:
+                logger.warning(
+                    "Entity dictionary unavailable", extra={"path": str(self._path), "error": str(exc)}
+                )
+                return False
+            if mtime == self._mtime:
+                return False
+            try:
+                entries = load_dictionary(self._path)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                logger.warning(
+                    "Entity dictionary invalid; keeping previous",
+                    extra={"path": str(self._path), "error": str(exc)},
+                )
+                return False
+            self._matcher = self._compile(entries)
+            self._mtime = mtime
+        logger.info("Entity dictionary loaded", extra={"path": str(self._path), "entries": len(entries)})
+        return True
+
+    def _maybe_reload(self) -> None:
+        if self._path is not None and time.monotonic() - self._checked >= self._reload_seconds:
+            self.reload()
+
+    def extract(self, text: str) -> tuple[list[str], list[dict[str, str]]]:
+        """Return ``(tickers, entities)`` in order of first mention, without duplicates."""
+
+        self._maybe_reload()
+        tickers: dict[str, None] = {}
+        entities: dict[tuple[str, str], None] = {}
+        for match in CASHTAG_RE.finditer(text):
+            tickers[match.group(1).upper()] = None
+        for _, _, entry in self._matcher.find(text):
+            if entry.ticker:
+                tickers[entry.ticker] = None
+            entities[(entry.type, entry.text)] = None
+        return list(tickers), [{"type": kind, "text": name} for kind, name in entities]
+
+
+def load_dictionary(path: str | Path) -> list[DictionaryEntry]:
+    """Read a JSON array or JSON-lines file of ``{"type", "text", "ticker", "aliases"}``."""
+
+    content = Path(path).read_text(encoding="utf-8").strip()
+    if content.startswith("["):
+        records = json.loads(content)
+    else:
+        records = [json.loads(line) for line in content.splitlines() if line.strip()]
+    return [
+        DictionaryEntry(
+            type=record["type"],
+            text=record["text"],
+            ticker=record.get("ticker"),
+            aliases=list(record.get("aliases", [])),
+        )
+        for record in records
+    ]
+
+
+_extractor: EntityExtractor | None = None
+
+
+def get_extractor() -> EntityExtractor:
+    global _extractor
+    if _extractor is None:
+        from src.config import get_settings
+
+        settings = get_settings()
+        _extractor = EntityExtractor(
+            path=settings.entity_dictionary_path,
+            reload_seconds=settings.entity_dictionary_reload_seconds,
+        )
+    return _extractor
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
 import re
+import threading
 import unicodedata
-from typing import Iterable
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Protocol, Sequence
 
 from langdetect import DetectorFactory, LangDetectException, detect
 
+from src.ingest.entities import get_extractor
+from src.utils.tokens import truncate_to_tokens
+
 DetectorFactory.seed = 0
 
 URL_RE = re.compile(r"https?://\S+")
@@ -20,6 +29,29 @@ EMOJI_RE = re.compile(
 MULTISPACE_RE = re.compile(r"\s+")
 RT_PREFIX_RE = re.compile(r"^RT @[^:]+: ")
 
+# Language detection only looks at a prefix; more text rarely changes the answer.
+DETECT_MAX_CHARS = 1000
+LETTER_RE = re.compile(r"[^\W\d_]")
+ASCII_LETTER_RE = re.compile(r"[A-Za-z]")
+LATIN_EXTENDED_RE = re.compile(r"[\u00C0-\u024F]")
+CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
+# Letters used by other Cyrillic languages (uk, be, sr, mk) but not Russian.
+NON_RUSSIAN_CYRILLIC_RE = re.compile(r"[іїєґўђјљњћџѓќІЇЄҐЎЂЈЉЊЋЏЃЌ]")
+ASCII_WORD_RE = re.compile(r"[a-z']+")
+# Function words that are English-only; "a", "in", "is", "was" etc. are left
+# out because they are also common words in other Latin-script languages.
+ENGLISH_STOPWORDS = frozenset(
+    "the and of to for with this that will be been are were has have had it's its from by you "
+    "we they not but just after than what when which would could should about into over".split()
+)
+SCRIPT_LANGUAGES = (
+    (re.compile(r"[\u3040-\u30FF]"), "ja"),
+    (re.compile(r"[\uAC00-\uD7AF]"), "ko"),
+    (re.compile(r"[\u0370-\u03FF]"), "el"),
+    (re.compile(r"[\u0590-\u05FF]"), "he"),
+    (re.compile(r"[\u0E00-\u0E7F]"), "th"),
+)
+
 
 def normalize_text(text: str) -> str:
     """Normalize text by removing URLs, emojis, RT markers, and collapsing whitespace."""
@@ -32,22 +64,305 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+class LanguageDetector(Protocol):
+    def detect(self, text: str) -> str | None:
+        ...
+
+    def detect_batch(self, texts: Sequence[str]) -> list[str | None]:
+        ...
+
+
+class LangdetectDetector:
+    """langdetect's n-gram profiles; accurate across 55 languages but pure Python and slow."""
+
+    def detect(self, text: str) -> str | None:
+        try:
+            return detect(text)
+        except LangDetectException:
+            return None
+
+    def detect_batch(self, texts: Sequence[str]) -> list[str | None]:
+        return [self.detect(text) for text in texts]
+
+
+class ScriptDetector:
+    """Fast path deciding the common cases from the script alone.
+
+    Mostly-Cyrillic text without Ukrainian/Serbian-only letters is Russian,
+    plain-ASCII text with enough English function words is English, and kana,
+    Hangul, Greek, Hebrew and Thai map to their languages. Anything else goes to
+    ``fallback`` (or is ``None`` without one).
+    """
+
+    def __init__(self, fallback: LanguageDetector | None = None, min_share: float = 0.6) -> None:
+        self._fallback = fallback
+        self._min_share = min_share
+
+    def fast(self, text: str) -> str | None:
+        letters = len(LETTER_RE.findall(text))
+        if not letters:
+            return None
+        cyrillic = len(CYRILLIC_RE.findall(text))
+        if cyrillic >= letters * self._min_share:
+            return None if NON_RUSSIAN_CYRILLIC_RE.search(text) else "ru"
+        ascii_letters = len(ASCII_LETTER_RE.findall(text))
+        if ascii_letters >= letters * self._min_share and not LATIN_EXTENDED_RE.search(text):
+            words = ASCII_WORD_RE.findall(text.lower())
+            hits = sum(1 for word in words if word in ENGLISH_STOPWORDS)
+            if hits and hits * 8 >= len(words):
+                return "en"
+            return None
+        for pattern, lang in SCRIPT_LANGUAGES:
+            if len(pattern.findall(text)) >= letters * self._min_share:
+                return lang
+        return None
+
+    def detect(self, text: str) -> str | None:
+        lang = self.fast(text)
+        if lang is None and self._fallback is not None:
+            return self._fallback.detect(text)
+        return lang
+
+    def detect_batch(self, texts: Sequence[str]) -> list[str | None]:
+        results = [self.fast(text) for text in texts]
+        if self._fallback is not None:
+            pending = [index for index, lang in enumerate(results) if lang is None]
+            if pending:
+                detected = self._fallback.detect_batch([texts[index] for index in pending])
+                for index, lang in zip(pending, detected):
+                    results[index] = lang
+        return results
+
+
+class CachedDetector:
+    """Bounded LRU cache in front of a detector; reposts and templated posts repeat a lot."""
+
+    def __init__(self, detector: LanguageDetector, maxsize: int = 10_000) -> None:
+        self._detector = detector
+        self._maxsize = maxsize
+        self._cache: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, text: str) -> tuple[bool, str | None]:
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return True, self._cache[text]
+            self.misses += 1
+            return False, None
+
+    def _put(self, text: str, lang: str | None) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._cache[text] = lang
+            self._cache.move_to_end(text)
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+
+    def detect(self, text: str) -> str | None:
+        found, lang = self._get(text)
+        if not found:
+            lang = self._detector.detect(text)
+            self._put(text, lang)
+        return lang
+
+    def detect_batch(self, texts: Sequence[str]) -> list[str | None]:
+        results: list[str | None] = []
+        missing: dict[str, None] = {}
+        for text in texts:
+            found, lang = self._get(text)
+            results.append(lang)
+            if not found:
+                missing[text] = None
+        if missing:
+            detected = dict(zip(missing, self._detector.detect_batch(list(missing))))
+            for text, lang in detected.items():
+                self._put(text, lang)
+            results = [detected.get(text, lang) for text, lang in zip(texts, results)]
+        return results
+
+
+def build_detector(name: str, cache_size: int = 10_000) -> LanguageDetector:
+    """``fast`` (script fast path, langdetect fallback), ``script`` or ``langdetect``."""
+
+    if name == "langdetect":
+        detector: LanguageDetector = LangdetectDetector()
+    elif name == "script":
+        detector = ScriptDetector()
+    elif name == "fast":
+        detector = ScriptDetector(fallback=LangdetectDetector())
+    else:
+        raise ValueError(f"Unknown language detector: {name}")
+    return CachedDetector(detector, cache_size) if cache_size > 0 else detector
+
+
+_detector: LanguageDetector | None = None
+
+
+def get_detector() -> LanguageDetector:
+    global _detector
+    if _detector is None:
+        from src.config import get_settings
+
+        settings = get_settings()
+        _detector = build_detector(settings.lang_detector, settings.lang_detect_cache_size)
+    return _detector
+
+
+def _detect_input(text: str) -> str:
+    return text.strip()[:DETECT_MAX_CHARS]
+
+
 def detect_language(text: str) -> str | None:
-    cleaned = text.strip()
+    cleaned = _detect_input(text)
     if not cleaned:
         return None
-    try:
-        lang = detect(cleaned)
-    except LangDetectException:
-        return None
-    return lang
+    return get_detector().detect(cleaned)
+
+
+def detect_languages(texts: Sequence[str]) -> list[str | None]:
+    """Batch form of :func:`detect_language`."""
+
+    cleaned = [_detect_input(text) for text in texts]
+    present = [index for index, text in enumerate(cleaned) if text]
+    results: list[str | None] = [None] * len(cleaned)
+    if present:
+        detected = get_detector().detect_batch([cleaned[index] for index in present])
+        for index, lang in zip(present, detected):
+            results[index] = lang
+    return results
 
 
 def truncate_tokens(text: str, max_tokens: int) -> str:
-    words = text.split()
-    if len(words) <= max_tokens:
-        return text
-    return " ".join(words[:max_tokens])
+    """Truncate ``text`` to ``max_tokens`` model tokens (see ``TOKENIZER``)."""
+
+    return truncate_to_tokens(text, max_tokens)
+
+
+def extract_entities(text: str) -> tuple[list[str], list[dict[str, str]]]:
+    """Return ``(tickers, entities)`` found by cashtags and the entity dictionary."""
+
+    return get_extractor().extract(text)
+
+
+@dataclass(slots=True)
+class NormalizedText:
+    """Result of the text half of normalization; sources add the metadata."""
+
+    text: str
+    lang: str | None
+    tickers: list[str] = field(default_factory=list)
+    entities: list[dict[str, str]] = field(default_factory=list)
+
+
+def normalize_texts(
+    texts: Sequence[str], max_tokens: int, langs: Sequence[str | None] | None = None
+) -> list[NormalizedText]:
+    """Clean, extract entities, truncate and detect the language of ``texts``.
+
+    ``langs`` carries languages already reported by the source API; only the
+    missing ones are detected, in one batch.
+    """
+
+    results: list[NormalizedText] = []
+    for text in texts:
+        cleaned = normalize_text(text)
+        tickers, entities = extract_entities(cleaned)
+        results.append(
+            NormalizedText(truncate_tokens(cleaned, max_tokens), None, tickers, entities)
+        )
+    known: list[str | None] = list(langs) if langs is not None else [None] * len(results)
+    missing = [index for index, lang in enumerate(known) if not lang]
+    detected = detect_languages([results[index].text for index in missing])
+    for index, lang in zip(missing, detected):
+        known[index] = lang
+    for result, lang in zip(results, known):
+        result.lang = lang or None
+    return results
+
+
+class BatchNormalizer:
+    """Run :func:`normalize_texts` on a process pool in chunks of ``chunk_size``.
+
+    Every batch, including one no larger than a chunk, goes to the pool so
+    the event loop never does the cleaning and language detection itself.
+    With ``workers`` set to 0 the work runs inline. Worker processes are
+    spawned, not forked, because the parent runs an event loop and client
+    threads.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 64) -> None:
+        self._workers = max(0, workers)
+        self._chunk_size = max(1, chunk_size)
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def normalize(
+        self, texts: Sequence[str], max_tokens: int, langs: Sequence[str | None] | None = None
+    ) -> list[NormalizedText]:
+        if not self._workers or not texts:
+            return normalize_texts(texts, max_tokens, langs)
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        futures = []
+        for start in range(0, len(texts), self._chunk_size):
+            end = start + self._chunk_size
+            chunk_langs = list(langs[start:end]) if langs is not None else None
+            futures.append(
+                loop.run_in_executor(
+                    pool, normalize_texts, list(texts[start:end]), max_tokens, chunk_langs
+                )
+            )
+        return [result for chunk in await asyncio.gather(*futures) for result in chunk]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_batch_normalizer: BatchNormalizer | None = None
+
+
+def get_batch_normalizer() -> BatchNormalizer:
+    global _batch_normalizer
+    if _batch_normalizer is None:
+        from src.config import get_settings
+
+        settings = get_settings()
+        _batch_normalizer = BatchNormalizer(
+            settings.normalize_workers, settings.normalize_chunk_size
+        )
+    return _batch_normalizer
+
+
+async def normalize_batch(
+    texts: Sequence[str], max_tokens: int, langs: Sequence[str | None] | None = None
+) -> list[NormalizedText]:
+    """Normalize a page of texts off the event loop (see ``NORMALIZE_WORKERS``)."""
+
+    return await get_batch_normalizer().normalize(texts, max_tokens, langs)
+
+
+def shutdown_batch_normalizer() -> None:
+    global _batch_normalizer
+    if _batch_normalizer is not None:
+        _batch_normalizer.shutdown()
+        _batch_normalizer = None
 
 
 def iter_chunks(iterable: Iterable[str], size: int) -> Iterable[list[str]]:
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Iterable, List, Sequence
+from typing import Any, AsyncIterator, List, Sequence
 
 try:  # pragma: no cover - optional dependency
     import praw
 except Exception:  # pragma: no cover
     praw = None  # type: ignore
 
-from src.ingest.base import BaseSource, NormalizedItem
-from src.ingest.normalizer import detect_language, normalize_text, truncate_tokens
+from src.ingest.base import BaseSource, NormalizedItem, collect, merge_streams
+from src.ingest.normalizer import NormalizedText, normalize_batch
+
+logger = logging.getLogger(__name__)
 
 
 class RedditSource(BaseSource):
@@ -18,6 +23,7 @@ class RedditSource(BaseSource):
         client: praw.Reddit | None,
         subreddits: Sequence[str],
         max_tokens: int = 1500,
+        fetch_concurrency: int = 4,
     ) -> None:
         from src.db.models import SourceEnum
 
@@ -25,24 +31,81 @@ class RedditSource(BaseSource):
         self._client = client
         self._subreddits = list(subreddits)
         self._max_tokens = max_tokens
+        # praw is synchronous; its HTTP calls run on this pool so the event loop
+        # keeps serving other sources and LLM calls. The pool size caps how many
+        # subreddits are fetched at once.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, fetch_concurrency), thread_name_prefix="reddit"
+        )
+        # Newest submission seen per subreddit, so subreddits polled on their
+        # own schedules do not miss posts older than another one's latest.
+        self._latest: dict[str, datetime] = {}
+
+    @property
+    def channels(self) -> list[str]:
+        return list(self._subreddits)
 
     async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
-        if self._client is None:
-            return []
-        items: list[NormalizedItem] = []
-        for subreddit_name in self._subreddits:
-            subreddit = self._client.subreddit(subreddit_name)
-            for submission in subreddit.new(limit=100):
-                created = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
-                if created <= since_dt.replace(tzinfo=timezone.utc):
-                    continue
-                items.append(await self.normalize(submission))
-        return items
+        return await collect(self.stream_since(since_dt))
+
+    async def stream_since(
+        self, since_dt: datetime, channels: Sequence[str] | None = None
+    ) -> AsyncIterator[NormalizedItem]:
+        """Yield each subreddit's new submissions as soon as its listing arrives.
+
+        ``channels`` limits the poll to those subreddits.
+        """
+
+        subreddits = self._subreddits if channels is None else list(channels)
+        if self._client is None or not subreddits:
+            return
+        since = since_dt.replace(tzinfo=timezone.utc)
+
+        def _failed(index: int, exc: BaseException) -> None:
+            logger.warning(
+                "Reddit fetch failed",
+                extra={"subreddit": subreddits[index], "error": str(exc)},
+            )
+
+        latest: dict[str, datetime] = {}
+        streams = [self._stream_subreddit(name, since, latest) for name in subreddits]
+        async for item in merge_streams(streams, on_error=_failed):
+            yield item
+        # Listings finish once buffered; only move past them after every item was taken.
+        self._latest.update(latest)
+
+    async def _stream_subreddit(
+        self, name: str, since: datetime, latest: dict[str, datetime]
+    ) -> AsyncIterator[NormalizedItem]:
+        loop = asyncio.get_running_loop()
+        since = min(since, self._latest.get(name, since))
+        submissions = await loop.run_in_executor(self._executor, self._fetch_subreddit, name, since)
+        items = await self.normalize_page(submissions)
+        for item in items:
+            yield item
+        # Kept even when empty: the worker's next since follows the busiest subreddit.
+        latest[name] = max((item.published_at for item in items), default=since)
+
+    def _fetch_subreddit(self, name: str, since: datetime) -> list[Any]:
+        """Blocking: collect submissions newer than ``since`` (listing is newest first)."""
+
+        submissions = []
+        for submission in self._client.subreddit(name).new(limit=100):
+            created = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
+            if created <= since:
+                break
+            submissions.append(submission)
+        return submissions
 
     async def normalize(self, raw: Any) -> NormalizedItem:
-        text = raw.selftext or raw.title or ""
-        text = truncate_tokens(normalize_text(text), self._max_tokens)
-        lang = detect_language(text)
+        return (await self.normalize_page([raw]))[0]
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        texts = [raw.selftext or raw.title or "" for raw in raws]
+        normalized = await normalize_batch(texts, self._max_tokens)
+        return [self._to_item(raw, result) for raw, result in zip(raws, normalized)]
+
+    def _to_item(self, raw: Any, result: NormalizedText) -> NormalizedItem:
         published_at = datetime.fromtimestamp(raw.created_utc, tz=timezone.utc)
         payload = {
             "id": raw.id,
@@ -53,9 +116,11 @@ class RedditSource(BaseSource):
         return NormalizedItem(
             source=self.source_enum,
             source_id=raw.name if hasattr(raw, "name") else str(raw.id),
-            text=text,
+            text=result.text,
             raw=payload,
             published_at=published_at,
             author=getattr(raw, "author", None).name if getattr(raw, "author", None) else None,
-            lang=lang,
+            lang=result.lang,
+            tickers=result.tickers,
+            entities=result.entities,
         )
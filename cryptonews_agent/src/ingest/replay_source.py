@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import json
+import logging
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Mapping, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pq = None  # type: ignore
+
+from src.db.models import SourceEnum
+from src.ingest.base import BaseSource, NormalizedItem, collect
+from src.ingest.normalizer import NormalizedText, normalize_batch
+from src.utils.time import parse_iso8601
+
+logger = logging.getLogger(__name__)
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson", ".json")
+ARCHIVE_SUFFIXES = (
+    *JSONL_SUFFIXES,
+    *(suffix + ".gz" for suffix in JSONL_SUFFIXES),
+    *(suffix + ".zst" for suffix in JSONL_SUFFIXES),
+    ".parquet",
+)
+
+
+@dataclass(slots=True)
+class FieldMapping:
+    """Where each ``NormalizedItem`` field lives in an archived record.
+
+    Every value is a ``|``-separated chain of alternatives; the first one that
+    yields a non-empty value wins. An alternative is a dotted path
+    (``account.acct``) or, if it contains ``{``, a format template over the
+    record (``{channel}:{id}``), so replayed ids match the ones the live
+    source produces.
+    """
+
+    text: str
+    published_at: str
+    source_id: str
+    author: str = ""
+    lang: str = ""
+
+    def with_overrides(self, overrides: Mapping[str, str]) -> "FieldMapping":
+        known = {item.name for item in fields(self)}
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"Unknown mapping fields: {', '.join(sorted(unknown))}")
+        values = {name: getattr(self, name) for name in known}
+        values.update(overrides)
+        return FieldMapping(**values)
+
+    @classmethod
+    def load(cls, path: str | Path, base: "FieldMapping") -> "FieldMapping":
+        return base.with_overrides(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+DEFAULT_MAPPINGS: dict[SourceEnum, FieldMapping] = {
+    SourceEnum.telegram: FieldMapping(
+        text="message|text",
+        published_at="date",
+        source_id="{channel}:{id}",
+        author="sender_id|from_id",
+    ),
+    SourceEnum.reddit: FieldMapping(
+        text="selftext|title",
+        published_at="created_utc",
+        source_id="name|t3_{id}",
+        author="author",
+    ),
+    SourceEnum.twitter: FieldMapping(
+        text="text|full_text",
+        published_at="created_at",
+        source_id="id_str|id",
+        author="author_id|user.screen_name",
+        lang="lang",
+    ),
+    SourceEnum.truth_social: FieldMapping(
+        text="content",
+        published_at="created_at",
+        source_id="id",
+        author="account.acct",
+        lang="language",
+    ),
+}
+
+
+class _RecordView(dict):  # type: ignore[type-arg]
+    """Lets ``str.format_map`` templates read missing keys as errors we can skip."""
+
+    def __missing__(self, key: str) -> Any:
+        raise KeyError(key)
+
+
+def _lookup(record: Mapping[str, Any], path: str) -> Any:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part)
+    return value
+
+
+def resolve(record: Mapping[str, Any], spec: str) -> Any:
+    """Return the first non-empty alternative of ``spec`` for ``record``."""
+
+    for alternative in spec.split("|") if spec else ():
+        alternative = alternative.strip()
+        if "{" in alternative:
+            try:
+                value: Any = alternative.format_map(_RecordView(record))
+            except (KeyError, IndexError, AttributeError):
+                continue
+        else:
+            value = _lookup(record, alternative)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """Accept epoch seconds or milliseconds, ISO 8601 strings and datetimes."""
+
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, (int, float)) or (
+        isinstance(value, str) and value.replace(".", "", 1).isdigit()
+    ):
+        seconds = float(value)
+        if seconds > 1e12:
+            seconds /= 1000
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    try:
+        return parse_iso8601(str(value))
+    except (ValueError, OverflowError):
+        return None
+
+
+def archive_files(path: str | Path) -> list[Path]:
+    """``path`` itself, or every supported archive below it in name order."""
+
+    root = Path(path)
+    if root.is_file():
+        return [root]
+    return sorted(
+        file for file in root.rglob("*") if file.is_file() and file.name.endswith(ARCHIVE_SUFFIXES)
+    )
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")  # type: ignore[return-value]
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst archives requires the zstandard package")
+        raw = path.open("rb")
+        # Pushshift-style dumps use long-distance matching windows.
+        reader = zstandard.ZstdDecompressor(max_window_size=2**31).stream_reader(raw)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+def iter_record_pages(path: Path, page_size: int) -> Iterator[list[dict[str, Any]]]:
+    """Yield lists of at most ``page_size`` records from one archive file."""
+
+    if path.suffix == ".parquet":
+        if pq is None:
+            raise RuntimeError("Reading Parquet archives requires the pyarrow package")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=page_size):
+            # Round-trip through JSON so timestamps and decimals fit the raw JSON column.
+            yield [json.loads(json.dumps(row, default=_json_default)) for row in batch.to_pylist()]
+        return
+    page: list[dict[str, Any]] = []
+    with _open_text(path) as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(
+                    "Skipping malformed record", extra={"path": str(path), "line": line_number}
+                )
+                continue
+            if isinstance(record, dict):
+                page.append(record)
+            if len(page) >= page_size:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+@dataclass(slots=True)
+class ReplayCounters:
+    records: int = 0
+    skipped: int = 0
+    items: int = 0
+
+
+class ReplaySource(BaseSource):
+    """Replay exported posts from JSONL (plain, gzip or zstd) or Parquet archives.
+
+    Files are read one page of ``page_size`` records at a time on a worker
+    thread and normalized like a live page, so memory stays bounded by a page
+    regardless of archive size. Records are mapped with ``mapping`` (the
+    source's default if omitted); those without text, id or a parseable date,
+    or outside ``since``/``until``, are skipped. Items keep the real source's
+    enum so replayed posts dedupe against live ones.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        source: SourceEnum,
+        mapping: FieldMapping | None = None,
+        max_tokens: int = 1500,
+        page_size: int = 500,
+        until: datetime | None = None,
+        limit: int | None = None,
+    ) -> None:
+        super().__init__(f"replay:{source.value}", source)
+        self._files = archive_files(path)
+        self._mapping = mapping or DEFAULT_MAPPINGS[source]
+        self._max_tokens = max_tokens
+        self._page_size = max(1, page_size)
+        self._until = until
+        self._limit = limit
+        self.counters = ReplayCounters()
+        if not self._files:
+            logger.warning("No archives found", extra={"path": str(path)})
+
+    @property
+    def files(self) -> list[Path]:
+        return list(self._files)
+
+    async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
+        return await collect(self.stream_since(since_dt))
+
+    async def stream_since(self, since_dt: datetime) -> AsyncIterator[NormalizedItem]:
+        loop = asyncio.get_running_loop()
+        for path in self._files:
+            logger.info("Replaying archive", extra={"path": str(path)})
+            pages = iter_record_pages(path, self._page_size)
+            while True:
+                page = await loop.run_in_executor(None, next, pages, None)
+                if page is None:
+                    break
+                self.counters.records += len(page)
+                selected = [record for record in page if self._accept(record, since_dt)]
+                self.counters.skipped += len(page) - len(selected)
+                if self._limit is not None:
+                    selected = selected[: max(0, self._limit - self.counters.items)]
+                for item in await self.normalize_page(selected):
+                    self.counters.items += 1
+                    yield item
+                if self._limit is not None and self.counters.items >= self._limit:
+                    return
+
+    def _accept(self, record: Mapping[str, Any], since_dt: datetime) -> bool:
+        mapping = self._mapping
+        if resolve(record, mapping.text) is None or resolve(record, mapping.source_id) is None:
+            return False
+        published_at = parse_timestamp(resolve(record, mapping.published_at))
+        if published_at is None or published_at <= since_dt:
+            return False
+        return self._until is None or published_at < self._until
+
+    async def normalize(self, raw: Any) -> NormalizedItem:
+        return (await self.normalize_page([raw]))[0]
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        normalized = await normalize_batch(
+            [str(resolve(raw, self._mapping.text) or "") for raw in raws],
+            self._max_tokens,
+            [resolve(raw, self._mapping.lang) for raw in raws],
+        )
+        return [self._to_item(raw, result) for raw, result in zip(raws, normalized)]
+
+    def _to_item(self, raw: Mapping[str, Any], result: NormalizedText) -> NormalizedItem:
+        author = resolve(raw, self._mapping.author)
+        published_at = parse_timestamp(resolve(raw, self._mapping.published_at))
+        return NormalizedItem(
+            source=self.source_enum,
+            source_id=str(resolve(raw, self._mapping.source_id)),
+            text=result.text,
+            raw=dict(raw),
+            published_at=published_at,  # type: ignore[arg-type]
+            author=str(author) if author is not None else None,
+            lang=result.lang,
+            tickers=result.tickers,
+            entities=result.entities,
+        )
@@ -1,25 +1,79 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, List, Sequence
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Sequence
 
 try:  # pragma: no cover - optional dependency
-    from telethon import TelegramClient
-    from telethon.errors import TelethonError
+    from telethon import TelegramClient, events
+    from telethon.errors import FloodWaitError, TelethonError
+    from telethon.utils import get_peer_id
 except Exception:  # pragma: no cover
     TelegramClient = None  # type: ignore
-    TelethonError = Exception  # type: ignore
+    events = None  # type: ignore
 
-from src.ingest.base import BaseSource, NormalizedItem
-from src.ingest.normalizer import detect_language, normalize_text, truncate_tokens
+    def get_peer_id(entity: Any) -> int:  # type: ignore[misc]
+        return entity.id
+
+    class TelethonError(Exception):  # type: ignore[no-redef]
+        pass
+
+    class FloodWaitError(TelethonError):  # type: ignore[no-redef]
+        seconds = 0
+
+from src.ingest.base import BaseSource, NormalizedItem, collect
+from src.ingest.normalizer import NormalizedText, normalize_batch
+
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+# Messages normalized together; matches the batch iter_messages requests.
+TELEGRAM_PAGE_SIZE = 100
+
+
+@dataclass(slots=True)
+class _Advance:
+    """Queued after a channel's items; applied once the consumer reaches it."""
+
+    channel: str
+    newest: int
+    covered: datetime | None = None
 
 
 class TelegramSource(BaseSource):
+    """Poll Telegram channels concurrently, asking each only for unseen messages.
+
+    Every channel keeps a ``min_id`` cursor (the newest message id seen), so a
+    poll requests just the messages after it; the date cut-off is only used
+    for a channel's first poll, or when a later poll asks for a ``since`` older
+    than the one the cursor was started from (a backfill, e.g. ``ingest run
+    --since``); only messages outside the covered range are then new. Up to
+    ``fetch_concurrency`` channels are read at once. A ``FloodWaitError``
+    pauses all channels for the requested time with ``asyncio.sleep`` and the
+    channel is retried. A cursor only moves past messages the consumer has
+    taken, and cursors are written to ``cursor_path`` after each poll when it
+    is set.
+
+    In push mode (:meth:`subscribe`) new messages arrive as update events and
+    are handed to a callback within ``push_flush_seconds``; polls then only
+    fill gaps, e.g. after a reconnect, skipping messages already pushed.
+    """
+
     def __init__(
         self,
         client: TelegramClient | None,
         channels: Sequence[str],
         max_tokens: int = 1500,
+        fetch_concurrency: int = 4,
+        cursor_path: str | Path | None = None,
+        max_flood_retries: int = 3,
+        push_flush_seconds: float = 0.5,
     ) -> None:
         from src.db.models import SourceEnum
 
@@ -27,32 +81,327 @@ class TelegramSource(BaseSource):
         self._client = client
         self._channels = list(channels)
         self._max_tokens = max_tokens
+        self._fetch_concurrency = max(1, fetch_concurrency)
+        self._cursor_path = Path(cursor_path) if cursor_path else None
+        self._max_flood_retries = max_flood_retries
+        self._flood_until = 0.0
+        # Oldest since each cursor has read from; earlier ones trigger a backfill.
+        self._covered: Dict[str, datetime] = {}
+        self._cursors: Dict[str, int] = self._load_cursors()
+        self._push_flush_seconds = push_flush_seconds
+        self._pushed: Dict[str, set[int]] = {}
+        self._push_buffer: list[dict[str, Any]] = []
+        self._push_task: asyncio.Task[None] | None = None
+        self._on_items: Callable[[List[NormalizedItem]], Awaitable[None]] | None = None
+        self._peers: Dict[int, str] = {}
+        self._unpushed: list[str] = []
+        self._handler: Callable[[Any], Awaitable[None]] | None = None
+        self._monitor: asyncio.Task[None] | None = None
 
-    async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
-        if self._client is None:
-            return []
-        items: list[NormalizedItem] = []
+    @property
+    def cursors(self) -> Dict[str, int]:
+        return dict(self._cursors)
+
+    @property
+    def channels(self) -> list[str]:
+        return list(self._channels)
+
+    @property
+    def pushing(self) -> bool:
+        return self._handler is not None
+
+    @property
+    def unpushed_channels(self) -> list[str]:
+        """Channels :meth:`subscribe` could not resolve; they need regular polls."""
+
+        return list(self._unpushed)
+
+    async def subscribe(
+        self,
+        on_items: Callable[[List[NormalizedItem]], Awaitable[None]],
+        on_reconnect: Callable[[], Awaitable[None]] | None = None,
+        check_seconds: float = 5.0,
+    ) -> None:
+        """Receive new channel messages as updates instead of waiting for a poll.
+
+        Normalized items are passed to ``on_items``. ``on_reconnect`` runs when
+        the client comes back after a disconnect, so the caller can poll for
+        anything missed in between. Channels that cannot be resolved (renamed,
+        private, or a connection error) are left out and listed in
+        :attr:`unpushed_channels`; if none resolve, nothing is subscribed.
+        """
+
+        if self._client is None or not self._channels or self._handler is not None:
+            return
+        self._unpushed = []
         for channel in self._channels:
             try:
-                async for message in self._client.iter_messages(channel, offset_date=since_dt):
+                entity = await self._client.get_entity(channel)
+            except Exception as exc:
+                logger.warning(
+                    "Telegram channel unavailable for push; polling it instead",
+                    extra={"channel": channel, "error": str(exc)},
+                )
+                self._unpushed.append(channel)
+                continue
+            self._peers[get_peer_id(entity)] = channel
+        if not self._peers:
+            self._unpushed = []
+            return
+        self._on_items = on_items
+        chats = list(self._peers)
+        event = events.NewMessage(chats=chats) if events is not None else None
+        self._client.add_event_handler(self._on_new_message, event)
+        self._handler = self._on_new_message
+        if on_reconnect is not None:
+            self._monitor = asyncio.create_task(self._watch_connection(on_reconnect, check_seconds))
+        logger.info("Telegram push subscribed", extra={"channels": len(chats)})
+
+    async def unsubscribe(self) -> None:
+        if self._handler is None or self._client is None:
+            return
+        self._client.remove_event_handler(self._handler)
+        self._handler = None
+        for task in (self._monitor, self._push_task):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(task for task in (self._monitor, self._push_task) if task is not None),
+            return_exceptions=True,
+        )
+        # A cancelled flush puts its messages back, so they are delivered here.
+        self._monitor = self._push_task = None
+        if self._push_buffer:
+            await self._flush_push()
+
+    async def _on_new_message(self, event: Any) -> None:
+        channel = self._peers.get(event.chat_id)
+        message = event.message
+        if channel is None or message.date is None:
+            return
+        pushed = self._pushed.setdefault(channel, set())
+        if message.id <= self._cursors.get(channel, 0) or message.id in pushed:
+            return
+        pushed.add(message.id)
+        self._push_buffer.append({"channel": channel, "message": message})
+        if self._push_task is None:
+            self._push_task = asyncio.create_task(self._flush_push_later())
+
+    async def _flush_push_later(self) -> None:
+        # Coalesce bursts so the worker gets packable batches, not single posts.
+        await asyncio.sleep(self._push_flush_seconds)
+        self._push_task = None
+        await self._flush_push()
+
+    async def _flush_push(self) -> None:
+        raws, self._push_buffer = self._push_buffer, []
+        if not raws or self._on_items is None:
+            return
+        try:
+            await self._on_items(await self.normalize_page(raws))
+        except asyncio.CancelledError:
+            self._push_buffer[:0] = raws
+            raise
+        except Exception as exc:
+            # Forget them as pushed so the next gap-fill poll fetches them again.
+            for raw in raws:
+                self._pushed.get(raw["channel"], set()).discard(raw["message"].id)
+            logger.warning(
+                "Telegram push delivery failed; leaving messages to the next poll",
+                extra={"messages": len(raws), "error": str(exc)},
+            )
+
+    async def _watch_connection(
+        self, on_reconnect: Callable[[], Awaitable[None]], check_seconds: float
+    ) -> None:
+        assert self._client is not None
+        connected = self._client.is_connected()
+        while True:
+            await asyncio.sleep(check_seconds)
+            now_connected = self._client.is_connected()
+            if now_connected and not connected:
+                logger.info("Telegram reconnected; filling gaps")
+                await on_reconnect()
+            connected = now_connected
+
+    def _load_cursors(self) -> Dict[str, int]:
+        if self._cursor_path is None or not self._cursor_path.exists():
+            return {}
+        stored = json.loads(self._cursor_path.read_text())
+        cursors: Dict[str, int] = {}
+        for channel, value in stored.items():
+            # Older files store the bare min_id without the covered date.
+            if isinstance(value, dict):
+                cursors[channel] = int(value["min_id"])
+                if value.get("since"):
+                    self._covered[channel] = datetime.fromisoformat(value["since"])
+            else:
+                cursors[channel] = int(value)
+        return cursors
+
+    def _save_cursors(self) -> None:
+        if self._cursor_path is None:
+            return
+        try:
+            self._cursor_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cursor_path.with_suffix(self._cursor_path.suffix + ".tmp")
+            stored = {}
+            for channel, min_id in self._cursors.items():
+                covered = self._covered.get(channel)
+                stored[channel] = {
+                    "min_id": min_id,
+                    "since": covered.isoformat() if covered else None,
+                }
+            tmp_path.write_text(json.dumps(stored))
+            tmp_path.replace(self._cursor_path)
+        except OSError as exc:
+            logger.warning("Failed to save Telegram cursors", extra={"error": str(exc)})
+
+    async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
+        return await collect(self.stream_since(since_dt))
+
+    async def stream_since(
+        self, since_dt: datetime, channels: Sequence[str] | None = None
+    ) -> AsyncIterator[NormalizedItem]:
+        """Yield items as channels deliver them instead of after the slowest one.
+
+        ``channels`` limits the poll to those channels.
+        """
+
+        channels = self._channels if channels is None else list(channels)
+        if self._client is None or not channels:
+            return
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=1000)
+        limit = asyncio.Semaphore(self._fetch_concurrency)
+        since = since_dt.astimezone(timezone.utc)
+
+        async def _run(channel: str) -> None:
+            try:
+                async with limit:
+                    await self._fetch_channel(channel, since, queue)
+            except Exception as exc:
+                logger.warning(
+                    "Telegram fetch failed", extra={"channel": channel, "error": str(exc)}
+                )
+            # Not on cancellation: nobody reads the queue then, and it may be full.
+            await queue.put(_DONE)
+
+        tasks = [asyncio.create_task(_run(channel)) for channel in channels]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                entry = await queue.get()
+                if entry is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(entry, _Advance):
+                    # The consumer has taken every item queued before this.
+                    self._advance(entry)
+                    continue
+                yield entry
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._save_cursors()
+
+    async def _fetch_channel(
+        self, channel: str, since: datetime, queue: asyncio.Queue[Any]
+    ) -> None:
+        assert self._client is not None
+        cursor = self._cursors.get(channel, 0)
+        covered = self._covered.get(channel)
+        backfill = not cursor or (covered is not None and since < covered)
+        newest = 0
+        for _ in range(self._max_flood_retries + 1):
+            await self._wait_for_flood()
+            # Oldest first, so the cursor only ever moves forward and a retry
+            # after a flood wait resumes exactly where the last one stopped.
+            kwargs: dict[str, Any] = {"reverse": True}
+            if backfill and not newest:
+                kwargs["offset_date"] = since
+            else:
+                kwargs["min_id"] = newest if backfill else max(cursor, newest)
+            page: list[dict[str, Any]] = []
+            try:
+                async for message in self._client.iter_messages(channel, **kwargs):
                     if message.date is None:
                         continue
-                    if message.date.replace(tzinfo=timezone.utc) <= since_dt.replace(
-                        tzinfo=timezone.utc
-                    ):
-                        break
-                    normalized = await self.normalize({"channel": channel, "message": message})
-                    items.append(normalized)
-            except TelethonError:
+                    published_at = message.date.replace(tzinfo=timezone.utc)
+                    # Messages already delivered by push, or by the polls the
+                    # cursor covers, only move the cursor.
+                    fresh = message.id not in self._pushed.get(channel, ()) and not (
+                        covered is not None and message.id <= cursor and published_at > covered
+                    )
+                    if fresh and (not backfill or published_at > since):
+                        page.append({"channel": channel, "message": message})
+                    newest = max(newest, message.id)
+                    if len(page) >= TELEGRAM_PAGE_SIZE:
+                        await self._flush(channel, page, newest, queue)
+                        page = []
+            except FloodWaitError as exc:
+                await self._flush(channel, page, newest, queue)
+                self._flood_until = max(self._flood_until, time.monotonic() + exc.seconds)
+                logger.warning(
+                    "Telegram flood wait", extra={"channel": channel, "seconds": exc.seconds}
+                )
                 continue
-        return items
+            except TelethonError as exc:
+                logger.warning(
+                    "Telegram fetch failed", extra={"channel": channel, "error": str(exc)}
+                )
+                await self._flush(channel, page, newest, queue)
+                return
+            await self._flush(
+                channel, page, newest, queue, since if backfill or covered is None else None
+            )
+            return
+        logger.warning("Telegram flood retries exhausted", extra={"channel": channel})
+
+    async def _flush(
+        self,
+        channel: str,
+        page: list[dict[str, Any]],
+        newest: int,
+        queue: asyncio.Queue[Any],
+        covered: datetime | None = None,
+    ) -> None:
+        """Normalize a page and queue its items, followed by the cursor move past it."""
+
+        for item in await self.normalize_page(page):
+            await queue.put(item)
+        if newest or covered is not None:
+            await queue.put(_Advance(channel, newest, covered))
+
+    def _advance(self, advance: _Advance) -> None:
+        channel = advance.channel
+        if advance.covered is not None:
+            self._covered[channel] = advance.covered
+        if not advance.newest:
+            return
+        cursor = self._cursors[channel] = max(self._cursors.get(channel, 0), advance.newest)
+        if self._pushed.get(channel):
+            self._pushed[channel] = {
+                message_id for message_id in self._pushed[channel] if message_id > cursor
+            }
+
+    async def _wait_for_flood(self) -> None:
+        delay = self._flood_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     async def normalize(self, raw: Any) -> NormalizedItem:
+        return (await self.normalize_page([raw]))[0]
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        normalized = await normalize_batch(
+            [raw["message"].message or "" for raw in raws], self._max_tokens
+        )
+        return [self._to_item(raw, result) for raw, result in zip(raws, normalized)]
+
+    def _to_item(self, raw: Any, result: NormalizedText) -> NormalizedItem:
         message = raw["message"]
         channel = raw["channel"]
-        text = message.message or ""
-        text = truncate_tokens(normalize_text(text), self._max_tokens)
-        lang = detect_language(text)
         raw_payload = {
             "channel": channel,
             "message": message.to_dict() if hasattr(message, "to_dict") else str(message),
@@ -63,9 +412,11 @@ class TelegramSource(BaseSource):
         return NormalizedItem(
             source=self.source_enum,
             source_id=f"{channel}:{message.id}",
-            text=text,
+            text=result.text,
             raw=raw_payload,
             published_at=published_at,
             author=getattr(message, "sender_id", None),
-            lang=lang,
+            lang=result.lang,
+            tickers=result.tickers,
+            entities=result.entities,
         )
@@ -1,50 +1,139 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, List
+from typing import Any, AsyncIterator, List, Sequence
 
 try:  # pragma: no cover - optional dependency
-    from mastodon import Mastodon
+    from mastodon import Mastodon, MastodonRatelimitError
 except Exception:  # pragma: no cover
     Mastodon = None  # type: ignore
 
-from src.ingest.base import BaseSource, NormalizedItem
-from src.ingest.normalizer import detect_language, normalize_text, truncate_tokens
+    class MastodonRatelimitError(Exception):  # type: ignore[no-redef]
+        pass
+
+from src.ingest.base import BaseSource, NormalizedItem, collect
+from src.ingest.normalizer import NormalizedText, normalize_batch
+
+
+logger = logging.getLogger(__name__)
 
 
 class TruthSocialSource(BaseSource):
-    def __init__(self, client: Mastodon | None, max_tokens: int = 1500) -> None:
+    """Public-timeline poller paging back with ``max_id`` until it meets the last poll.
+
+    The newest status id seen becomes the ``since_id`` for the next poll; the
+    ``since`` time bounds only the first one. A poll stopped by ``max_pages``
+    keeps the old ``since_id`` and the next poll carries on paging back from
+    where it stopped before moving it. Mastodon.py runs on a thread pool and
+    should be created with ``ratelimit_method="throw"`` so rate limits are
+    waited out here with ``asyncio.sleep`` rather than by blocking a thread.
+    """
+
+    def __init__(
+        self,
+        client: Mastodon | None,
+        max_tokens: int = 1500,
+        page_size: int = 40,
+        max_pages: int = 10,
+    ) -> None:
         from src.db.models import SourceEnum
 
         super().__init__("truth_social", SourceEnum.truth_social)
         self._client = client
         self._max_tokens = max_tokens
+        self._page_size = page_size
+        self._max_pages = max_pages
+        self._since_id: str | None = None
+        # A poll cut off by max_pages: next max_id, pending since_id and cut-off.
+        self._resume: tuple[str, str | None, datetime] | None = None
+        # Mastodon.py is synchronous; keep its HTTP calls off the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="truth-social")
 
     async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
+        return await collect(self.stream_since(since_dt))
+
+    async def stream_since(self, since_dt: datetime) -> AsyncIterator[NormalizedItem]:
+        """Yield statuses page by page, newest first."""
+
         if self._client is None:
-            return []
-        timeline = self._client.timeline_public(limit=100)
-        items: list[NormalizedItem] = []
-        for status in timeline:
-            published_at = datetime.fromisoformat(status["created_at"].replace("Z", "+00:00"))
-            if published_at <= since_dt:
-                continue
-            items.append(await self.normalize(status))
-        return items
+            return
+        max_id: str | None = None
+        newest_id = self._since_id
+        if self._resume is not None:
+            max_id, newest_id, since_dt = self._resume
+        for _ in range(self._max_pages):
+            page = await self._timeline(max_id)
+            if not page:
+                break
+            if max_id is None:
+                newest_id = str(page[0]["id"])
+            fresh = page
+            if self._since_id is None:
+                fresh = [status for status in page if _created_at(status) > since_dt]
+            for item in await self.normalize_page(fresh):
+                yield item
+            reached = len(fresh) < len(page)
+            if reached or len(page) < self._page_size:
+                break
+            max_id = str(page[-1]["id"])
+        else:
+            # Older statuses remain; keep since_id and page on from max_id next poll.
+            logger.warning(
+                "Truth Social page limit reached; resuming next poll",
+                extra={"pages": self._max_pages},
+            )
+            self._resume = (str(max_id), newest_id, since_dt)
+            return
+        self._resume = None
+        self._since_id = newest_id
+
+    async def _timeline(self, max_id: str | None) -> list[dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await loop.run_in_executor(
+                    self._executor,
+                    lambda: self._client.timeline_public(
+                        limit=self._page_size, max_id=max_id, since_id=self._since_id
+                    ),
+                )
+            except MastodonRatelimitError:
+                reset = getattr(self._client, "ratelimit_reset", None)
+                delay = max(1.0, reset - time.time()) if reset else 60.0
+                logger.warning("Truth Social rate limited", extra={"seconds": round(delay, 1)})
+                await asyncio.sleep(delay)
 
     async def normalize(self, raw: Any) -> NormalizedItem:
-        text = raw.get("content", "")
-        text = truncate_tokens(normalize_text(text), self._max_tokens)
-        lang = raw.get("language") or detect_language(text)
-        published_at = datetime.fromisoformat(raw["created_at"].replace("Z", "+00:00"))
+        return (await self.normalize_page([raw]))[0]
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        normalized = await normalize_batch(
+            [raw.get("content", "") for raw in raws],
+            self._max_tokens,
+            [raw.get("language") for raw in raws],
+        )
+        return [self._to_item(raw, result) for raw, result in zip(raws, normalized)]
+
+    def _to_item(self, raw: Any, result: NormalizedText) -> NormalizedItem:
+        published_at = _created_at(raw)
         author = raw.get("account", {}).get("acct")
         source_id = str(raw.get("id"))
         return NormalizedItem(
             source=self.source_enum,
             source_id=source_id,
-            text=text,
+            text=result.text,
             raw=raw,
             published_at=published_at,
             author=author,
-            lang=lang,
+            lang=result.lang,
+            tickers=result.tickers,
+            entities=result.entities,
         )
+
+
+def _created_at(status: Any) -> datetime:
+    return datetime.fromisoformat(status["created_at"].replace("Z", "+00:00"))
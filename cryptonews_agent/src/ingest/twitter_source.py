@@ -1,68 +1,214 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
-from typing import Any, List, Sequence
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Sequence
 
 try:  # pragma: no cover - optional dependency
     import tweepy
 except Exception:  # pragma: no cover
     tweepy = None  # type: ignore
 
-from src.ingest.base import BaseSource, NormalizedItem
-from src.ingest.normalizer import detect_language, normalize_text, truncate_tokens
+from src.ingest.base import BaseSource, NormalizedItem, collect, merge_streams
+from src.ingest.normalizer import NormalizedText, normalize_batch
+
+
+logger = logging.getLogger(__name__)
+
+TWEET_FIELDS = ["author_id", "created_at", "lang"]
+
+
+def split_queries(queries: Sequence[str], max_length: int) -> list[str]:
+    """Group ``queries`` into ``(a) OR (b)`` expressions no longer than ``max_length``."""
+
+    groups: list[str] = []
+    current: list[str] = []
+    for query in queries:
+        candidate = " OR ".join(f"({part})" for part in [*current, query])
+        if current and len(candidate) > max_length:
+            groups.append(" OR ".join(f"({part})" for part in current))
+            current = [query]
+        else:
+            current.append(query)
+    if current:
+        groups.append(" OR ".join(f"({part})" for part in current))
+    return groups
 
 
 class TwitterSource(BaseSource):
+    """Recent-search poller that pages through every result since the last poll.
+
+    Queries are packed into sub-queries within ``max_query_length`` and searched
+    in parallel, each paging with ``next_token`` until it is exhausted or
+    ``max_pages`` is reached, starting from its own ``since_id`` cursor (or the
+    ``since`` time on the first poll). A search stopped by ``max_pages`` keeps
+    its old cursor and resumes from its ``next_token`` on the next poll, so a
+    burst is fetched over several polls instead of being skipped. Rate-limit
+    responses are waited out with ``asyncio.sleep`` until the reset time the
+    API reports.
+    """
+
     def __init__(
         self,
         client: tweepy.Client | None,
         queries: Sequence[str],
         max_tokens: int = 1500,
+        max_query_length: int = 512,
+        max_pages: int = 10,
+        fetch_concurrency: int = 4,
     ) -> None:
         from src.db.models import SourceEnum
 
         super().__init__("twitter", SourceEnum.twitter)
         self._client = client
-        self._queries = list(queries)
+        self._queries = split_queries(list(queries), max_query_length)
         self._max_tokens = max_tokens
+        self._max_pages = max_pages
+        self._since_ids: Dict[str, str] = {}
+        # Searches cut off by max_pages: request params to resume with and the
+        # cursor to move to once they finish.
+        self._resume: Dict[str, tuple[dict[str, Any], str | None]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, fetch_concurrency), thread_name_prefix="twitter"
+        )
+
+    @property
+    def queries(self) -> list[str]:
+        return list(self._queries)
 
     async def fetch_since(self, since_dt: datetime) -> List[NormalizedItem]:
-        if self._client is None:
-            return []
-        if not self._queries:
-            return []
-
-        query = " OR ".join(self._queries)
-        params = {
-            "query": query,
-            "start_time": since_dt.isoformat().replace("+00:00", "Z"),
-            "tweet_fields": ["author_id", "created_at", "lang"],
-            "max_results": 100,
-        }
-
-        def _search() -> Any:
-            return self._client.search_recent_tweets(**params)
-
-        response = await asyncio.to_thread(_search)
-        data = getattr(response, "data", None) or []
-        items: list[NormalizedItem] = []
-        for tweet in data:
-            items.append(await self.normalize(tweet))
-        return items
+        return await collect(self.stream_since(since_dt))
+
+    async def stream_since(self, since_dt: datetime) -> AsyncIterator[NormalizedItem]:
+        """Yield tweets page by page from all sub-queries at once."""
+
+        if self._client is None or not self._queries:
+            return
+
+        def _failed(index: int, exc: BaseException) -> None:
+            logger.warning(
+                "Twitter search failed", extra={"query": self._queries[index], "error": str(exc)}
+            )
+
+        seen: set[str] = set()
+        cursors: list[tuple[str, str | None, dict[str, Any] | None]] = []
+        streams = [self._search(query, since_dt, cursors) for query in self._queries]
+        async for page in merge_streams(streams, on_error=_failed):
+            # Sub-queries can overlap; keep the first copy of each tweet.
+            fresh = [tweet for tweet in page if str(tweet.id) not in seen]
+            seen.update(str(tweet.id) for tweet in fresh)
+            for item in await self.normalize_page(fresh):
+                yield item
+        # Searches finish as soon as their pages are buffered; their cursors
+        # only move once the consumer has taken every item.
+        for query, newest_id, resume in cursors:
+            self._commit(query, newest_id, resume)
+
+    async def _search(
+        self,
+        query: str,
+        since_dt: datetime,
+        cursors: list[tuple[str, str | None, dict[str, Any] | None]],
+    ) -> AsyncIterator[list[Any]]:
+        """Page through one sub-query; its cursor update is appended to ``cursors``."""
+
+        resume = self._resume.get(query)
+        if resume is not None:
+            params, newest_id = dict(resume[0]), resume[1]
+        else:
+            params = {"query": query, "tweet_fields": TWEET_FIELDS, "max_results": 100}
+            since_id = self._since_ids.get(query)
+            if since_id:
+                params["since_id"] = since_id
+            else:
+                start_time = since_dt.astimezone(timezone.utc).isoformat()
+                params["start_time"] = start_time.replace("+00:00", "Z")
+            newest_id = since_id
+        for page in range(self._max_pages):
+            response = await self._call(params)
+            tweets = getattr(response, "data", None) or []
+            if tweets:
+                yield list(tweets)
+            meta = getattr(response, "meta", None) or {}
+            if resume is None and page == 0 and meta.get("newest_id"):
+                # Results are newest first, so the first page holds the new cursor.
+                newest_id = str(meta["newest_id"])
+            next_token = meta.get("next_token")
+            if not next_token:
+                break
+            params["next_token"] = next_token
+        else:
+            # Older results remain; keep the cursor and continue from here next poll.
+            logger.warning(
+                "Twitter page limit reached; resuming next poll",
+                extra={"query": query, "pages": self._max_pages},
+            )
+            cursors.append((query, newest_id, params))
+            return
+        cursors.append((query, newest_id, None))
+
+    def _commit(self, query: str, newest_id: str | None, resume: dict[str, Any] | None) -> None:
+        if resume is not None:
+            self._resume[query] = (resume, newest_id)
+            return
+        self._resume.pop(query, None)
+        if newest_id:
+            self._since_ids[query] = newest_id
+
+    async def _call(self, params: dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await loop.run_in_executor(
+                    self._executor, lambda: self._client.search_recent_tweets(**params)
+                )
+            except Exception as exc:
+                delay = _rate_limit_delay(exc)
+                if delay is None:
+                    raise
+                logger.warning("Twitter rate limited", extra={"seconds": round(delay, 1)})
+                await asyncio.sleep(delay)
 
     async def normalize(self, raw: Any) -> NormalizedItem:
-        text = truncate_tokens(normalize_text(raw.text), self._max_tokens)
-        lang = raw.lang or detect_language(text)
+        return (await self.normalize_page([raw]))[0]
+
+    async def normalize_page(self, raws: Sequence[Any]) -> List[NormalizedItem]:
+        normalized = await normalize_batch(
+            [raw.text for raw in raws],
+            self._max_tokens,
+            [getattr(raw, "lang", None) for raw in raws],
+        )
+        return [self._to_item(raw, result) for raw, result in zip(raws, normalized)]
+
+    def _to_item(self, raw: Any, result: NormalizedText) -> NormalizedItem:
         published_at = raw.created_at
         if isinstance(published_at, str):
             published_at = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
         return NormalizedItem(
             source=self.source_enum,
             source_id=str(raw.id),
-            text=text,
+            text=result.text,
             raw=raw.data if hasattr(raw, "data") else raw,
             published_at=published_at,
             author=getattr(raw, "author_id", None),
-            lang=lang,
+            lang=result.lang,
+            tickers=result.tickers,
+            entities=result.entities,
         )
+
+
+def _rate_limit_delay(exc: BaseException) -> float | None:
+    """Seconds until the rate-limit window resets, or None if ``exc`` is not a 429."""
+
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    reset = headers.get("x-rate-limit-reset")
+    if reset is None:
+        return 60.0
+    return max(1.0, float(reset) - time.time() + 1)
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Sequence
+
+from src.config import get_settings
 from src.llm.client import LMStudioClient
 from src.llm.schema import ClassificationResult
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ClassifierStats:
+    requests: int = 0
+    prompt_tokens: int = 0
+    repairs: int = 0
+    batch_fallbacks: int = 0
 
 SYSTEM_PROMPT = """
 You are an analyst who labels crypto and macro news. Respond ONLY with JSON that strictly
 matches the provided schema. Do not add commentary.
 """.strip()
 
-USER_TEMPLATE = """
+USER_TEMPLATE = '''
 Analyze the following post and classify it according to the schema:
 
 Text:
@@ -17,25 +34,170 @@ Text:
 """
 
 Return JSON with keys: topics (list of "crypto", "macro", "regulation", "markets" as applicable),
-sentiment (-1, 0, 1), stance ("bullish", "bearish", "neutral"), impact (0-2), tickers (list of symbols),
-and entities (list of objects with type/text).
-""".strip()
+sentiment (-1, 0, 1), stance ("bullish", "bearish", "neutral") and impact (0-2).
+'''.strip()
+
+
+BATCH_USER_TEMPLATE = '''
+Analyze each of the following posts and classify it according to the schema.
+
+{posts}
+
+Return a JSON object {{"results": [...]}} with one entry per post. Each entry has keys: index (the post number),
+topics (list of "crypto", "macro", "regulation", "markets" as applicable), sentiment (-1, 0, 1),
+stance ("bullish", "bearish", "neutral") and impact (0-2).
+'''.strip()
+
+BATCH_POST_TEMPLATE = '''
+Post {index}:
+"""
+{text}
+"""
+'''.strip()
+
+
+def text_token_budget() -> int:
+    """Tokens left for post text once the system prompt and template are counted."""
+
+    overhead = count_tokens(SYSTEM_PROMPT) + count_tokens(USER_TEMPLATE.format(text=""))
+    return max(get_settings().prompt_token_budget - overhead, 1)
+
+
+def batch_text_token_budget(count: int) -> int:
+    """Tokens each of ``count`` posts may use in one batched prompt."""
+
+    overhead = (
+        count_tokens(SYSTEM_PROMPT)
+        + count_tokens(BATCH_USER_TEMPLATE.format(posts=""))
+        + count * count_tokens(BATCH_POST_TEMPLATE.format(index=count, text=""))
+    )
+    return max((get_settings().prompt_token_budget - overhead) // count, 1)
+
 
+def output_token_budget(text_tokens: int) -> int:
+    """Scale the completion budget with input length within the configured bounds."""
 
-async def classify_text(client: LMStudioClient, text: str) -> ClassificationResult:
+    settings = get_settings()
+    scaled = settings.classify_output_tokens_min + int(
+        text_tokens * settings.classify_output_tokens_per_input
+    )
+    return min(scaled, settings.classify_output_tokens_max)
+
+
+def pack_texts(texts: Sequence[str], max_items: int, token_budget: int) -> list[list[int]]:
+    """Group text indices into packs bounded by item count and prompt tokens.
+
+    A text larger than the budget on its own still gets a pack of one.
+    """
+
+    packs: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for index, text in enumerate(texts):
+        cost = count_tokens(text)
+        if current and (len(current) >= max_items or used + cost > token_budget):
+            packs.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+async def classify_text(
+    client: LMStudioClient, text: str, stats: ClassifierStats | None = None
+) -> ClassificationResult:
+    """Classify one post, asking once for a repair if the answer is not valid JSON.
+
+    Requests, prompt tokens and repairs are counted in ``stats`` when given.
+    """
+
+    if stats is None:
+        stats = ClassifierStats()
+    text = truncate_to_tokens(text, text_token_budget())
+    max_tokens = output_token_budget(count_tokens(text))
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": USER_TEMPLATE.format(text=text)},
     ]
-    response = await client.achat(messages, max_tokens=300)
+    stats.requests += 1
+    stats.prompt_tokens += count_tokens(messages[0]["content"]) + count_tokens(messages[1]["content"])
+    response = await client.achat(
+        messages,
+        max_tokens=max_tokens,
+        response_format=ClassificationResult.response_format(),
+        stop_at_json=True,
+    )
     try:
         return ClassificationResult.parse_json(response)
     except ValueError:
+        stats.repairs += 1
+        logger.info("Classification repair", extra={"repairs": stats.repairs})
         repair_messages = messages + [
             {
                 "role": "user",
                 "content": "Your previous response did not match the schema. Return valid JSON only.",
             }
         ]
-        response = await client.achat(repair_messages, max_tokens=300)
+        response = await client.achat(
+            repair_messages,
+            max_tokens=max_tokens,
+            response_format=ClassificationResult.response_format(),
+            stop_at_json=True,
+        )
         return ClassificationResult.parse_json(response)
+
+
+async def classify_batch(
+    client: LMStudioClient, texts: Sequence[str], stats: ClassifierStats | None = None
+) -> list[ClassificationResult | None]:
+    """Classify several posts in one request, falling back per item.
+
+    Each post is truncated to its share of ``PROMPT_TOKEN_BUDGET``. Posts whose
+    entry is missing or invalid in the batched answer are retried with
+    :func:`classify_text`; a ``None`` result means that retry failed too.
+    Counts for both go to ``stats`` when given.
+    """
+
+    if stats is None:
+        stats = ClassifierStats()
+    if len(texts) == 1:
+        return [await classify_text(client, texts[0], stats)]
+
+    budget = batch_text_token_budget(len(texts))
+    truncated = [truncate_to_tokens(text, budget) for text in texts]
+    posts = "\n\n".join(
+        BATCH_POST_TEMPLATE.format(index=index, text=text) for index, text in enumerate(truncated)
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": BATCH_USER_TEMPLATE.format(posts=posts)},
+    ]
+    stats.requests += 1
+    stats.prompt_tokens += count_tokens(messages[0]["content"]) + count_tokens(messages[1]["content"])
+    response = await client.achat(
+        messages,
+        max_tokens=sum(output_token_budget(count_tokens(text)) for text in truncated),
+        response_format=ClassificationResult.batch_response_format(),
+        stop_at_json=True,
+    )
+    try:
+        parsed = ClassificationResult.parse_indexed_json(response)
+    except ValueError:
+        parsed = {}
+
+    missing = [index for index in range(len(texts)) if index not in parsed]
+    if missing:
+        stats.batch_fallbacks += len(missing)
+        logger.info("Batch classification fallback", extra={"count": len(missing)})
+        retried = await asyncio.gather(
+            *(classify_text(client, texts[index], stats) for index in missing),
+            return_exceptions=True,
+        )
+        for index, result in zip(missing, retried):
+            if isinstance(result, ClassificationResult):
+                parsed[index] = result
+            else:
+                logger.warning("Classification failed", extra={"error": str(result)})
+    return [parsed.get(index) for index in range(len(texts))]
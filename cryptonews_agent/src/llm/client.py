@@ -1,29 +1,137 @@
 from __future__ import annotations
 
+import contextlib
 import logging
-from typing import Sequence
+from typing import Any, AsyncIterator, Sequence
 
-from openai import AsyncOpenAI
-from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
 
 from src.config import get_settings
+from src.llm.embeddings import build_embedding_backend
+from src.llm.limiter import AdaptiveLimiter, LimiterStats
+from src.llm.pool import EndpointPool, EndpointStats, parse_endpoints
+from src.llm.resilience import CircuitBreaker, TokenBucket, is_transient_error
+from src.llm.schema import JsonScanner
+from src.utils.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
 
+def _rejects_response_format(exc: BaseException) -> bool:
+    message = str(exc)
+    return getattr(exc, "status_code", None) == 400 and (
+        "response_format" in message or "json_schema" in message
+    )
+
+
 class LMStudioClient:
     def __init__(self) -> None:
         settings = get_settings()
-        self._client = AsyncOpenAI(
-            api_key=settings.lmstudio_api_key,
-            base_url=str(settings.lmstudio_base_url),
+        self._chat_pool = EndpointPool(
+            "chat",
+            parse_endpoints(settings.lmstudio_base_url),
+            settings.lmstudio_api_key,
+            eject_after=settings.endpoint_eject_after,
+            eject_seconds=settings.endpoint_eject_seconds,
+        )
+        self._embed_pool = EndpointPool(
+            "embeddings",
+            parse_endpoints(settings.lmstudio_embed_base_url or settings.lmstudio_base_url),
+            settings.lmstudio_api_key,
+            eject_after=settings.endpoint_eject_after,
+            eject_seconds=settings.endpoint_eject_seconds,
         )
         self._model = settings.llm_model
-        self._embed_model = settings.embed_model
+        self._embedder = build_embedding_backend(settings)
+        self._embed_model = self._embedder.model_name if self._embedder else settings.embed_model
         self._temperature = 0.2
         self._top_p = 0.9
         self._max_tokens = 1024
         self._warmed = False
+        self._structured_output = settings.llm_structured_output
+        self._stream = settings.llm_stream
+        self._chat_limiter = AdaptiveLimiter(
+            "chat",
+            initial=settings.llm_initial_concurrency,
+            min_limit=settings.llm_min_concurrency,
+            max_limit=min(settings.llm_max_concurrency, self._chat_pool.capacity),
+            target_latency=settings.llm_target_latency_seconds,
+        )
+        self._embed_limiter = AdaptiveLimiter(
+            "embeddings",
+            initial=settings.llm_initial_concurrency,
+            min_limit=settings.llm_min_concurrency,
+            max_limit=min(settings.llm_max_concurrency, self._embed_pool.capacity),
+            target_latency=settings.embed_target_latency_seconds,
+        )
+        self._chat_breaker = CircuitBreaker(
+            "chat",
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_seconds=settings.circuit_recovery_seconds,
+        )
+        self._embed_breaker = CircuitBreaker(
+            "embeddings",
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_seconds=settings.circuit_recovery_seconds,
+        )
+        self._request_bucket = TokenBucket(settings.llm_requests_per_second)
+        self._token_bucket = TokenBucket(
+            settings.llm_tokens_per_minute / 60, capacity=settings.llm_tokens_per_minute
+        )
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def embed_model(self) -> str:
+        return self._embed_model
+
+    @property
+    def concurrency_hint(self) -> int:
+        """Current adaptive chat concurrency; callers can size their fan-out to it."""
+
+        return self._chat_limiter.limit
+
+    def limiter_stats(self) -> list[LimiterStats]:
+        return [self._chat_limiter.stats(), self._embed_limiter.stats()]
+
+    def endpoint_stats(self) -> dict[str, list[EndpointStats]]:
+        return {"chat": self._chat_pool.stats(), "embeddings": self._embed_pool.stats()}
+
+    def circuit_states(self) -> dict[str, str]:
+        return {"chat": self._chat_breaker.state.value, "embeddings": self._embed_breaker.state.value}
+
+    async def check_health(self) -> None:
+        await self._chat_pool.check_health()
+        await self._embed_pool.check_health()
+
+    @contextlib.asynccontextmanager
+    async def _admit(
+        self,
+        breaker: CircuitBreaker,
+        limiter: AdaptiveLimiter,
+        pool: EndpointPool,
+        tokens: int = 0,
+    ) -> AsyncIterator[Any]:
+        """Gate one request through the breaker, rate limits, limiter and pool."""
+
+        breaker.before_call()
+        try:
+            await self._request_bucket.acquire()
+            if tokens:
+                await self._token_bucket.acquire(tokens)
+            async with limiter.slot(), pool.acquire() as client:
+                yield client
+        except Exception as exc:
+            breaker.record_failure(exc)
+            raise
+        except BaseException:
+            # Cancelled (e.g. by a caller's wait_for); keep a half-open probe slot free.
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
 
     async def warmup(self) -> None:
         if self._warmed:
@@ -37,37 +145,106 @@ class LMStudioClient:
             logger.warning("Warmup failed", extra={"error": str(exc)})
         self._warmed = True
 
-    async def achat(self, messages: Sequence[dict[str, str]], max_tokens: int | None = None) -> str:
+    async def achat(
+        self,
+        messages: Sequence[dict[str, str]],
+        max_tokens: int | None = None,
+        response_format: dict[str, Any] | None = None,
+        stop_at_json: bool = False,
+    ) -> str:
+        """Return the completion text for ``messages``.
+
+        ``response_format`` asks the server for schema-constrained output; if the
+        server rejects it, structured output is switched off for this client and
+        the request is sent again without it. With ``stop_at_json`` the
+        completion is streamed and cut off as soon as a complete JSON value has
+        been received.
+        """
+
+        if not self._structured_output:
+            response_format = None
+        try:
+            return await self._achat(messages, max_tokens, response_format, stop_at_json)
+        except Exception as exc:
+            if response_format is None or not _rejects_response_format(exc):
+                raise
+            logger.warning(
+                "Structured output not supported; falling back to prompt-only JSON",
+                extra={"error": str(exc)},
+            )
+            self._structured_output = False
+            return await self._achat(messages, max_tokens, None, stop_at_json)
+
+    async def _achat(
+        self,
+        messages: Sequence[dict[str, str]],
+        max_tokens: int | None,
+        response_format: dict[str, Any] | None,
+        stop_at_json: bool,
+    ) -> str:
         max_tokens = max_tokens or self._max_tokens
+        tokens = sum(count_tokens(message["content"]) for message in messages) + max_tokens
+        request: dict[str, Any] = {
+            "model": self._model,
+            "temperature": self._temperature,
+            "top_p": self._top_p,
+            "max_tokens": max_tokens,
+            "messages": list(messages),
+        }
+        if response_format is not None:
+            request["response_format"] = response_format
 
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(3),
             wait=wait_exponential(multiplier=1, min=1, max=10),
-            retry=retry_if_exception_type(Exception),
+            retry=retry_if_exception(is_transient_error),
             reraise=True,
         ):
             with attempt:
-                response = await self._client.chat.completions.create(
-                    model=self._model,
-                    temperature=self._temperature,
-                    top_p=self._top_p,
-                    max_tokens=max_tokens,
-                    messages=list(messages),
-                )
-                content = response.choices[0].message.content
-                if content is None:
+                async with self._admit(
+                    self._chat_breaker, self._chat_limiter, self._chat_pool, tokens=tokens
+                ) as client:
+                    if stop_at_json and self._stream:
+                        content = await self._stream_until_json(client, request)
+                    else:
+                        response = await client.chat.completions.create(**request)
+                        content = response.choices[0].message.content
+                if not content:
                     raise ValueError("Empty response from LM Studio")
                 return content
         raise RuntimeError("Failed to obtain chat completion")
 
+    @staticmethod
+    async def _stream_until_json(client: Any, request: dict[str, Any]) -> str | None:
+        scanner = JsonScanner()
+        stream = await client.chat.completions.create(stream=True, **request)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta and scanner.feed(delta) is not None:
+                    break
+        finally:
+            # Closing the stream drops the connection so the server stops generating.
+            await stream.close()
+        return scanner.result() or scanner.text
+
     async def get_embeddings(self, texts: Sequence[str]) -> list[list[float]]:
+        if self._embedder is not None:
+            return await self._embedder.embed(texts)
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(3),
             wait=wait_exponential(multiplier=1, min=1, max=10),
-            retry=retry_if_exception_type(Exception),
+            retry=retry_if_exception(is_transient_error),
             reraise=True,
         ):
             with attempt:
-                response = await self._client.embeddings.create(model=self._embed_model, input=list(texts))
+                async with self._admit(
+                    self._embed_breaker, self._embed_limiter, self._embed_pool
+                ) as client:
+                    response = await client.embeddings.create(
+                        model=self._embed_model, input=list(texts)
+                    )
                 return [data.embedding for data in response.data]
         raise RuntimeError("Failed to compute embeddings")
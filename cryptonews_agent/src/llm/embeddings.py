@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Protocol, Sequence
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBackend(Protocol):
+    model_name: str
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        ...
+
+
+class SentenceTransformerBackend:
+    """In-process embeddings with SentenceTransformers, optionally through ONNX Runtime.
+
+    sentence-transformers (and with it torch) is imported and the model loaded
+    on first use, so processes on the default LM Studio backend never pay for
+    it. Texts are split into ``batch_size`` chunks encoded in parallel on a
+    dedicated thread pool; both torch and ONNX Runtime release the GIL while
+    running, so throughput scales with cores and the event loop is never
+    blocked.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        onnx: bool = False,
+        onnx_file: str | None = None,
+        threads: int | None = None,
+        batch_size: int = 32,
+    ) -> None:
+        self.model_name = model_name
+        self._device = device
+        self._onnx = onnx
+        self._onnx_file = onnx_file
+        self._batch_size = max(1, batch_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads or os.cpu_count() or 1, thread_name_prefix="embed"
+        )
+        self._model: Any = None
+        self._load_lock = threading.Lock()
+
+    def _load(self) -> Any:
+        if self._model is not None:
+            return self._model
+        with self._load_lock:
+            if self._model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as exc:
+                    raise RuntimeError("sentence-transformers is not installed") from exc
+                kwargs: dict[str, Any] = {"device": self._device}
+                if self._onnx:
+                    kwargs["backend"] = "onnx"
+                    if self._onnx_file:
+                        kwargs["model_kwargs"] = {"file_name": self._onnx_file}
+                logger.info(
+                    "Loading embedding model",
+                    extra={"model": self.model_name, "onnx": self._onnx, "device": self._device},
+                )
+                self._model = SentenceTransformer(self.model_name, **kwargs)
+        return self._model
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        vectors = self._load().encode(
+            texts,
+            batch_size=self._batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return [vector.tolist() for vector in vectors]
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        chunks = [
+            list(texts[start : start + self._batch_size])
+            for start in range(0, len(texts), self._batch_size)
+        ]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._encode, chunk) for chunk in chunks)
+        )
+        return [vector for chunk in results for vector in chunk]
+
+
+def build_embedding_backend(settings: Settings) -> EmbeddingBackend | None:
+    """Return the configured in-process backend, or None to use the LM Studio API."""
+
+    if settings.embed_backend == "sentence_transformers":
+        return SentenceTransformerBackend(
+            settings.local_embed_model,
+            device=settings.local_embed_device,
+            onnx=settings.local_embed_onnx,
+            onnx_file=settings.local_embed_onnx_file,
+            threads=settings.local_embed_threads,
+            batch_size=settings.local_embed_batch_size,
+        )
+    return None
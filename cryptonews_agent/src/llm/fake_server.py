@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+POST_RE = re.compile(r"^Post (\d+):", re.MULTILINE)
+CLASSIFICATION = {"topics": ["crypto"], "sentiment": 0, "stance": "neutral", "impact": 1}
+STANCES = ("bearish", "neutral", "bullish")
+
+
+@dataclass(slots=True)
+class FakeServerConfig:
+    """Behaviour of :class:`FakeLLMServer`.
+
+    ``latency`` is the time to first token (queueing plus prompt processing)
+    drawn from ``latency_distribution`` around ``latency_mean`` seconds; the
+    completion then streams at ``tokens_per_second``. ``error_rate`` of requests
+    fail with ``error_status`` after the latency, and ``hang_rate`` never answer
+    (without holding a slot) until the client disconnects, which exercises
+    client timeouts. At most ``slots`` requests are generated at once; the rest
+    queue, like a single inference box.
+    """
+
+    latency_mean: float = 0.05
+    latency_jitter: float = 0.02
+    latency_distribution: Literal["fixed", "uniform", "exponential", "lognormal"] = "uniform"
+    tokens_per_second: float = 200.0
+    embed_latency_per_text: float = 0.001
+    embedding_dim: int = 768
+    error_rate: float = 0.0
+    error_status: int = 503
+    hang_rate: float = 0.0
+    slots: int = 8
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class FakeServerStats:
+    connections: int = 0
+    requests: int = 0
+    chat_requests: int = 0
+    embedding_requests: int = 0
+    streams: int = 0
+    streams_cancelled: int = 0
+    injected_errors: int = 0
+    completion_tokens: int = 0
+    peak_in_flight: int = 0
+    paths: dict[str, int] = field(default_factory=dict)
+
+
+def hash_embedding(text: str, dim: int) -> list[float]:
+    """Deterministic unit vector derived from ``text``; equal texts embed equally."""
+
+    values: list[float] = []
+    counter = 0
+    while len(values) < dim:
+        digest = hashlib.blake2b(f"{counter}:{text}".encode(), digest_size=64).digest()
+        values.extend(value / 2**31 for value in struct.unpack("<16i", digest))
+        counter += 1
+    vector = values[:dim]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def fake_completion(prompt: str) -> str:
+    """Plausible classification JSON for a single or a packed multi-post prompt."""
+
+    indices = [int(index) for index in POST_RE.findall(prompt)]
+    digest = hashlib.blake2b(prompt.encode(), digest_size=8).digest()
+
+    def label(position: int) -> dict[str, Any]:
+        stance = digest[position % len(digest)] % 3
+        return {**CLASSIFICATION, "stance": STANCES[stance], "sentiment": stance - 1}
+
+    if not indices:
+        return json.dumps(label(0))
+    return json.dumps(
+        {"results": [{"index": index, **label(position)} for position, index in enumerate(indices)]}
+    )
+
+
+def _count_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _Hang(Exception):
+    """Raised out of the generation slot for a request that should never answer."""
+
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class FakeLLMServer:
+    """Minimal OpenAI-compatible HTTP/1.1 server for load and latency testing.
+
+    Serves ``GET /v1/models``, ``POST /v1/chat/completions`` (plain and SSE
+    streaming) and ``POST /v1/embeddings``, which is everything
+    :class:`~src.llm.client.LMStudioClient` uses. Connections are kept alive so
+    client-side pooling behaves as it would against LM Studio or vLLM.
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        self.config = config or FakeServerConfig()
+        self.stats = FakeServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._slots = asyncio.Semaphore(max(1, self.config.slots))
+        self._in_flight = 0
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task[Any]] = set()
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            raise RuntimeError("Server is not running")
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        logger.info("Fake LLM server listening", extra={"host": host, "port": self.port})
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeLLMServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 1234) -> None:
+        await self.start(host, port)
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    def _latency(self) -> float:
+        config = self.config
+        mean = config.latency_mean
+        if config.latency_distribution == "fixed":
+            return mean
+        if config.latency_distribution == "uniform":
+            jitter = config.latency_jitter
+            return max(0.0, self._rng.uniform(mean - jitter, mean + jitter))
+        if config.latency_distribution == "exponential":
+            return self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        # Log-normal with the requested mean and ``latency_jitter`` as sigma.
+        sigma = config.latency_jitter
+        return self._rng.lognormvariate(math.log(max(mean, 1e-6)) - sigma**2 / 2, sigma)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._dispatch(reader, writer, method, path, body)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)  # type: ignore[arg-type]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, dict[str, str], bytes] | None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], headers, body
+
+    async def _dispatch(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        path: str,
+        body: bytes,
+    ) -> None:
+        self.stats.requests += 1
+        self.stats.paths[path] = self.stats.paths.get(path, 0) + 1
+        try:
+            if method == "GET" and path.endswith("/models"):
+                await self._send_json(
+                    writer, 200, {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+                )
+            elif method == "POST" and path.endswith("/chat/completions"):
+                await self._chat(writer, json.loads(body or b"{}"))
+            elif method == "POST" and path.endswith("/embeddings"):
+                await self._embeddings(writer, json.loads(body or b"{}"))
+            else:
+                raise _HttpError(404, f"No route for {method} {path}")
+        except _HttpError as exc:
+            await self._send_json(
+                writer, exc.status, {"error": {"message": str(exc), "code": exc.status}}
+            )
+        except json.JSONDecodeError as exc:
+            await self._send_json(writer, 400, {"error": {"message": str(exc), "code": 400}})
+        except _Hang:
+            # The slot is already free; hold the connection until the client gives up.
+            while await reader.read(65536):
+                pass
+
+    async def _admit(self) -> None:
+        """Wait out latency and fail or hang according to the injection rates."""
+
+        self._in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self._in_flight)
+        try:
+            await asyncio.sleep(self._latency())
+            roll = self._rng.random()
+            if roll < self.config.hang_rate:
+                raise _Hang()
+            if roll < self.config.hang_rate + self.config.error_rate:
+                self.stats.injected_errors += 1
+                raise _HttpError(self.config.error_status, "Injected failure")
+        finally:
+            self._in_flight -= 1
+
+    async def _chat(self, writer: asyncio.StreamWriter, payload: dict[str, Any]) -> None:
+        self.stats.chat_requests += 1
+        async with self._slots:
+            await self._admit()
+            messages = payload.get("messages", [])
+            prompt = "\n".join(str(message.get("content", "")) for message in messages)
+            content = fake_completion(prompt)
+            model = payload.get("model", "fake")
+            created = int(time.time())
+            completion_id = f"chatcmpl-{self.stats.chat_requests}"
+            if payload.get("stream"):
+                await self._stream_chat(writer, completion_id, created, model, content)
+                return
+            tokens = _count_tokens(content)
+            await asyncio.sleep(tokens / self.config.tokens_per_second)
+            self.stats.completion_tokens += tokens
+            await self._send_json(
+                writer,
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": _count_tokens(prompt),
+                        "completion_tokens": tokens,
+                        "total_tokens": _count_tokens(prompt) + tokens,
+                    },
+                },
+            )
+
+    async def _stream_chat(
+        self,
+        writer: asyncio.StreamWriter,
+        completion_id: str,
+        created: int,
+        model: str,
+        content: str,
+    ) -> None:
+        self.stats.streams += 1
+
+        def event(delta: dict[str, str], finish_reason: str | None = None) -> dict[str, Any]:
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"transfer-encoding: chunked\r\ncache-control: no-cache\r\n\r\n"
+        )
+        # Roughly four characters per token, one token per chunk.
+        pieces = [content[start : start + 4] for start in range(0, len(content), 4)]
+        delay = 1.0 / self.config.tokens_per_second
+        try:
+            for piece in pieces:
+                await asyncio.sleep(delay)
+                self._write_event(writer, event({"content": piece}))
+                await writer.drain()
+                self.stats.completion_tokens += 1
+            self._write_event(writer, event({}, "stop"))
+            self._write_chunk(writer, b"data: [DONE]\n\n")
+            self._write_chunk(writer, b"")
+            await writer.drain()
+        except ConnectionError:
+            self.stats.streams_cancelled += 1
+            raise
+
+    async def _embeddings(self, writer: asyncio.StreamWriter, payload: dict[str, Any]) -> None:
+        self.stats.embedding_requests += 1
+        texts = payload.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        async with self._slots:
+            await self._admit()
+            await asyncio.sleep(self.config.embed_latency_per_text * len(texts))
+        await self._send_json(
+            writer,
+            200,
+            {
+                "object": "list",
+                "model": payload.get("model", "fake-embed"),
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": hash_embedding(text, self.config.embedding_dim),
+                    }
+                    for index, text in enumerate(texts)
+                ],
+                "usage": {
+                    "prompt_tokens": sum(_count_tokens(text) for text in texts),
+                    "total_tokens": sum(_count_tokens(text) for text in texts),
+                },
+            },
+        )
+
+    def _write_event(self, writer: asyncio.StreamWriter, payload: dict[str, Any]) -> None:
+        self._write_chunk(writer, f"data: {json.dumps(payload)}\n\n".encode())
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    @staticmethod
+    async def _send_json(
+        writer: asyncio.StreamWriter, status: int, payload: dict[str, Any]
+    ) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"content-type: application/json\r\ncontent-length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
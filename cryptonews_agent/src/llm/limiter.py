@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = frozenset({408, 429})
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Return True for errors that signal the server is saturated or unreachable."""
+
+    if isinstance(exc, TimeoutError):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status in OVERLOAD_STATUS_CODES
+    return "Timeout" in type(exc).__name__
+
+
+def percentile(samples: list[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@dataclass(slots=True)
+class LimiterStats:
+    name: str
+    limit: int
+    in_flight: int
+    p50: float | None
+    p95: float | None
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter driven by observed request latency.
+
+    While requests complete under ``target_latency`` and the limiter is
+    saturated, the limit grows by roughly one slot per ``limit`` completions.
+    Latency above target shrinks it by ``latency_backoff``; timeouts, requests
+    cancelled mid-flight and overload responses shrink it by ``error_backoff``.
+    Decreases are applied at most once per median latency so a burst of
+    failures from the same overloaded window only counts once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        latency_backoff: float = 0.9,
+        error_backoff: float = 0.5,
+        window: int = 200,
+    ) -> None:
+        self.name = name
+        self._min = max(1, min_limit)
+        self._max = max(self._min, max_limit)
+        self._limit = float(min(max(initial, self._min), self._max))
+        self._target = target_latency
+        self._latency_backoff = latency_backoff
+        self._error_backoff = error_backoff
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def stats(self) -> LimiterStats:
+        samples = list(self._latencies)
+        return LimiterStats(
+            name=self.name,
+            limit=self.limit,
+            in_flight=self._in_flight,
+            p50=percentile(samples, 0.5),
+            p95=percentile(samples, 0.95),
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            if is_overload_error(exc):
+                self._decrease(self._error_backoff)
+            raise
+        except asyncio.CancelledError:
+            # Usually a caller's wait_for giving up on a slow request.
+            self._decrease(self._error_backoff)
+            raise
+        else:
+            self._on_success(time.monotonic() - started)
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        if latency > self._target:
+            self._decrease(self._latency_backoff)
+        elif self._in_flight >= self.limit and self._limit < self._max:
+            self._limit = min(self._max, self._limit + 1.0 / self._limit)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        cooldown = percentile(list(self._latencies), 0.5) or 0.0
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self._min), self._limit * factor)
+        if self.limit != previous:
+            logger.info(
+                "Concurrency limit decreased",
+                extra={"limiter": self.name, "limit": self.limit, "previous": previous},
+            )
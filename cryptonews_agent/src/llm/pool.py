@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+from urllib.parse import urlparse
+
+from openai import AsyncOpenAI
+
+from src.llm.limiter import is_overload_error, percentile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class EndpointConfig:
+    url: str
+    weight: float = 1.0
+    max_concurrency: int = 8
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    url: str
+    healthy: bool
+    outstanding: int
+    requests: int
+    errors: int
+    p50: float | None
+    p95: float | None
+
+
+def parse_endpoints(spec: str) -> list[EndpointConfig]:
+    """Parse ``url[;weight=W][;max_concurrency=N]`` entries separated by commas.
+
+    ``http://gpu1:1234/v1;weight=2;max_concurrency=8,http://gpu2:1234/v1`` gives two
+    endpoints, the first taking twice the share of traffic.
+    """
+
+    endpoints: list[EndpointConfig] = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, *options = [part.strip() for part in entry.split(";")]
+        parsed = urlparse(url)
+        if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+            raise ValueError(f"Invalid LLM endpoint URL: {url!r}")
+        config = EndpointConfig(url=url)
+        for option in options:
+            key, _, value = option.partition("=")
+            if key == "weight":
+                config.weight = float(value)
+            elif key in {"max", "max_concurrency"}:
+                config.max_concurrency = int(value)
+            else:
+                raise ValueError(f"Unknown endpoint option {key!r} in {entry!r}")
+        endpoints.append(config)
+    if not endpoints:
+        raise ValueError("At least one LLM endpoint must be configured")
+    return endpoints
+
+
+class Endpoint:
+    def __init__(self, config: EndpointConfig, client: AsyncOpenAI) -> None:
+        self.config = config
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.latencies: deque[float] = deque(maxlen=200)
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now and self.outstanding < self.config.max_concurrency
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / max(self.config.weight, 1e-6)
+
+    def stats(self, now: float) -> EndpointStats:
+        samples = list(self.latencies)
+        return EndpointStats(
+            url=self.config.url,
+            healthy=self.ejected_until <= now,
+            outstanding=self.outstanding,
+            requests=self.requests,
+            errors=self.errors,
+            p50=percentile(samples, 0.5),
+            p95=percentile(samples, 0.95),
+        )
+
+
+class EndpointPool:
+    """Least-outstanding-requests routing over OpenAI-compatible endpoints.
+
+    Endpoints are weighted: the one with the lowest ``(outstanding + 1) / weight``
+    that still has spare ``max_concurrency`` receives the request. After
+    ``eject_after`` consecutive overload failures an endpoint is ejected for
+    ``eject_seconds`` (doubling on repeated ejections); once that passes it is
+    tried again, and :meth:`check_health` can bring it back early. When every
+    endpoint is ejected requests still go to the least recently ejected one
+    rather than failing outright.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        configs: list[EndpointConfig],
+        api_key: str,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        client_factory: Callable[[EndpointConfig], Any] | None = None,
+    ) -> None:
+        self.name = name
+        factory = client_factory or (
+            lambda config: AsyncOpenAI(api_key=api_key, base_url=config.url)
+        )
+        self._endpoints = [Endpoint(config, factory(config)) for config in configs]
+        self._eject_after = eject_after
+        self._eject_seconds = eject_seconds
+        self._cond = asyncio.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return sum(endpoint.config.max_concurrency for endpoint in self._endpoints)
+
+    def stats(self) -> list[EndpointStats]:
+        now = time.monotonic()
+        return [endpoint.stats(now) for endpoint in self._endpoints]
+
+    def _pick(self) -> Endpoint | None:
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self._endpoints if endpoint.available(now)]
+        if not candidates and all(endpoint.ejected_until > now for endpoint in self._endpoints):
+            candidates = [min(self._endpoints, key=lambda endpoint: endpoint.ejected_until)]
+        if not candidates:
+            return None
+        return min(candidates, key=Endpoint.load)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Reserve an endpoint for one request and yield its client."""
+
+        async with self._cond:
+            endpoint = self._pick()
+            while endpoint is None:
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                endpoint = self._pick()
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+        started = time.monotonic()
+        try:
+            yield endpoint.client
+        except Exception as exc:
+            endpoint.errors += 1
+            if is_overload_error(exc) or "Connection" in type(exc).__name__:
+                self._record_failure(endpoint)
+            raise
+        else:
+            endpoint.latencies.append(time.monotonic() - started)
+            endpoint.consecutive_failures = 0
+            endpoint.ejections = 0
+        finally:
+            async with self._cond:
+                endpoint.outstanding -= 1
+                self._cond.notify_all()
+
+    def _record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures < self._eject_after:
+            return
+        endpoint.ejections += 1
+        duration = self._eject_seconds * 2 ** (endpoint.ejections - 1)
+        endpoint.ejected_until = time.monotonic() + duration
+        endpoint.consecutive_failures = 0
+        logger.warning(
+            "Ejecting LLM endpoint",
+            extra={"pool": self.name, "url": endpoint.config.url, "seconds": duration},
+        )
+
+    async def check_health(self, timeout: float = 5.0) -> None:
+        """Probe ejected endpoints and reinstate the ones that answer."""
+
+        now = time.monotonic()
+        for endpoint in self._endpoints:
+            if endpoint.ejected_until <= now:
+                continue
+            try:
+                await asyncio.wait_for(endpoint.client.models.list(), timeout=timeout)
+            except Exception as exc:
+                logger.info(
+                    "LLM endpoint still unhealthy",
+                    extra={"pool": self.name, "url": endpoint.config.url, "error": str(exc)},
+                )
+                continue
+            endpoint.ejected_until = 0.0
+            endpoint.ejections = 0
+            logger.info("LLM endpoint reinstated", extra={"pool": self.name, "url": endpoint.config.url})
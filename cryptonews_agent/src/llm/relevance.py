@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from src.config import Settings
+from src.llm.schema import ClassificationResult
+
+logger = logging.getLogger(__name__)
+
+RELEVANCE_FILTER_MODEL = "relevance-filter"
+
+CASHTAG_RE = re.compile(r"(?<![\w$])\$[A-Za-z][A-Za-z0-9]{1,9}\b")
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Lower-cased word prefixes; a token matches if it starts with one of them, so
+# "inflation" and "инфляции" both hit without a stemmer.
+DEFAULT_KEYWORDS = frozenset(
+    {
+        # crypto
+        "crypto", "bitcoin", "btc", "ethereum", "eth", "solana", "xrp", "usdt", "usdc",
+        "stablecoin", "blockchain", "defi", "nft", "altcoin", "token", "halving", "mining",
+        "miner", "wallet", "exchange", "binance", "coinbase", "kraken", "etf", "airdrop",
+        "staking", "onchain", "whale", "memecoin", "satoshi", "sats",
+        # macro and markets
+        "fed", "fomc", "powell", "inflation", "cpi", "ppi", "rate", "yield", "treasury",
+        "recession", "gdp", "jobs", "payroll", "unemployment", "dollar", "dxy", "stocks",
+        "nasdaq", "sp500", "bond", "tariff", "liquidity", "qe", "qt",
+        # regulation
+        "sec", "cftc", "gensler", "regulat", "lawsuit", "ban", "sanction", "mica", "kyc", "aml",
+        "congress", "senate", "bill",
+        # russian
+        "крипт", "биткоин", "биткойн", "эфир", "блокчейн", "биржа", "бирж", "токен", "стейблкоин",
+        "майнинг", "фрс", "ставк", "инфляц", "рецесс", "доллар", "рубл", "цб", "санкц",
+        "регулир", "закон", "налог", "рынок", "рынк", "акци", "облигац",
+    }
+)
+
+
+def load_keywords(path: str | Path | None) -> frozenset[str]:
+    """Default lexicon plus one extra keyword per line from ``path`` (``#`` comments)."""
+
+    keywords = set(DEFAULT_KEYWORDS)
+    if path:
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip().lower()
+            if line:
+                keywords.add(line)
+    return frozenset(keywords)
+
+
+@dataclass(slots=True)
+class LinearRelevanceModel:
+    """Logistic regression over an embedding: ``sigmoid(weights . x + bias)``."""
+
+    weights: list[float]
+    bias: float = 0.0
+    embed_model: str | None = None
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LinearRelevanceModel":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            weights=[float(value) for value in payload["weights"]],
+            bias=float(payload.get("bias", 0.0)),
+            embed_model=payload.get("embed_model"),
+        )
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(
+            json.dumps({"weights": self.weights, "bias": self.bias, "embed_model": self.embed_model}),
+            encoding="utf-8",
+        )
+
+    def predict(self, embeddings: Sequence[Sequence[float]]) -> list[float]:
+        if not embeddings:
+            return []
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        logits = matrix @ np.asarray(self.weights, dtype=np.float32) + self.bias
+        return (1.0 / (1.0 + np.exp(-logits))).tolist()
+
+    @classmethod
+    def fit(
+        cls,
+        embeddings: Sequence[Sequence[float]],
+        labels: Sequence[bool],
+        epochs: int = 500,
+        learning_rate: float = 0.5,
+        l2: float = 1e-3,
+        embed_model: str | None = None,
+    ) -> "LinearRelevanceModel":
+        """Fit by full-batch gradient descent; samples are few and vectors short."""
+
+        matrix = np.asarray(embeddings, dtype=np.float64)
+        target = np.asarray(labels, dtype=np.float64)
+        weights = np.zeros(matrix.shape[1])
+        bias = 0.0
+        for _ in range(epochs):
+            predicted = 1.0 / (1.0 + np.exp(-(matrix @ weights + bias)))
+            error = predicted - target
+            weights -= learning_rate * (matrix.T @ error / len(target) + l2 * weights)
+            bias -= learning_rate * float(error.mean())
+        return cls(weights=weights.tolist(), bias=bias, embed_model=embed_model)
+
+
+@dataclass(slots=True)
+class RelevanceStats:
+    checked: int = 0
+    keyword_passed: int = 0
+    model_passed: int = 0
+    skipped: int = 0
+
+
+@dataclass(slots=True)
+class RelevanceDecision:
+    relevant: bool
+    keyword_hits: int
+    score: float | None = None
+
+
+@dataclass(slots=True)
+class RelevanceReport:
+    total: int = 0
+    skipped: int = 0
+    relevant: int = 0
+    false_negatives: int = 0
+    examples: list[str] = field(default_factory=list)
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.total if self.total else 0.0
+
+    @property
+    def false_negative_rate(self) -> float:
+        """Share of posts labelled relevant that the filter would have skipped."""
+
+        return self.false_negatives / self.relevant if self.relevant else 0.0
+
+
+class RelevanceFilter:
+    """Cheap local gate deciding whether a post is worth an LLM classification.
+
+    A post passes if it mentions at least ``min_keyword_hits`` lexicon keywords
+    or cashtags. Posts that do not are scored by the optional linear model over
+    their embedding and pass if the probability reaches ``model_threshold`` (or
+    if no embedding is available); without a model they are skipped. Skipped
+    posts get :func:`default_result`.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str] = DEFAULT_KEYWORDS,
+        min_keyword_hits: int = 1,
+        model: LinearRelevanceModel | None = None,
+        model_threshold: float = 0.2,
+    ) -> None:
+        self._keywords = frozenset(keyword.lower() for keyword in keywords)
+        self._exact = frozenset(keyword for keyword in self._keywords if len(keyword) <= 3)
+        self._prefixes = tuple(sorted(self._keywords - self._exact))
+        self._min_hits = max(1, min_keyword_hits)
+        self.model = model
+        self._threshold = model_threshold
+        self.stats = RelevanceStats()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RelevanceFilter":
+        model = None
+        if settings.relevance_model_path:
+            model = LinearRelevanceModel.load(settings.relevance_model_path)
+        return cls(
+            keywords=load_keywords(settings.relevance_keywords_path),
+            min_keyword_hits=settings.relevance_min_keyword_hits,
+            model=model,
+            model_threshold=settings.relevance_model_threshold,
+        )
+
+    @property
+    def min_keyword_hits(self) -> int:
+        return self._min_hits
+
+    def keyword_hits(self, text: str) -> int:
+        hits = len(CASHTAG_RE.findall(text))
+        for word in WORD_RE.findall(text.lower()):
+            # Short keywords ("eth", "fed", "sec") only match whole words.
+            if word in self._exact or (len(word) > 3 and word.startswith(self._prefixes)):
+                hits += 1
+                if hits >= self._min_hits:
+                    break
+        return hits
+
+    def decide(self, text: str, embedding: Sequence[float] | None = None) -> RelevanceDecision:
+        hits = self.keyword_hits(text)
+        if hits >= self._min_hits:
+            return RelevanceDecision(relevant=True, keyword_hits=hits)
+        if self.model is None:
+            return RelevanceDecision(relevant=False, keyword_hits=hits)
+        if embedding is None:
+            # Cannot score without a vector; let the LLM decide rather than drop it.
+            return RelevanceDecision(relevant=True, keyword_hits=hits)
+        score = self.model.predict([embedding])[0]
+        return RelevanceDecision(relevant=score >= self._threshold, keyword_hits=hits, score=score)
+
+    def record(self, decision: RelevanceDecision) -> None:
+        self.stats.checked += 1
+        if not decision.relevant:
+            self.stats.skipped += 1
+        elif decision.score is None:
+            self.stats.keyword_passed += 1
+        else:
+            self.stats.model_passed += 1
+
+
+def default_result() -> ClassificationResult:
+    """Classification stored for posts the relevance filter skips."""
+
+    return ClassificationResult(topics=[], sentiment=0, stance="neutral", impact=0)
+
+
+def evaluate(
+    relevance: RelevanceFilter,
+    samples: Sequence[tuple[str, bool]],
+    embeddings: Sequence[Sequence[float] | None] | None = None,
+    max_examples: int = 10,
+) -> RelevanceReport:
+    """Replay ``(text, is_relevant)`` samples through the filter without touching its stats."""
+
+    report = RelevanceReport()
+    for index, (text, label) in enumerate(samples):
+        embedding = embeddings[index] if embeddings is not None else None
+        decision = relevance.decide(text, embedding)
+        report.total += 1
+        report.relevant += int(label)
+        if not decision.relevant:
+            report.skipped += 1
+            if label:
+                report.false_negatives += 1
+                if len(report.examples) < max_examples:
+                    report.examples.append(text)
+    return report
+
+
+def load_labeled_sample(path: str | Path) -> list[tuple[str, bool]]:
+    """Read JSONL lines of ``{"text": ..., "relevant": true|false}``."""
+
+    samples: list[tuple[str, bool]] = []
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                samples.append((record["text"], bool(record["relevant"])))
+    return samples
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 425, 429})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint while its circuit is open."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures worth retrying: timeouts, connection errors, 429 and 5xx.
+
+    Anything else (400s, schema errors, empty completions) will fail the same
+    way again and is surfaced immediately.
+    """
+
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status in TRANSIENT_STATUS_CODES
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class CircuitState(str, enum.Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker counting consecutive transient failures.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast with :class:`CircuitOpenError` for ``recovery_seconds``. Then up
+    to ``half_open_max_calls`` probe calls are let through: a success closes the
+    circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.name = name
+        self._threshold = max(1, failure_threshold)
+        self._recovery = recovery_seconds
+        self._half_open_max = max(1, half_open_max_calls)
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.open and time.monotonic() - self._opened_at >= self._recovery:
+            return CircuitState.half_open
+        return self._state
+
+    def before_call(self) -> None:
+        state = self.state
+        if state is CircuitState.open:
+            raise CircuitOpenError(f"Circuit {self.name!r} is open")
+        if state is CircuitState.half_open:
+            if self._state is CircuitState.open:
+                self._state = CircuitState.half_open
+                self._probes = 0
+            if self._probes >= self._half_open_max:
+                raise CircuitOpenError(f"Circuit {self.name!r} is half-open; probe in flight")
+            self._probes += 1
+
+    def release(self) -> None:
+        """Give back a probe slot taken by :meth:`before_call` without an outcome.
+
+        Used when a call is cancelled before its result says anything about the
+        endpoint, so the half-open circuit can admit another probe.
+        """
+
+        if self._state is CircuitState.half_open and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        if self._state is not CircuitState.closed:
+            logger.info("Circuit closed", extra={"circuit": self.name})
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._probes = 0
+
+    def record_failure(self, exc: BaseException) -> None:
+        if not is_transient_error(exc):
+            # The endpoint answered; a bad request says nothing about its health.
+            if self._state is CircuitState.half_open:
+                self.record_success()
+            return
+        self._failures += 1
+        if self._state is CircuitState.half_open or self._failures >= self._threshold:
+            self._state = CircuitState.open
+            self._opened_at = time.monotonic()
+            self._failures = 0
+            logger.warning(
+                "Circuit opened",
+                extra={"circuit": self.name, "recovery_seconds": self._recovery},
+            )
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate`` tokens per second.
+
+    A ``rate`` of zero or less disables limiting. Requests larger than the
+    bucket are clamped to its capacity so they wait for a full bucket instead
+    of forever.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        if not self.enabled:
+            return
+        amount = min(amount, self._capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= amount
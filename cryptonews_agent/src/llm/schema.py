@@ -1,10 +1,91 @@
 from __future__ import annotations
 
-from typing import List, Literal
+import json
+from typing import Any, List, Literal
 
 from pydantic import BaseModel, Field, ValidationError
 
 
+class JsonScanner:
+    """Incrementally find the end of the first JSON object or array in a text stream.
+
+    Text before the opening bracket (prose, code fences) is skipped. Strings and
+    escapes are tracked so brackets inside values do not count.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._length = 0
+        self._start: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.end: int | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> str | None:
+        """Consume ``chunk`` and return the complete JSON text once it has closed."""
+
+        offset = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+        if self.end is not None:
+            return self.result()
+        for position, char in enumerate(chunk, start=offset):
+            if self._start is None:
+                if char in "{[":
+                    self._start = position
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = position + 1
+                    return self.result()
+        return None
+
+    def result(self) -> str | None:
+        if self._start is None or self.end is None:
+            return None
+        return self.text[self._start : self.end]
+
+
+def extract_json(text: str) -> str | None:
+    """Return the first complete JSON object or array embedded in ``text``."""
+
+    return JsonScanner().feed(text)
+
+
+def _loads_tolerant(json_str: str) -> Any:
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError as exc:
+        extracted = extract_json(json_str)
+        if extracted is None:
+            raise ValueError("Failed to decode JSON") from exc
+        try:
+            return json.loads(extracted)
+        except json.JSONDecodeError as inner:
+            raise ValueError("Failed to decode JSON") from inner
+
+
+LLM_FIELDS = ("topics", "sentiment", "stance", "impact")
+
+
 class Entity(BaseModel):
     type: str = Field(..., description="Entity type such as ORG/PER/TOPIC")
     text: str = Field(..., description="Mention text")
@@ -19,14 +100,74 @@ class ClassificationResult(BaseModel):
     entities: List[Entity] = Field(default_factory=list)
 
     @classmethod
-    def parse_json(cls, json_str: str) -> "ClassificationResult":
-        import json
+    def llm_schema(cls) -> dict[str, Any]:
+        """JSON schema of the fields the LLM fills in.
 
-        try:
-            payload = json.loads(json_str)
-        except json.JSONDecodeError as exc:
-            raise ValueError("Failed to decode JSON") from exc
+        Tickers and entities are extracted from the text during normalization,
+        so the model is not asked to spend output tokens on them.
+        """
+
+        schema = cls.model_json_schema()
+        properties = schema["properties"]
+        return {
+            "type": "object",
+            "properties": {name: properties[name] for name in LLM_FIELDS},
+            "required": [name for name in schema.get("required", []) if name in LLM_FIELDS],
+        }
+
+    @classmethod
+    def response_format(cls) -> dict[str, Any]:
+        """OpenAI-style ``response_format`` constraining output to :meth:`llm_schema`."""
+
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": "classification", "schema": cls.llm_schema()},
+        }
+
+    @classmethod
+    def batch_response_format(cls) -> dict[str, Any]:
+        """``response_format`` for ``{"results": [...]}`` with an ``index`` per entry."""
+
+        item_schema = cls.llm_schema()
+        item_schema["properties"] = {"index": {"type": "integer"}, **item_schema["properties"]}
+        item_schema["required"] = ["index", *item_schema["required"]]
+        schema: dict[str, Any] = {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": item_schema}},
+            "required": ["results"],
+        }
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": "classification_batch", "schema": schema},
+        }
+
+    @classmethod
+    def parse_json(cls, json_str: str) -> "ClassificationResult":
+        payload = _loads_tolerant(json_str)
         try:
             return cls.model_validate(payload)
         except ValidationError as exc:
             raise ValueError(str(exc)) from exc
+
+    @classmethod
+    def parse_indexed_json(cls, json_str: str) -> dict[int, "ClassificationResult"]:
+        """Parse a JSON array of results tagged with ``index``.
+
+        Entries that are missing an index or fail validation are left out so the
+        caller can retry just those posts.
+        """
+
+        payload = _loads_tolerant(json_str)
+        if isinstance(payload, dict):
+            payload = payload.get("results", payload.get("items"))
+        if not isinstance(payload, list):
+            raise ValueError("Expected a JSON array of classifications")
+        results: dict[int, ClassificationResult] = {}
+        for entry in payload:
+            if not isinstance(entry, dict) or not isinstance(entry.get("index"), int):
+                continue
+            try:
+                results[entry["index"]] = cls.model_validate(entry)
+            except ValidationError:
+                continue
+        return results
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class PollState:
+    interval: float
+    rate: float = 0.0
+    fetches: int = 0
+    last_items: int = 0
+    last_poll: float | None = None
+    next_due: float = 0.0
+    in_flight: bool = False
+
+
+class AdaptiveIntervals:
+    """Per-key polling intervals following an EWMA of the arrival rate.
+
+    Keys are sources or ``source:channel``. After each fetch the items it
+    returned are turned into a rate (items per second since the previous
+    fetch) and smoothed with weight ``alpha``; the next interval aims for
+    ``target_items`` per fetch at that rate, moving at most by ``step`` per
+    fetch. An empty fetch backs off by ``step`` and a fetch of ``full_items``
+    or more halves the interval. Intervals stay within ``min_seconds`` and
+    ``max_seconds``; unseen keys start at ``initial_seconds`` and are due now.
+    """
+
+    def __init__(
+        self,
+        initial_seconds: float,
+        min_seconds: float,
+        max_seconds: float,
+        target_items: float = 20.0,
+        full_items: int = 100,
+        alpha: float = 0.3,
+        step: float = 1.5,
+    ) -> None:
+        self._min = min_seconds
+        self._max = max(max_seconds, min_seconds)
+        self._initial = self._clamp(initial_seconds)
+        self._target = max(target_items, 1.0)
+        self._full = max(full_items, 1)
+        self._alpha = alpha
+        self._step = max(step, 1.0)
+        self._states: dict[str, PollState] = {}
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self._max, max(self._min, seconds))
+
+    def _state(self, key: str) -> PollState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = PollState(interval=self._initial)
+        return state
+
+    def interval(self, key: str) -> float:
+        return self._state(key).interval
+
+    def seconds_until_due(self, key: str, now: float | None = None) -> float:
+        """Zero when ``key`` should be polled, infinite while a poll is in flight."""
+
+        state = self._state(key)
+        if state.in_flight:
+            return math.inf
+        now = time.monotonic() if now is None else now
+        return max(0.0, state.next_due - now)
+
+    def begin(self, key: str) -> None:
+        self._state(key).in_flight = True
+
+    def observe(self, key: str, items: int, now: float | None = None) -> float:
+        """Record a finished fetch of ``key`` and return its next interval."""
+
+        now = time.monotonic() if now is None else now
+        state = self._state(key)
+        elapsed = now - state.last_poll if state.last_poll is not None else state.interval
+        rate = items / max(elapsed, 1e-3)
+        if state.fetches:
+            rate = self._alpha * rate + (1 - self._alpha) * state.rate
+        state.rate = rate
+        if items >= self._full:
+            interval = state.interval / 2
+        elif items == 0:
+            interval = state.interval * self._step
+        elif state.rate > 0:
+            interval = self._target / state.rate
+            interval = min(state.interval * self._step, max(state.interval / self._step, interval))
+        else:
+            interval = state.interval
+        state.interval = self._clamp(interval)
+        state.fetches += 1
+        state.last_items = items
+        state.last_poll = now
+        state.next_due = now + state.interval
+        state.in_flight = False
+        return state.interval
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {
+            key: {
+                "interval": round(state.interval, 1),
+                "items_per_minute": round(state.rate * 60, 2),
+                "last_items": state.last_items,
+                "fetches": state.fetches,
+            }
+            for key, state in sorted(self._states.items())
+        }
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Mapping
+
+from src.ingest.base import NormalizedItem
+
+STOP_SOURCE = "__stop__"
+
+
+@dataclass(slots=True)
+class Job:
+    """Fetch request for a single source."""
+
+    source_name: str
+    since: datetime
+    channels: tuple[str, ...] | None = None
+
+
+@dataclass(slots=True)
+class EnrichBatch:
+    """Fetched items waiting for classification and embedding."""
+
+    source_name: str
+    items: list[NormalizedItem] = field(default_factory=list)
+    weight: float = 1.0
+
+
+def item_channel(item: NormalizedItem) -> str | None:
+    """Return the channel/subreddit an item was published in, if known."""
+
+    raw = item.raw if isinstance(item.raw, Mapping) else {}
+    channel = raw.get("channel") or raw.get("subreddit")
+    return str(channel) if channel else None
+
+
+class FairShareQueue(asyncio.Queue):  # type: ignore[type-arg]
+    """Queue serving fetch jobs first and enrichment batches by weighted fair share.
+
+    Each source is a flow with its own heap ordered by batch weight (channel
+    priority). Flows are picked by stride scheduling: a flow's pass advances by
+    ``len(items) / source_weight`` whenever one of its batches is served, so a
+    source with twice the weight gets twice the items processed under contention
+    while idle sources never accumulate credit. Stop sentinels are served last.
+    """
+
+    def __init__(self, source_weights: Mapping[str, float] | None = None, maxsize: int = 0) -> None:
+        self._source_weights = dict(source_weights or {})
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self._jobs: deque[Job] = deque()
+        self._stops: deque[Job] = deque()
+        self._flows: dict[str, list[tuple[float, int, EnrichBatch]]] = {}
+        self._passes: dict[str, float] = {}
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._pending_items = 0
+
+    def _qsize(self) -> int:
+        return (
+            len(self._jobs)
+            + len(self._stops)
+            + sum(len(heap) for heap in self._flows.values())
+        )
+
+    def empty(self) -> bool:
+        return self._qsize() == 0
+
+    def _put(self, entry: Any) -> None:
+        if isinstance(entry, EnrichBatch):
+            heap = self._flows.setdefault(entry.source_name, [])
+            if not heap:
+                # A flow becoming active starts at the current virtual time so it
+                # cannot spend credit saved up while it had nothing queued.
+                self._passes[entry.source_name] = max(
+                    self._passes.get(entry.source_name, 0.0), self._vtime
+                )
+            heapq.heappush(heap, (-entry.weight, next(self._seq), entry))
+            self._pending_items += len(entry.items)
+        elif entry.source_name == STOP_SOURCE:
+            self._stops.append(entry)
+        else:
+            self._jobs.append(entry)
+
+    def _get(self) -> Any:
+        if self._jobs:
+            return self._jobs.popleft()
+        active = [name for name, heap in self._flows.items() if heap]
+        if not active:
+            return self._stops.popleft()
+        name = min(active, key=lambda flow: self._passes[flow])
+        _, _, batch = heapq.heappop(self._flows[name])
+        self._vtime = self._passes[name]
+        self._passes[name] += max(len(batch.items), 1) / self.source_weight(name)
+        self._pending_items -= len(batch.items)
+        return batch
+
+    def source_weight(self, source_name: str) -> float:
+        return max(float(self._source_weights.get(source_name, 1.0)), 1e-6)
+
+    @property
+    def pending_items(self) -> int:
+        """Number of items waiting in enrichment batches."""
+
+        return self._pending_items
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Sequence
+
+from src.ingest.base import NormalizedItem, Source
+from src.ingest.dedup import filter_duplicates, mark_hash
+from src.pipeline.worker import PipelineWorker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    processed: int = 0
+    batches: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+async def replay_source(
+    worker: PipelineWorker,
+    source: Source,
+    since: datetime,
+    batch_size: int,
+    concurrency: int = 1,
+    on_batch: Callable[[ReplayStats], None] | None = None,
+) -> ReplayStats:
+    """Push everything ``source`` streams after ``since`` through enrichment.
+
+    Unlike scheduled jobs this bypasses the fair-share queue and its overload
+    shedding: a backfill should wait for the LLM, not store items unenriched.
+    At most ``concurrency`` batches of ``batch_size`` are in flight, and the
+    source is not read further until one finishes, so memory stays bounded.
+    """
+
+    stats = ReplayStats()
+    in_flight: dict[asyncio.Task[None], int] = {}
+
+    async def _harvest(return_when: str) -> None:
+        done, _ = await asyncio.wait(in_flight, return_when=return_when)
+        for task in done:
+            count = in_flight.pop(task)
+            task.result()
+            stats.processed += count
+            stats.batches += 1
+            logger.info(
+                "Replayed batch",
+                extra={"processed": stats.processed, "items_per_sec": round(stats.rate, 2)},
+            )
+            if on_batch is not None:
+                on_batch(stats)
+
+    async def _submit(chunk: Sequence[NormalizedItem]) -> None:
+        while len(in_flight) >= max(1, concurrency):
+            await _harvest(asyncio.FIRST_COMPLETED)
+        mark_hash(chunk)
+        items = filter_duplicates(chunk)
+        in_flight[asyncio.create_task(worker.enrich_and_store(items))] = len(items)
+
+    chunk: list[NormalizedItem] = []
+    try:
+        async for item in source.stream_since(since):
+            chunk.append(item)
+            if len(chunk) >= batch_size:
+                await _submit(chunk)
+                chunk = []
+        if chunk:
+            await _submit(chunk)
+        while in_flight:
+            await _harvest(asyncio.ALL_COMPLETED)
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    return stats
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from src.db import crud
+from src.db.base import get_session
+from src.pipeline.worker import PipelineWorker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ReprocessStats:
+    processed: int = 0
+    batches: int = 0
+    last_id: str | None = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+def load_checkpoint(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text()).get("last_id")
+
+
+def save_checkpoint(path: Path, last_id: str) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps({"last_id": last_id}))
+    tmp_path.replace(path)
+
+
+async def reprocess_items(
+    worker: PipelineWorker,
+    selection: crud.ItemSelection,
+    batch_size: int,
+    checkpoint: Path | None = None,
+    on_batch: Callable[[ReprocessStats], None] | None = None,
+) -> ReprocessStats:
+    """Re-run enrichment over stored items selected by ``selection``.
+
+    Rows are streamed in ``batch_size`` partitions and written back one batch at
+    a time, so memory stays bounded regardless of table size. When a checkpoint
+    path is given the last committed id is recorded after every batch and the
+    run resumes after it.
+    """
+
+    stats = ReprocessStats()
+    if checkpoint is not None and selection.after_id is None:
+        selection.after_id = load_checkpoint(checkpoint)
+        if selection.after_id:
+            logger.info("Resuming reprocess", extra={"after_id": selection.after_id})
+
+    async with get_session() as session:
+        async for rows in crud.stream_items(session, selection, batch_size):
+            await worker.enrich_and_store([crud.to_normalized(row) for row in rows])
+            stats.processed += len(rows)
+            stats.batches += 1
+            stats.last_id = str(rows[-1].id)
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, stats.last_id)
+            logger.info(
+                "Reprocessed batch",
+                extra={"processed": stats.processed, "items_per_sec": round(stats.rate, 2)},
+            )
+            if on_batch is not None:
+                on_batch(stats)
+    return stats
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+from dataclasses import asdict
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import List
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from src.config import get_settings
+from src.db import partitions
+from src.ingest.normalizer import shutdown_batch_normalizer
 from src.ingest.reddit_source import RedditSource
 from src.ingest.telegram_source import TelegramSource
 from src.ingest.truth_social_source import TruthSocialSource
@@ -36,7 +41,13 @@ async def _build_sources() -> list:
                 )
                 await client.connect()
             sources.append(
-                TelegramSource(client, settings.telegram_channels, settings.max_text_tokens)
+                TelegramSource(
+                    client,
+                    settings.telegram_channels,
+                    settings.max_text_tokens,
+                    fetch_concurrency=settings.source_fetch_concurrency,
+                    cursor_path=settings.telegram_cursor_path,
+                )
             )
         except Exception as exc:  # pragma: no cover
             logger.warning("Failed to initialize Telegram client", extra={"error": str(exc)})
@@ -47,8 +58,18 @@ async def _build_sources() -> list:
 
             client = None
             if settings.twitter_bearer_token:
-                client = tweepy.Client(bearer_token=settings.twitter_bearer_token, wait_on_rate_limit=True)
-            sources.append(TwitterSource(client, settings.telegram_channels, settings.max_text_tokens))
+                # Rate limits are waited out asynchronously by TwitterSource.
+                client = tweepy.Client(bearer_token=settings.twitter_bearer_token)
+            sources.append(
+                TwitterSource(
+                    client,
+                    settings.twitter_queries,
+                    settings.max_text_tokens,
+                    max_query_length=settings.twitter_max_query_length,
+                    max_pages=settings.source_max_pages,
+                    fetch_concurrency=settings.source_fetch_concurrency,
+                )
+            )
         except Exception as exc:  # pragma: no cover
             logger.warning("Failed to initialize Twitter client", extra={"error": str(exc)})
 
@@ -63,7 +84,14 @@ async def _build_sources() -> list:
                     client_secret=settings.reddit_client_secret,
                     user_agent="cryptonews-agent",
                 )
-            sources.append(RedditSource(client, settings.reddit_subreddits, settings.max_text_tokens))
+            sources.append(
+                RedditSource(
+                    client,
+                    settings.reddit_subreddits,
+                    settings.max_text_tokens,
+                    fetch_concurrency=settings.source_fetch_concurrency,
+                )
+            )
         except Exception as exc:  # pragma: no cover
             logger.warning("Failed to initialize Reddit client", extra={"error": str(exc)})
 
@@ -76,14 +104,49 @@ async def _build_sources() -> list:
                 client = Mastodon(
                     access_token=settings.truth_social_access_token,
                     api_base_url=settings.truth_social_base_url,
+                    ratelimit_method="throw",
+                )
+            sources.append(
+                TruthSocialSource(
+                    client, settings.max_text_tokens, max_pages=settings.source_max_pages
                 )
-            sources.append(TruthSocialSource(client, settings.max_text_tokens))
+            )
         except Exception as exc:  # pragma: no cover
             logger.warning("Failed to initialize Truth Social client", extra={"error": str(exc)})
 
     return sources
 
 
+async def _poll_loop(worker: PipelineWorker, source_name: str) -> None:
+    """Poll a source whenever one of its adaptive intervals comes due."""
+
+    settings = get_settings()
+    while True:
+        try:
+            delay = await worker.poll_if_due(source_name)
+        except Exception as exc:
+            logger.warning("Adaptive poll failed", extra={"source": source_name, "error": str(exc)})
+            delay = settings.poll_min_seconds
+        # Wake up at least every POLL_MIN_SECONDS, and re-check in-flight polls every second.
+        await asyncio.sleep(min(max(delay, 1.0), settings.poll_min_seconds))
+
+
+def log_llm_stats(lm_client: LMStudioClient, worker: PipelineWorker) -> None:
+    for stats in lm_client.limiter_stats():
+        # LogRecord already has a ``name`` attribute, which extra may not overwrite.
+        fields = asdict(stats)
+        logger.info("LLM concurrency", extra={"limiter": fields.pop("name"), **fields})
+    logger.info("LLM circuits", extra=lm_client.circuit_states())
+    logger.info("Classifier", extra=asdict(worker.classifier_stats))
+    if worker.poll_intervals:
+        logger.info("Poll intervals", extra={"intervals": worker.poll_intervals})
+    if worker.relevance_stats is not None:
+        logger.info("Relevance filter", extra=asdict(worker.relevance_stats))
+    for pool, endpoints in lm_client.endpoint_stats().items():
+        for endpoint in endpoints:
+            logger.info("LLM endpoint", extra={"pool": pool, **asdict(endpoint)})
+
+
 async def start_scheduler() -> None:
     settings = get_settings()
     sources = await _build_sources()
@@ -99,14 +162,81 @@ async def start_scheduler() -> None:
     async def enqueue_source(name: str) -> None:
         await worker.enqueue(name, datetime.now(tz=timezone.utc) - timezone.utc.utcoffset(None))
 
+    pushing: list[TelegramSource] = []
+    poll_tasks: list[asyncio.Task[None]] = []
     for source in sources:
+        interval = settings.fetch_interval_seconds
+        if settings.telegram_push and isinstance(source, TelegramSource):
+            try:
+                await source.subscribe(
+                    functools.partial(worker.submit_items, source.name),
+                    on_reconnect=functools.partial(worker.enqueue, source.name),
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Telegram push subscription failed; polling instead", extra={"error": str(exc)}
+                )
+            if source.pushing:
+                pushing.append(source)
+                # Updates carry new posts; polling is only a safety net for gaps.
+                interval = settings.telegram_gap_fill_seconds
+                if source.unpushed_channels:
+                    scheduler.add_job(
+                        lambda src=source.name, channels=source.unpushed_channels: (
+                            asyncio.create_task(worker.enqueue(src, channels=channels))
+                        ),
+                        "interval",
+                        seconds=settings.fetch_interval_seconds,
+                        next_run_time=datetime.now(tz=timezone.utc),
+                    )
+        if settings.adaptive_polling and source not in pushing:
+            poll_tasks.append(asyncio.create_task(_poll_loop(worker, source.name)))
+            continue
         scheduler.add_job(
             lambda src=source.name: asyncio.create_task(worker.enqueue(src)),
             "interval",
-            seconds=settings.fetch_interval_seconds,
+            seconds=interval,
             next_run_time=datetime.now(tz=timezone.utc),
         )
 
+    # Scheduled as a coroutine so max_instances sees a sweep until it finishes.
+    scheduler.add_job(
+        worker.sweep_pending,
+        "interval",
+        seconds=settings.sweep_interval_seconds,
+        max_instances=1,
+    )
+
+    async def maintain_partitions() -> None:
+        try:
+            retired = await partitions.maintain_partitions(
+                settings.partition_months_ahead,
+                settings.retention_months,
+                settings.retention_mode,
+                Path(settings.retention_archive_dir),
+            )
+        except Exception as exc:
+            logger.warning("Partition maintenance failed", extra={"error": str(exc)})
+            return
+        if retired:
+            logger.info("Retired partitions", extra={"partitions": retired})
+
+    scheduler.add_job(
+        lambda: asyncio.create_task(maintain_partitions()),
+        "interval",
+        hours=24,
+        next_run_time=datetime.now(tz=timezone.utc),
+    )
+
+    scheduler.add_job(
+        log_llm_stats, "interval", args=(lm_client, worker), seconds=settings.fetch_interval_seconds
+    )
+    scheduler.add_job(
+        lambda: asyncio.create_task(lm_client.check_health()),
+        "interval",
+        seconds=settings.endpoint_eject_seconds,
+    )
+
     scheduler.start()
 
     try:
@@ -116,4 +246,10 @@ async def start_scheduler() -> None:
         logger.info("Stopping scheduler")
     finally:
         scheduler.shutdown(wait=False)
+        for task in poll_tasks:
+            task.cancel()
+        await asyncio.gather(*poll_tasks, return_exceptions=True)
+        for source in pushing:
+            await source.unsubscribe()
         await worker.stop()
+        shutdown_batch_normalizer()
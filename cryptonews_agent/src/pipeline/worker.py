@@ -2,28 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
+from collections import Counter
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Sequence
+from typing import Dict, List, Mapping, Sequence
 
 from src.config import get_settings
 from src.db import crud
 from src.db.base import get_session
+from src.db.bulk_load import store_items
 from src.ingest.base import NormalizedItem, Source
 from src.ingest.dedup import filter_duplicates, mark_hash
-from src.llm.classifiers import classify_text
+from src.llm.classifiers import ClassifierStats, classify_batch, pack_texts
 from src.llm.client import LMStudioClient
+from src.llm.relevance import RELEVANCE_FILTER_MODEL, RelevanceFilter, RelevanceStats, default_result
 from src.llm.schema import ClassificationResult
+from src.pipeline.polling import AdaptiveIntervals
+from src.pipeline.priority import STOP_SOURCE, EnrichBatch, FairShareQueue, Job, item_channel
+from src.utils.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass(slots=True)
-class Job:
-    source_name: str
-    since: datetime
-
-
 class PipelineWorker:
     def __init__(
         self,
@@ -31,11 +30,49 @@ class PipelineWorker:
         lm_client: LMStudioClient,
         batch_size: int,
         concurrency: int,
+        source_weights: Mapping[str, float] | None = None,
+        channel_weights: Mapping[str, float] | None = None,
+        relevance: RelevanceFilter | None = None,
     ) -> None:
+        settings = get_settings()
         self._sources = {source.name: source for source in sources}
         self._lm_client = lm_client
         self._batch_size = batch_size
-        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+        self._channel_weights = dict(
+            settings.channel_weights if channel_weights is None else channel_weights
+        )
+        self._queue = FairShareQueue(
+            settings.source_weights if source_weights is None else source_weights
+        )
+        self._overload_depth = settings.overload_queue_depth
+        self._overload_min_weight = settings.overload_min_weight
+        self._overload_mode = settings.overload_mode
+        self._item_timeout = settings.item_enrich_timeout_seconds
+        self._job_timeout = settings.job_enrich_timeout_seconds
+        self._classify_batch_size = max(1, settings.classify_batch_size)
+        self._classify_token_budget = settings.classify_batch_token_budget
+        self._classifier_stats = ClassifierStats()
+        self._copy_min_rows = settings.copy_load_min_rows
+        if relevance is None and settings.relevance_filter:
+            relevance = RelevanceFilter.from_settings(settings)
+        self._relevance = relevance
+        if relevance is not None and relevance.model is not None:
+            trained_on = relevance.model.embed_model
+            if trained_on and trained_on != lm_client.embed_model:
+                logger.warning(
+                    "Relevance model was trained on different embeddings",
+                    extra={"trained_on": trained_on, "embed_model": lm_client.embed_model},
+                )
+        self._intervals: AdaptiveIntervals | None = None
+        if settings.adaptive_polling:
+            self._intervals = AdaptiveIntervals(
+                settings.fetch_interval_seconds,
+                settings.poll_min_seconds,
+                settings.poll_max_seconds,
+                target_items=settings.poll_target_items,
+                full_items=settings.poll_full_items,
+                alpha=settings.poll_ewma_alpha,
+            )
         self._tasks: list[asyncio.Task[None]] = []
         self._concurrency = concurrency
         self._embedding_cache: Dict[str, List[float]] = {}
@@ -51,10 +88,15 @@ class PipelineWorker:
     async def stop(self) -> None:
         self._stopping = True
         for _ in self._tasks:
-            await self._queue.put(Job(source_name="__stop__", since=datetime.utcnow()))
+            await self._queue.put(Job(source_name=STOP_SOURCE, since=datetime.utcnow()))
         await asyncio.gather(*self._tasks, return_exceptions=True)
 
-    async def enqueue(self, source_name: str, since: datetime | None = None) -> None:
+    async def enqueue(
+        self,
+        source_name: str,
+        since: datetime | None = None,
+        channels: Sequence[str] | None = None,
+    ) -> None:
         if source_name not in self._sources:
             logger.warning("Unknown source", extra={"source": source_name})
             return
@@ -65,7 +107,63 @@ class PipelineWorker:
             )
             since = last_since or default_since
         self._last_seen[source_name] = since
-        await self._queue.put(Job(source_name=source_name, since=since))
+        await self._queue.put(
+            Job(
+                source_name=source_name,
+                since=since,
+                channels=tuple(channels) if channels is not None else None,
+            )
+        )
+
+    @property
+    def poll_intervals(self) -> dict[str, dict[str, float]]:
+        """Current adaptive interval and arrival rate per source or ``source:channel``."""
+
+        return self._intervals.snapshot() if self._intervals is not None else {}
+
+    def _poll_keys(self, source: Source) -> dict[str, str | None]:
+        channels = getattr(source, "channels", None) or []
+        if not channels:
+            return {source.name: None}
+        return {f"{source.name}:{channel.lower()}": channel for channel in channels}
+
+    async def poll_if_due(self, source_name: str) -> float:
+        """Enqueue a poll of whatever parts of a source are due; return seconds to the next.
+
+        Sources exposing ``channels`` are polled per channel, each on its own
+        adaptive interval. Requires ``ADAPTIVE_POLLING``.
+        """
+
+        if self._intervals is None:
+            raise RuntimeError("Adaptive polling is disabled")
+        source = self._sources[source_name]
+        keys = self._poll_keys(source)
+        due = {
+            key: channel
+            for key, channel in keys.items()
+            if self._intervals.seconds_until_due(key) <= 0
+        }
+        if due:
+            for key in due:
+                self._intervals.begin(key)
+            channels = None if list(due.values()) == [None] else [c for c in due.values() if c]
+            await self.enqueue(source_name, channels=channels)
+        return min(self._intervals.seconds_until_due(key) for key in keys)
+
+    def _observe_poll(self, source: Source, job: Job, counts: Mapping[str | None, int]) -> None:
+        if self._intervals is None:
+            return
+        for key, channel in self._poll_keys(source).items():
+            if channel is None:
+                self._intervals.observe(key, sum(counts.values()))
+            elif job.channels is None or channel in job.channels:
+                self._intervals.observe(key, counts.get(channel.lower(), 0))
+
+    async def submit_items(self, source_name: str, items: Sequence[NormalizedItem]) -> None:
+        """Queue items a source pushed on its own, e.g. Telegram update events."""
+
+        if items:
+            await self._submit_chunk(source_name, list(items), set())
 
     async def join(self) -> None:
         await self._queue.join()
@@ -74,55 +172,331 @@ class PipelineWorker:
     def source_names(self) -> list[str]:
         return list(self._sources.keys())
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of fetched items still waiting for enrichment."""
+
+        return self._queue.pending_items
+
+    @property
+    def relevance_stats(self) -> RelevanceStats | None:
+        return self._relevance.stats if self._relevance is not None else None
+
+    @property
+    def classifier_stats(self) -> ClassifierStats:
+        return self._classifier_stats
+
     async def _worker(self) -> None:
         while True:
             job = await self._queue.get()
-            if job.source_name == "__stop__":
+            if job.source_name == STOP_SOURCE:
                 self._queue.task_done()
                 break
             try:
-                await self._process_job(job)
+                if isinstance(job, EnrichBatch):
+                    await self.enrich_and_store(job.items)
+                else:
+                    await self._process_job(job)
             except Exception as exc:
                 logger.exception("Job processing failed", extra={"source": job.source_name, "error": str(exc)})
             finally:
                 self._queue.task_done()
 
     async def _process_job(self, job: Job) -> None:
+        """Stream a source's new items and queue them in ``batch_size`` micro-batches.
+
+        Enrichment of the first chunk starts while the source is still fetching
+        the rest; the source's cursor only moves once the stream is exhausted.
+        """
+
         source = self._sources[job.source_name]
         since = job.since.astimezone(timezone.utc)
         logger.info("Fetching", extra={"source": source.name, "since": since.isoformat()})
-        items = await source.fetch_since(since)
-        if not items:
-            return
-        mark_hash(items)
-        items = filter_duplicates(items)
-        logger.info("Processing items", extra={"source": source.name, "count": len(items)})
-        await self._enrich_and_store(items)
-        latest = max(item.published_at for item in items)
+        seen: set[str] = set()
+        chunk: list[NormalizedItem] = []
+        latest: datetime | None = None
+        total = 0
+        counts: Counter[str | None] = Counter()
+        if job.channels is not None:
+            stream = source.stream_since(since, channels=job.channels)  # type: ignore[call-arg]
+        else:
+            stream = source.stream_since(since)
+        try:
+            async for item in stream:
+                if latest is None or item.published_at > latest:
+                    latest = item.published_at
+                channel = item_channel(item)
+                counts[channel.lower() if channel else None] += 1
+                chunk.append(item)
+                if len(chunk) >= self._batch_size:
+                    total += await self._submit_chunk(source.name, chunk, seen)
+                    chunk = []
+            if chunk:
+                total += await self._submit_chunk(source.name, chunk, seen)
+        finally:
+            # A failed fetch counts as an empty one and backs the poll off.
+            self._observe_poll(source, job, counts)
+        if total:
+            logger.info("Processing items", extra={"source": source.name, "count": total})
         if latest:
             self._last_seen[source.name] = latest
 
-    async def _enrich_and_store(self, items: Sequence[NormalizedItem]) -> None:
-        enriched: list[tuple[NormalizedItem, ClassificationResult | None, List[float] | None]] = []
+    async def _submit_chunk(
+        self, source_name: str, chunk: list[NormalizedItem], seen: set[str]
+    ) -> int:
+        mark_hash(chunk)
+        items = [item for item in filter_duplicates(chunk) if item.content_hash not in seen]
+        seen.update(item.content_hash for item in items if item.content_hash)
+        for batch in self._build_batches(source_name, items):
+            if self._should_shed(batch):
+                await self._store_unenriched(batch.items)
+            else:
+                await self._queue.put(batch)
+        return len(items)
+
+    def _build_batches(self, source_name: str, items: Sequence[NormalizedItem]) -> list[EnrichBatch]:
+        by_channel: Dict[str | None, list[NormalizedItem]] = {}
         for item in items:
-            classification = None
+            by_channel.setdefault(item_channel(item), []).append(item)
+        source_weight = self._queue.source_weight(source_name)
+        batches: list[EnrichBatch] = []
+        for channel, channel_items in by_channel.items():
+            weight = source_weight * self._channel_weights.get(channel or "", 1.0)
+            for start in range(0, len(channel_items), self._batch_size):
+                batches.append(
+                    EnrichBatch(
+                        source_name=source_name,
+                        items=channel_items[start : start + self._batch_size],
+                        weight=weight,
+                    )
+                )
+        return batches
+
+    def _should_shed(self, batch: EnrichBatch) -> bool:
+        if self._overload_depth <= 0 or batch.weight >= self._overload_min_weight:
+            return False
+        return self._queue.pending_items >= self._overload_depth
+
+    async def _store_unenriched(self, items: Sequence[NormalizedItem]) -> None:
+        """Persist items without classification and tag them for later enrichment."""
+
+        logger.info(
+            "Shedding enrichment under load",
+            extra={"count": len(items), "queue_depth": self._queue.pending_items},
+        )
+        embeddings: List[List[float]] = []
+        if self._overload_mode == "embed_only":
             try:
-                if item.text:
-                    classification = await classify_text(self._lm_client, item.text)
+                embeddings = await self._embed_texts([item.text for item in items])
             except Exception as exc:
-                logger.warning("Classification failed", extra={"error": str(exc)})
-            embedding = None
-            if item.content_hash and item.content_hash in self._embedding_cache:
-                embedding = self._embedding_cache[item.content_hash]
-            elif item.text:
-                embedding = await self._embed_texts([item.text])
-                if embedding:
-                    embedding = embedding[0]
-                    if item.content_hash:
-                        self._embedding_cache[item.content_hash] = embedding
-            enriched.append((item, classification, embedding))
+                logger.warning("Embedding failed", extra={"error": str(exc)})
+        enriched = [
+            (item, None, embeddings[index] if index < len(embeddings) else None)
+            for index, item in enumerate(items)
+        ]
+        async with get_session() as session:
+            await store_items(
+                session,
+                enriched,
+                pending=True,
+                embedded_with=self._lm_client.embed_model,
+                copy_min_rows=self._copy_min_rows,
+            )
+
+    async def enrich_and_store(self, items: Sequence[NormalizedItem]) -> None:
+        """Classify and embed ``items`` and upsert them with model provenance.
+
+        Short posts are packed into multi-post classification requests of up to
+        ``CLASSIFY_BATCH_SIZE`` posts within ``CLASSIFY_BATCH_TOKEN_BUDGET``, and
+        packs are enriched concurrently up to the client's current adaptive
+        limit. Each pack gets ``ITEM_ENRICH_TIMEOUT_SECONDS`` per post it holds (or
+        per post-sized share of the token budget, if more) and the whole call at
+        most ``JOB_ENRICH_TIMEOUT_SECONDS``. Items that fail or run out of
+        budget are stored straight away with ``enrichment_pending`` set and are
+        picked up later by :meth:`sweep_pending`. With ``RELEVANCE_FILTER`` on,
+        off-topic posts are stored with a default classification and never
+        reach the LLM.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._job_timeout
+        if self._relevance is not None:
+            items = await self._filter_relevant(items, deadline)
+        packs = [
+            [items[index] for index in pack]
+            for pack in pack_texts(
+                [item.text for item in items], self._classify_batch_size, self._classify_token_budget
+            )
+        ]
+        enriched: list[tuple[NormalizedItem, ClassificationResult | None, List[float] | None]] = []
+        failed: list[NormalizedItem] = []
+        in_flight: dict[asyncio.Task, list[NormalizedItem]] = {}
+        next_pack = 0
+        while next_pack < len(packs) or in_flight:
+            while next_pack < len(packs) and len(in_flight) < self._fanout():
+                pack = packs[next_pack]
+                budget = min(self._pack_timeout(pack), deadline - loop.time())
+                if budget <= 0:
+                    break
+                task = asyncio.create_task(asyncio.wait_for(self._enrich_pack(pack), budget))
+                in_flight[task] = pack
+                next_pack += 1
+            if not in_flight:
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pack = in_flight.pop(task)
+                try:
+                    results = task.result()
+                except Exception as exc:
+                    logger.warning(
+                        "Enrichment deferred",
+                        extra={"count": len(pack), "error": str(exc) or type(exc).__name__},
+                    )
+                    failed.extend(pack)
+                    continue
+                for item, classification, embedding in results:
+                    if item.text and classification is None:
+                        failed.append(item)
+                    else:
+                        enriched.append((item, classification, embedding))
+        for pack in packs[next_pack:]:
+            failed.extend(pack)
+        if failed:
+            logger.warning("Storing items for later enrichment", extra={"count": len(failed)})
+            await self._store_pending(failed)
+        if not enriched:
+            return
+        async with get_session() as session:
+            await store_items(
+                session,
+                enriched,
+                classified_with=self._lm_client.model,
+                embedded_with=self._lm_client.embed_model,
+                copy_min_rows=self._copy_min_rows,
+            )
+
+    async def sweep_pending(self, limit: int | None = None) -> int:
+        """Retry enrichment for up to ``limit`` items stored as pending.
+
+        Each picked item has its attempt count raised first, so items that keep
+        failing make way for the rest on later sweeps.
+        """
+
         async with get_session() as session:
-            await crud.upsert_items(session, enriched)
+            rows = await crud.get_pending_items(session, limit or self._batch_size)
+            items = [crud.to_normalized(row) for row in rows]
+            await crud.record_enrichment_attempts(session, [row.id for row in rows])
+        if items:
+            logger.info("Sweeping pending items", extra={"count": len(items)})
+            await self.enrich_and_store(items)
+        return len(items)
+
+    def _pack_timeout(self, pack: Sequence[NormalizedItem]) -> float:
+        # A pack may fall back to one request per post, and long posts take
+        # longer to generate for, so the per-item budget scales with both.
+        per_item_tokens = max(1, self._classify_token_budget // self._classify_batch_size)
+        tokens = sum(count_tokens(item.text) for item in pack)
+        return self._item_timeout * max(len(pack), tokens / per_item_tokens, 1)
+
+    def _fanout(self) -> int:
+        # Follow the client's adaptive limit so queued items do not burn their
+        # per-item budget waiting for a slot.
+        return max(1, getattr(self._lm_client, "concurrency_hint", 1))
+
+    async def _enrich_pack(
+        self, pack: Sequence[NormalizedItem]
+    ) -> list[tuple[NormalizedItem, ClassificationResult | None, List[float] | None]]:
+        with_text = [item for item in pack if item.text]
+        classifications: dict[int, ClassificationResult | None] = {}
+        if with_text:
+            results = await classify_batch(
+                self._lm_client, [item.text for item in with_text], self._classifier_stats
+            )
+            classifications = {id(item): result for item, result in zip(with_text, results)}
+
+        embeddings = await self._embed_items(with_text)
+        return [
+            (item, classifications.get(id(item)), embeddings.get(id(item))) for item in pack
+        ]
+
+    async def _embed_items(self, items: Sequence[NormalizedItem]) -> dict[int, List[float]]:
+        """Embed ``items`` keyed by ``id(item)``, reusing vectors cached by content hash."""
+
+        to_embed = [
+            item
+            for item in items
+            if not (item.content_hash and item.content_hash in self._embedding_cache)
+        ]
+        computed = await self._embed_texts([item.text for item in to_embed])
+        for item, vector in zip(to_embed, computed):
+            if item.content_hash:
+                self._embedding_cache[item.content_hash] = vector
+        fresh = {id(item): vector for item, vector in zip(to_embed, computed)}
+
+        embeddings: dict[int, List[float]] = {}
+        for item in items:
+            embedding = fresh.get(id(item))
+            if embedding is None and item.content_hash:
+                embedding = self._embedding_cache.get(item.content_hash)
+            if embedding is not None:
+                embeddings[id(item)] = embedding
+        return embeddings
+
+    async def _filter_relevant(
+        self, items: Sequence[NormalizedItem], deadline: float
+    ) -> list[NormalizedItem]:
+        """Store posts the relevance filter rejects and return the ones to classify."""
+
+        assert self._relevance is not None
+        relevance = self._relevance
+        candidates = [
+            item
+            for item in items
+            if item.text and relevance.keyword_hits(item.text) < relevance.min_keyword_hits
+        ]
+        # Candidates are embedded up front: the model needs the vector, and
+        # skipped posts are still stored with one so they stay searchable.
+        try:
+            # Counts against the call's budget; on timeout only keywords decide.
+            remaining = deadline - asyncio.get_running_loop().time()
+            embeddings = await asyncio.wait_for(self._embed_items(candidates), max(remaining, 0))
+        except Exception as exc:
+            logger.warning("Relevance embedding failed", extra={"error": str(exc)})
+            embeddings = {}
+        keep: list[NormalizedItem] = []
+        skipped: list[tuple[NormalizedItem, ClassificationResult | None, List[float] | None]] = []
+        for item in items:
+            if not item.text:
+                keep.append(item)
+                continue
+            embedding = embeddings.get(id(item))
+            decision = relevance.decide(item.text, embedding)
+            relevance.record(decision)
+            if decision.relevant:
+                keep.append(item)
+            else:
+                skipped.append((item, default_result(), embedding))
+        if skipped:
+            logger.info("Skipping off-topic posts", extra={"count": len(skipped)})
+            async with get_session() as session:
+                await store_items(
+                    session,
+                    skipped,
+                    classified_with=RELEVANCE_FILTER_MODEL,
+                    embedded_with=self._lm_client.embed_model if embeddings else None,
+                    copy_min_rows=self._copy_min_rows,
+                )
+        return keep
+
+    async def _store_pending(self, items: Sequence[NormalizedItem]) -> None:
+        async with get_session() as session:
+            await store_items(
+                session,
+                [(item, None, None) for item in items],
+                pending=True,
+                copy_min_rows=self._copy_min_rows,
+            )
 
     async def _embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
         if not texts:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+APPROX_TOKEN_RE = re.compile(r"[A-Za-z]{1,4}|\d{1,3}|[^\W\d_A-Za-z]{1,2}|[^\w\s]|_")
+
+
+class Tokenizer(Protocol):
+    def count(self, text: str) -> int:
+        ...
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        ...
+
+
+class ApproxTokenizer:
+    """Regex approximation of a BPE vocabulary used when no real tokenizer loads.
+
+    Latin runs count one token per four letters, digits per three, other
+    scripts (e.g. Cyrillic) per two characters and punctuation per character,
+    which tracks cl100k/o200k counts far better than whitespace splitting.
+    """
+
+    def count(self, text: str) -> int:
+        return sum(1 for _ in APPROX_TOKEN_RE.finditer(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        for index, match in enumerate(APPROX_TOKEN_RE.finditer(text), start=1):
+            if index == max_tokens:
+                return text[: match.end()]
+        return text
+
+
+class _EncodingTokenizer:
+    def __init__(self, encoding) -> None:  # type: ignore[no-untyped-def]
+        self._encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        ids = self._encoding.encode(text)
+        if len(ids) <= max_tokens:
+            return text
+        return self._encoding.decode(ids[: max(max_tokens, 0)])
+
+
+class _HuggingFaceTokenizer(_EncodingTokenizer):
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, add_special_tokens=False))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        ids = self._encoding.encode(text, add_special_tokens=False)
+        if len(ids) <= max_tokens:
+            return text
+        return self._encoding.decode(ids[: max(max_tokens, 0)], skip_special_tokens=True)
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(name: str) -> Tokenizer:
+    """Load a tokenizer once per name.
+
+    ``tiktoken:<encoding>`` uses tiktoken, ``approx`` the regex approximation,
+    and anything else is treated as a Hugging Face tokenizer id. If loading
+    fails (package missing, no network for the vocabulary) the approximation is
+    used instead.
+    """
+
+    if name == "approx":
+        return ApproxTokenizer()
+    try:
+        if name.startswith("tiktoken:"):
+            import tiktoken
+
+            return _EncodingTokenizer(tiktoken.get_encoding(name.split(":", 1)[1]))
+        from transformers import AutoTokenizer
+
+        return _HuggingFaceTokenizer(AutoTokenizer.from_pretrained(name))
+    except Exception as exc:
+        logger.warning(
+            "Tokenizer unavailable, using approximation",
+            extra={"tokenizer": name, "error": str(exc)},
+        )
+        return ApproxTokenizer()
+
+
+def default_tokenizer() -> Tokenizer:
+    from src.config import get_settings
+
+    return get_tokenizer(get_settings().tokenizer)
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    return default_tokenizer().count(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    return default_tokenizer().truncate(text, max_tokens)
@@ -4,6 +4,27 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def inline_normalizer(monkeypatch):
+    """Normalize inline: source tests time pushes and polls in milliseconds and
+    spawning the process pool would dominate them. The pool has its own test."""
+
+    monkeypatch.setenv("NORMALIZE_WORKERS", "0")
+    try:
+        from src.config import get_settings
+        from src.ingest.normalizer import shutdown_batch_normalizer
+    except ImportError:
+        yield
+        return
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    shutdown_batch_normalizer()
+    yield
+    shutdown_batch_normalizer()
+    get_settings.cache_clear()  # type: ignore[attr-defined]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import select
+
+from src.config import get_settings
+from src.db import base
+from src.db.base import Base, get_engine, get_session
+from src.db.bulk_load import (
+    ITEM_COLUMNS,
+    UPDATE_CLASSIFICATION,
+    UPDATE_EMBEDDING,
+    _merge_sql,
+    load_items,
+    stage_records,
+)
+from src.db.models import Item, SourceEnum
+from src.ingest.base import NormalizedItem
+from src.llm.schema import ClassificationResult
+
+PUBLISHED_AT = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _item(source_id: str, text: str) -> NormalizedItem:
+    return NormalizedItem(
+        source=SourceEnum.telegram,
+        source_id=source_id,
+        text=text,
+        raw={"id": source_id},
+        published_at=PUBLISHED_AT,
+        lang="en",
+        tickers=["BTC"],
+    )
+
+
+def test_stage_records_columns_and_masks() -> None:
+    classification = ClassificationResult(
+        topics=["etf"], sentiment=1, stance="bullish", impact=2, tickers=["ETH"]
+    )
+    archived = _item("a", "second")
+    # Archive rows may carry values plain JSON cannot encode.
+    archived.raw["date"] = PUBLISHED_AT
+    records = stage_records(
+        [
+            (_item("a", "first"), None, None),
+            (_item("b", "BTC and ETH"), classification, [1, 0.5]),
+            (archived, None, None),
+        ],
+        pending=True,
+        classified_with="llm",
+        embedded_with="embed",
+    )
+
+    assert len(records) == 2
+    rows = [dict(zip([*ITEM_COLUMNS, "update_mask"], record)) for record in records]
+    first, second = rows
+    assert first["text"] == "second"
+    assert first["update_mask"] == 0
+    assert first["topics"] == [] and first["embedding"] is None
+    assert json.loads(first["raw"])["date"].startswith("2024-05-01")
+    assert first["source"] == "telegram"
+    assert second["update_mask"] == UPDATE_CLASSIFICATION | UPDATE_EMBEDDING
+    assert second["tickers"] == ["BTC", "ETH"]
+    assert second["embedding"] == [1.0, 0.5]
+    assert second["classified_with"] == "llm"
+
+
+def test_merge_conflicts_on_source_id_unless_partitioned() -> None:
+    types = {column: "text" for column in ITEM_COLUMNS}
+    assert "ON CONFLICT (source_id) " in _merge_sql(types, 0, partitioned=False)
+    assert "ON CONFLICT (source_id, published_at) " in _merge_sql(types, 0, partitioned=True)
+
+
+@pytest.mark.asyncio
+async def test_load_items_falls_back_to_upsert_on_sqlite(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def _stream():
+        yield _item("chan:0", "Bitcoin post 0")
+        # Reposted text is dropped within a chunk, as in a live job.
+        yield _item("chan:repost", "Bitcoin post 0")
+        for index in range(1, 5):
+            yield _item(f"chan:{index}", f"Bitcoin post {index}")
+
+    progress: list[int] = []
+    stats = await load_items(_stream(), chunk_size=2, on_chunk=lambda s: progress.append(s.rows))
+
+    assert stats.rows == 5
+    assert stats.chunks == 3
+    assert progress == [1, 3, 5]
+    async with get_session() as session:
+        rows = (await session.execute(select(Item))).scalars().all()
+    assert len(rows) == 5
+    assert all(row.enrichment_pending for row in rows)
@@ -8,10 +8,12 @@ import pytest
 
 pytest.importorskip("sqlalchemy")
 
+from sqlalchemy import select, update
+
 from src.config import get_settings
 from src.db import base, crud
 from src.db.base import Base, get_engine, get_session
-from src.db.models import SourceEnum
+from src.db.models import Item, SourceEnum
 from src.ingest.base import NormalizedItem
 from src.llm.schema import ClassificationResult, Entity
 
@@ -56,3 +58,66 @@ async def test_upsert_item_sqlite(monkeypatch) -> None:
     async with get_session() as session:
         item = await crud.upsert_item(session, normalized, classification, [0.1, 0.2])
         assert item.sentiment == -1
+
+
+def test_merge_prefers_extracted_tickers_and_entities() -> None:
+    assert crud.merge_tickers(["BTC"], ["btc", "ETH"]) == ["BTC", "ETH"]
+    extracted = [{"type": "REGULATOR", "text": "SEC"}]
+    merged = crud.merge_entities(extracted, [{"type": "REGULATOR", "text": "sec"}, {"type": "ORG", "text": "BlackRock"}])
+    assert merged == [*extracted, {"type": "ORG", "text": "BlackRock"}]
+
+@pytest.mark.asyncio
+async def test_upsert_items_bulk_sqlite(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    published_at = datetime.now(tz=timezone.utc)
+    items = [
+        NormalizedItem(
+            source=SourceEnum.twitter,
+            source_id=f"t{index}",
+            text=f"ETH update {index}",
+            raw={"id": index},
+            published_at=published_at,
+            lang="en",
+        )
+        for index in range(5)
+    ]
+    classification = ClassificationResult(
+        topics=["crypto"], sentiment=1, stance="bullish", impact=1, tickers=["ETH"]
+    )
+    stale = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    async with get_session() as session:
+        ids = await crud.upsert_items(
+            session, [(item, classification, [0.5]) for item in items], chunk_size=2
+        )
+        assert len(set(ids)) == 5
+        await session.execute(update(Item).values(updated_at=stale))
+
+    # Identical rows are not rewritten, but their ids still come back in order.
+    async with get_session() as session:
+        again = await crud.upsert_items(
+            session, [(item, classification, [0.5]) for item in reversed(items)]
+        )
+        assert again == list(reversed(ids))
+        rows = (await session.execute(select(Item).order_by(Item.source_id))).scalars().all()
+        assert all(row.updated_at.replace(tzinfo=timezone.utc) == stale for row in rows)
+
+    # A pending upsert updates the post but keeps the earlier enrichment.
+    items[0].text = "ETH update 0 (edited)"
+    async with get_session() as session:
+        assert await crud.upsert_items(session, [(items[0], None, None)], pending=True) == ids[:1]
+        row = await crud.get_item_by_source_id(session, "t0")
+        assert row.text == "ETH update 0 (edited)"
+        assert row.enrichment_pending is True
+        assert row.topics == ["crypto"]
+        assert row.embedding == [0.5]
+        assert row.updated_at.replace(tzinfo=timezone.utc) != stale
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from src.config import get_settings
+from src.db import base, crud, partitions
+from src.db.base import Base, get_engine, get_session
+from src.db.partitions import Partition, add_months, months_between, retired
+
+
+def test_monthly_partitions_span_year_boundary() -> None:
+    first = datetime(2024, 11, 17, 8, 30, tzinfo=timezone.utc)
+    months = months_between(first, add_months(datetime(2024, 11, 1, tzinfo=timezone.utc), 3))
+
+    assert [partition.name for partition in months] == [
+        "items_p2024_11",
+        "items_p2024_12",
+        "items_p2025_01",
+        "items_p2025_02",
+    ]
+    december = months[1]
+    assert december.end == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert december.create_sql() == (
+        "CREATE TABLE IF NOT EXISTS items_p2024_12 PARTITION OF items FOR VALUES "
+        "FROM ('2024-12-01T00:00:00+00:00') TO ('2025-01-01T00:00:00+00:00')"
+    )
+    moved = december.move_from_default_sql()
+    assert moved[0] == "CREATE TABLE items_p2024_12 (LIKE items INCLUDING DEFAULTS)"
+    assert "DELETE FROM items_default WHERE published_at >= '2024-12-01T00:00:00+00:00'" in moved[1]
+    assert moved[2] == (
+        "ALTER TABLE items ATTACH PARTITION items_p2024_12 FOR VALUES "
+        "FROM ('2024-12-01T00:00:00+00:00') TO ('2025-01-01T00:00:00+00:00')"
+    )
+    assert moved[3].startswith("INSERT INTO item_keys")
+    assert Partition.from_name("items_p2024_12") == december
+    assert Partition.from_name("items_default") is None
+    # Month boundaries are taken in UTC.
+    local = datetime(2025, 3, 1, 1, 0, tzinfo=timezone(timedelta(hours=3)))
+    assert Partition.for_month(local).name == "items_p2025_02"
+
+
+def test_retention_keeps_current_and_recent_months() -> None:
+    existing = months_between(
+        datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 8, 1, tzinfo=timezone.utc)
+    )
+    now = datetime(2024, 6, 15, tzinfo=timezone.utc)
+
+    assert [p.name for p in retired(existing, 2, now)] == [
+        "items_p2024_01",
+        "items_p2024_02",
+        "items_p2024_03",
+    ]
+    assert retired(existing, 12, now) == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_stays_unpartitioned(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with get_session() as session:
+        assert not await partitions.is_partitioned(session)
+    assert await partitions.maintain_partitions(3, keep_months=1) == []
+    assert await partitions.apply_retention(1, "drop") == []
+    assert crud.conflict_columns(partitioned=False) == ("source_id",)
+    assert crud.conflict_columns(partitioned=True) == ("source_id", "published_at")
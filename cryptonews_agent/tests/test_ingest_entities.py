@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+import os
+
+from src.ingest.entities import AhoCorasick, DictionaryEntry, EntityExtractor
+
+
+def test_aho_corasick_matches_whole_words_and_overlaps() -> None:
+    matcher = AhoCorasick([("he", 1), ("she", 2), ("hers", 3), ("USD Coin", 4)])
+    assert [payload for _, _, payload in matcher.find("she said hers, not usd coin")] == [2, 3, 4]
+    assert list(matcher.find("ushers")) == []
+
+
+def test_extractor_finds_cashtags_names_and_exact_tickers() -> None:
+    extractor = EntityExtractor()
+    tickers, entities = extractor.extract(
+        "$PEPE and Bitcoin rally after SEC nod; SOL too, but the sol is shining. Биткоин растёт"
+    )
+    assert tickers == ["PEPE", "BTC", "SOL"]
+    assert entities == [
+        {"type": "COIN", "text": "Bitcoin"},
+        {"type": "REGULATOR", "text": "SEC"},
+        {"type": "COIN", "text": "Solana"},
+    ]
+    assert extractor.extract("2 sec later") == ([], [])
+
+
+def test_extractor_hot_reloads_dictionary(tmp_path) -> None:
+    path = tmp_path / "entities.jsonl"
+    path.write_text(json.dumps({"type": "COIN", "text": "Pepe", "ticker": "PEPE"}) + "\n")
+    extractor = EntityExtractor(entries=[DictionaryEntry("COIN", "Bitcoin", "BTC")], path=path)
+    assert extractor.extract("pepe season") == (["PEPE"], [{"type": "COIN", "text": "Pepe"}])
+
+    path.write_text(json.dumps([{"type": "ORG", "text": "Kraken", "aliases": ["kraken pro"]}]))
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert extractor.reload()
+    assert extractor.extract("pepe on kraken") == ([], [{"type": "ORG", "text": "Kraken"}])
@@ -7,9 +7,19 @@ import pytest
 pytest.importorskip("langdetect")
 
 from src.ingest.dedup import filter_duplicates
-from src.ingest.normalizer import detect_language, normalize_text, truncate_tokens
+from src.ingest.normalizer import (
+    BatchNormalizer,
+    CachedDetector,
+    ScriptDetector,
+    detect_language,
+    detect_languages,
+    normalize_text,
+    normalize_texts,
+    truncate_tokens,
+)
 from src.ingest.base import NormalizedItem
 from src.db.models import SourceEnum
+from src.utils.tokens import count_tokens
 
 
 def test_normalize_text_removes_urls_and_emojis() -> None:
@@ -21,6 +31,46 @@ def test_normalize_text_removes_urls_and_emojis() -> None:
 
 def test_detect_language_handles_empty() -> None:
     assert detect_language("") is None
+    assert detect_languages(["", "  "]) == [None, None]
+
+
+class RecordingDetector:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def detect(self, text: str) -> str | None:
+        return self.detect_batch([text])[0]
+
+    def detect_batch(self, texts):
+        self.calls.append(list(texts))
+        return ["xx" for _ in texts]
+
+
+def test_script_detector_fast_path_and_fallback() -> None:
+    fallback = RecordingDetector()
+    detector = ScriptDetector(fallback=fallback)
+    texts = [
+        "Биткоин обновил максимум после решения SEC",
+        "Bitcoin is up after the SEC said it will review the ETF",
+        "Біткоїн зріс після рішення регулятора",
+        "Bitcoin steigt nach neuen Regeln",
+        "12345",
+    ]
+    assert detector.detect_batch(texts) == ["ru", "en", "xx", "xx", "xx"]
+    assert fallback.calls == [texts[2:]]
+    assert ScriptDetector().detect(texts[3]) is None
+
+
+def test_cached_detector_batches_misses_and_evicts() -> None:
+    inner = RecordingDetector()
+    cached = CachedDetector(inner, maxsize=2)
+    assert cached.detect_batch(["a", "b", "a"]) == ["xx", "xx", "xx"]
+    assert inner.calls == [["a", "b"]]
+    assert cached.detect("b") == "xx"
+    assert len(inner.calls) == 1
+    cached.detect("c")  # evicts "a", the least recently used
+    cached.detect("a")
+    assert inner.calls[-1] == ["a"]
 
 
 def test_filter_duplicates() -> None:
@@ -47,4 +97,40 @@ def test_filter_duplicates() -> None:
 def test_truncate_tokens_limits_length() -> None:
     text = " ".join(["token"] * 10)
     truncated = truncate_tokens(text, max_tokens=5)
-    assert len(truncated.split()) == 5
+    assert text.startswith(truncated)
+    assert 0 < count_tokens(truncated) <= 5
+
+
+@pytest.mark.asyncio
+async def test_batch_normalizer_process_pool_matches_inline() -> None:
+    texts = [
+        "RT @whale: $BTC breaks out https://example.com 🚀",
+        "Биткоин обновил максимум, ETH следом",
+        "The SEC said it will decide on the ETF this week",
+        "   ",
+        "Solana fees spike as traders pile in",
+    ]
+    langs = [None, None, None, None, "en"]
+    normalizer = BatchNormalizer(workers=2, chunk_size=2)
+    try:
+        pooled = await normalizer.normalize(texts, 50, langs)
+    finally:
+        normalizer.shutdown()
+    assert pooled == normalize_texts(texts, 50, langs)
+    assert pooled[0].text.startswith("$BTC breaks out")
+    assert pooled[0].tickers == ["BTC"]
+    assert [result.lang for result in pooled[1:3]] == ["ru", "en"]
+    assert pooled[3].lang is None
+
+
+@pytest.mark.asyncio
+async def test_batch_normalizer_sends_single_chunks_to_the_pool() -> None:
+    texts = ["$ETH ETF approved", "Fed holds rates"]
+    normalizer = BatchNormalizer(workers=1, chunk_size=64)
+    try:
+        pooled = await normalizer.normalize(texts, 50)
+        assert normalizer._executor is not None
+    finally:
+        normalizer.shutdown()
+    assert pooled == normalize_texts(texts, 50)
+    assert await BatchNormalizer(workers=0).normalize(texts, 50) == pooled
@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langdetect")
+
+from src.ingest.base import merge_streams
+from src.ingest.reddit_source import RedditSource
+from src.ingest.telegram_source import FloodWaitError, TelegramSource
+from src.ingest.truth_social_source import MastodonRatelimitError, TruthSocialSource
+from src.ingest.twitter_source import TwitterSource, split_queries
+
+NOW = datetime.now(tz=timezone.utc)
+
+
+class BlockingSubreddit:
+    def __init__(self, name: str, reddit: "BlockingReddit") -> None:
+        self.name = name
+        self.reddit = reddit
+
+    def new(self, limit: int):
+        with self.reddit.lock:
+            self.reddit.active += 1
+            self.reddit.max_active = max(self.reddit.max_active, self.reddit.active)
+        time.sleep(0.2)  # synchronous HTTP in praw
+        with self.reddit.lock:
+            self.reddit.active -= 1
+        for age in (1, 2, 120):
+            yield SimpleNamespace(
+                id=f"{self.name}{age}",
+                name=f"t3_{self.name}{age}",
+                title="Bitcoin news",
+                selftext="",
+                url="https://example.com",
+                created_utc=(NOW - timedelta(minutes=age)).timestamp(),
+                subreddit=SimpleNamespace(display_name=self.name),
+                author=None,
+            )
+
+
+class BlockingReddit:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def subreddit(self, name: str) -> BlockingSubreddit:
+        return BlockingSubreddit(name, self)
+
+
+@pytest.mark.asyncio
+async def test_reddit_fetches_subreddits_concurrently_off_the_loop() -> None:
+    reddit = BlockingReddit()
+    source = RedditSource(reddit, ["a", "b", "c", "d"], fetch_concurrency=4)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    items = await source.fetch_since(NOW - timedelta(minutes=60))
+    task.cancel()
+
+    assert sorted(item.source_id for item in items) == [
+        f"t3_{name}{age}" for name in "abcd" for age in (1, 2)
+    ]
+    # Overlap rather than wall-clock time: the first normalization loads models.
+    assert reddit.max_active > 1
+    assert ticks >= 10
+
+
+class ListingReddit:
+    def __init__(self) -> None:
+        self.ages: dict[str, list[int]] = {"busy": [5], "quiet": []}
+
+    def subreddit(self, name: str):
+        def new(limit: int):
+            for age in self.ages[name]:
+                yield SimpleNamespace(
+                    id=f"{name}{age}",
+                    name=f"t3_{name}{age}",
+                    title="Bitcoin news",
+                    selftext="",
+                    url="https://example.com",
+                    created_utc=(NOW - timedelta(minutes=age)).timestamp(),
+                    subreddit=SimpleNamespace(display_name=name),
+                    author=None,
+                )
+
+        return SimpleNamespace(new=new)
+
+
+@pytest.mark.asyncio
+async def test_reddit_keeps_since_of_quiet_subreddits() -> None:
+    reddit = ListingReddit()
+    source = RedditSource(reddit, ["busy", "quiet"])
+    first = await source.fetch_since(NOW - timedelta(minutes=60))
+    assert [item.source_id for item in first] == ["t3_busy5"]
+
+    # The worker's next since is the busy subreddit's newest post.
+    reddit.ages["quiet"] = [30]
+    second = await source.fetch_since(first[0].published_at)
+    assert [item.source_id for item in second] == ["t3_quiet30"]
+
+
+class Flood(FloodWaitError):
+    def __init__(self, seconds: int) -> None:
+        Exception.__init__(self, f"wait {seconds}s")
+        self.seconds = seconds
+
+
+class FakeTelegram:
+    def __init__(self, channels: dict[str, int]) -> None:
+        self.latest = dict(channels)
+        self.calls: list[tuple[str, dict]] = []
+        self.flood_once = {"@flood"}
+        self.active = 0
+        self.max_active = 0
+
+    async def iter_messages(self, channel: str, **kwargs):
+        self.calls.append((channel, kwargs))
+        assert kwargs["reverse"] is True
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        start = kwargs.get("min_id", 0) + 1
+        for message_id in range(max(start, 1), self.latest[channel] + 1):
+            if channel in self.flood_once and message_id == 3:
+                self.flood_once.discard(channel)
+                raise Flood(0)
+            yield SimpleNamespace(
+                id=message_id,
+                message=f"{channel} update {message_id}",
+                date=NOW - timedelta(minutes=10 - message_id),
+                sender_id=None,
+            )
+
+
+@pytest.mark.asyncio
+async def test_telegram_streams_channels_concurrently_with_cursors(tmp_path) -> None:
+    channels = {f"@c{index}": 5 for index in range(8)}
+    channels["@flood"] = 5
+    client = FakeTelegram(channels)
+    cursor_path = tmp_path / "cursors.json"
+    source = TelegramSource(client, list(channels), fetch_concurrency=9, cursor_path=cursor_path)
+
+    first = [item.source_id async for item in source.stream_since(NOW - timedelta(minutes=7))]
+    assert client.max_active > 1
+    # Messages 1-3 are older than the cut-off; the flood wait is retried from the cursor.
+    assert sorted(first) == sorted(f"{channel}:{n}" for channel in channels for n in (4, 5))
+    assert source.cursors == {channel: 5 for channel in channels}
+
+    client.latest["@c0"] = 7
+    resumed = TelegramSource(client, list(channels), cursor_path=cursor_path)
+    second = await resumed.fetch_since(NOW - timedelta(minutes=5))
+    assert [item.source_id for item in second] == ["@c0:6", "@c0:7"]
+    assert client.calls[-1][1]["min_id"] == 5
+
+    # A since older than the cursors cover reads the earlier messages once.
+    backfill = await resumed.fetch_since(NOW - timedelta(days=1))
+    assert sorted(item.source_id for item in backfill) == sorted(
+        f"{channel}:{n}" for channel in channels for n in (1, 2, 3)
+    )
+    assert resumed.cursors == {channel: 7 if channel == "@c0" else 5 for channel in channels}
+    assert await resumed.fetch_since(NOW - timedelta(days=1)) == []
+
+
+@pytest.mark.asyncio
+async def test_telegram_cursor_waits_for_the_consumer(tmp_path) -> None:
+    client = FakeTelegram({"@news": 5})
+    cursor_path = tmp_path / "cursors.json"
+    source = TelegramSource(client, ["@news"], cursor_path=cursor_path)
+
+    stream = source.stream_since(NOW - timedelta(minutes=7))
+    first = await stream.__anext__()
+    await stream.aclose()
+    assert first.source_id == "@news:4"
+    # Message 5 was queued but never taken, so the next poll fetches it again.
+    assert source.cursors == {}
+
+    items = await source.fetch_since(NOW - timedelta(minutes=7))
+    assert [item.source_id for item in items] == ["@news:4", "@news:5"]
+    assert TelegramSource(client, ["@news"], cursor_path=cursor_path).cursors == {"@news": 5}
+
+
+class FakePushTelegram(FakeTelegram):
+    def __init__(self, channels: dict[str, int]) -> None:
+        super().__init__(channels)
+        self.flood_once = set()
+        self.handlers: list = []
+        self.connected = True
+
+    async def get_entity(self, channel: str):
+        return SimpleNamespace(id=1000 + sorted(self.latest).index(channel))
+
+    def add_event_handler(self, handler, event=None) -> None:
+        self.handlers.append(handler)
+
+    def remove_event_handler(self, handler, event=None) -> None:
+        self.handlers.remove(handler)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def emit(self, channel: str, message_id: int) -> None:
+        self.latest[channel] = max(self.latest[channel], message_id)
+        message = SimpleNamespace(
+            id=message_id, message=f"{channel} update {message_id}", date=NOW, sender_id=None
+        )
+        event = SimpleNamespace(chat_id=1000 + sorted(self.latest).index(channel), message=message)
+        for handler in list(self.handlers):
+            await handler(event)
+
+
+@pytest.mark.asyncio
+async def test_telegram_push_delivers_updates_and_gap_fills_after_reconnect() -> None:
+    client = FakePushTelegram({"@news": 2, "@alpha": 1})
+    source = TelegramSource(client, ["@news", "@alpha"], push_flush_seconds=0.01)
+    await source.fetch_since(NOW - timedelta(days=1))
+
+    delivered: list[list[str]] = []
+    gaps: list[str] = []
+
+    async def on_items(items) -> None:
+        delivered.append([item.source_id for item in items])
+
+    async def on_reconnect() -> None:
+        gaps.extend(item.source_id for item in await source.fetch_since(NOW))
+
+    await source.subscribe(on_items, on_reconnect=on_reconnect, check_seconds=0.01)
+    assert source.pushing
+    await client.emit("@news", 3)
+    await client.emit("@alpha", 2)
+    await client.emit("@news", 3)  # duplicate update
+    await asyncio.sleep(0.05)
+    # One burst arrives as one page.
+    assert delivered == [["@news:3", "@alpha:2"]]
+
+    client.connected = False
+    await asyncio.sleep(0.03)
+    client.latest["@news"] = 5  # posted while disconnected
+    client.connected = True
+    await client.emit("@news", 6)
+    await asyncio.sleep(0.2)
+    assert delivered[-1] == ["@news:6"]
+    # The poll after reconnecting picks up only the missed posts.
+    assert gaps == ["@news:4", "@news:5"]
+    assert source.cursors == {"@news": 6, "@alpha": 2}
+
+    await source.unsubscribe()
+    assert client.handlers == []
+
+
+@pytest.mark.asyncio
+async def test_telegram_failed_push_is_left_to_the_gap_fill_poll() -> None:
+    client = FakePushTelegram({"@news": 2})
+    source = TelegramSource(client, ["@news"], push_flush_seconds=0.01)
+    await source.fetch_since(NOW - timedelta(days=1))
+
+    async def on_items(items) -> None:
+        raise RuntimeError("queue closed")
+
+    await source.subscribe(on_items)
+    await client.emit("@news", 3)
+    await asyncio.sleep(0.05)
+    gap = await source.fetch_since(NOW)
+    assert [item.source_id for item in gap] == ["@news:3"]
+
+
+class MissingChannelTelegram(FakePushTelegram):
+    async def get_entity(self, channel: str):
+        if channel == "@gone":
+            raise ValueError("No user has \"gone\" as username")
+        return await super().get_entity(channel)
+
+
+@pytest.mark.asyncio
+async def test_telegram_subscribe_skips_unresolvable_channels() -> None:
+    client = MissingChannelTelegram({"@news": 2, "@gone": 1})
+    source = TelegramSource(client, ["@news", "@gone"], push_flush_seconds=0.01)
+    delivered: list[str] = []
+
+    async def on_items(items) -> None:
+        delivered.extend(item.source_id for item in items)
+
+    await source.subscribe(on_items)
+    assert source.pushing
+    assert source.unpushed_channels == ["@gone"]
+    await client.emit("@news", 3)
+    await asyncio.sleep(0.05)
+    assert delivered == ["@news:3"]
+    await source.unsubscribe()
+
+    only_missing = TelegramSource(MissingChannelTelegram({"@gone": 1}), ["@gone"])
+    await only_missing.subscribe(on_items)
+    assert not only_missing.pushing
+
+
+@pytest.mark.asyncio
+async def test_telegram_unsubscribe_delivers_buffered_updates() -> None:
+    client = FakePushTelegram({"@news": 2})
+    source = TelegramSource(client, ["@news"], push_flush_seconds=10)
+    delivered: list[str] = []
+
+    async def on_items(items) -> None:
+        delivered.extend(item.source_id for item in items)
+
+    await source.subscribe(on_items)
+    await client.emit("@news", 3)
+    await source.unsubscribe()
+    assert delivered == ["@news:3"]
+
+
+def test_split_queries_respects_length_limit() -> None:
+    queries = ["bitcoin lang:en", "ethereum etf", "sec crypto", "fed rate"]
+    groups = split_queries(queries, max_length=40)
+    assert groups == ["(bitcoin lang:en) OR (ethereum etf)", "(sec crypto) OR (fed rate)"]
+    assert all(len(group) <= 40 for group in groups)
+
+
+class RateLimited(Exception):
+    def __init__(self) -> None:
+        super().__init__("429")
+        self.response = SimpleNamespace(status_code=429, headers={"x-rate-limit-reset": "0"})
+
+
+class FakeTwitter:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.limited = True
+
+    def search_recent_tweets(self, **params):
+        self.calls.append(dict(params))
+        if self.limited:
+            self.limited = False
+            raise RateLimited()
+        page = int(params.get("next_token", "0"))
+        tweets = [
+            SimpleNamespace(id=1000 - page * 100 - n, text=f"btc {page} {n}", lang="en", created_at=NOW)
+            for n in range(100 if page < 2 else 30)
+        ]
+        meta = {"newest_id": str(tweets[0].id)}
+        if page < 2:
+            meta["next_token"] = str(page + 1)
+        return SimpleNamespace(data=tweets, meta=meta)
+
+
+@pytest.mark.asyncio
+async def test_twitter_paginates_and_records_since_id(monkeypatch) -> None:
+    async def no_sleep(delay: float) -> None:
+        return None
+
+    monkeypatch.setattr("src.ingest.twitter_source.asyncio.sleep", no_sleep)
+    client = FakeTwitter()
+    source = TwitterSource(client, ["bitcoin"], max_pages=5)
+    items = await source.fetch_since(NOW - timedelta(hours=1))
+    assert len(items) == 230
+    assert "start_time" in client.calls[0] and "since_id" not in client.calls[0]
+
+    await source.fetch_since(NOW - timedelta(hours=1))
+    assert client.calls[-3]["since_id"] == "1000"
+    assert "start_time" not in client.calls[-3]
+
+
+@pytest.mark.asyncio
+async def test_twitter_cursor_moves_only_after_stream_is_consumed() -> None:
+    client = FakeTwitter()
+    client.limited = False
+    source = TwitterSource(client, ["bitcoin"])
+    stream = source.stream_since(NOW - timedelta(hours=1))
+    taken = [await stream.__anext__()]
+    await asyncio.sleep(0.05)  # the search has buffered all its pages by now
+    assert source._since_ids == {}
+
+    taken.extend([item async for item in stream])
+    assert len(taken) == 230
+    assert source._since_ids == {"(bitcoin)": "1000"}
+
+
+@pytest.mark.asyncio
+async def test_twitter_resumes_after_page_limit() -> None:
+    client = FakeTwitter()
+    client.limited = False
+    source = TwitterSource(client, ["bitcoin"], max_pages=2)
+    assert len(await source.fetch_since(NOW - timedelta(hours=1))) == 200
+
+    # The rest of the burst comes on the next poll, then the cursor moves.
+    assert len(await source.fetch_since(NOW)) == 30
+    assert client.calls[-1]["next_token"] == "2"
+    assert "start_time" in client.calls[-1]
+    await source.fetch_since(NOW)
+    assert client.calls[-1].get("since_id") == "1000"
+
+
+class FakeMastodon:
+    ratelimit_reset = 0
+
+    def __init__(self, statuses: list[dict]) -> None:
+        self.statuses = statuses
+        self.calls: list[tuple] = []
+        self.limited = True
+
+    def timeline_public(self, limit: int, max_id=None, since_id=None):
+        self.calls.append((max_id, since_id))
+        if self.limited:
+            self.limited = False
+            raise MastodonRatelimitError("slow down")
+        page = [
+            status
+            for status in self.statuses
+            if (max_id is None or int(status["id"]) < int(max_id))
+            and (since_id is None or int(status["id"]) > int(since_id))
+        ]
+        return page[:limit]
+
+
+@pytest.mark.asyncio
+async def test_truth_social_pages_back_to_since(monkeypatch) -> None:
+    async def no_sleep(delay: float) -> None:
+        return None
+
+    monkeypatch.setattr("src.ingest.truth_social_source.asyncio.sleep", no_sleep)
+    statuses = [
+        {
+            "id": str(100 - n),
+            "content": f"post {n}",
+            "created_at": (NOW - timedelta(minutes=n)).isoformat(),
+            "language": "en",
+            "account": {"acct": "someone"},
+        }
+        for n in range(100)
+    ]
+    client = FakeMastodon(statuses)
+    source = TruthSocialSource(client, page_size=10)
+    items = await source.fetch_since(NOW - timedelta(minutes=34, seconds=30))
+    assert [item.source_id for item in items] == [str(100 - n) for n in range(35)]
+    assert [call[0] for call in client.calls[1:]] == [None, "91", "81", "71"]
+
+    client.statuses.insert(0, {**statuses[0], "id": "101"})
+    items = await source.fetch_since(NOW)
+    assert [item.source_id for item in items] == ["101"]
+    assert client.calls[-1] == (None, "100")
+
+
+@pytest.mark.asyncio
+async def test_truth_social_resumes_after_page_limit() -> None:
+    statuses = [
+        {
+            "id": str(100 - n),
+            "content": f"post {n}",
+            "created_at": (NOW - timedelta(minutes=n)).isoformat(),
+            "language": "en",
+            "account": {"acct": "someone"},
+        }
+        for n in range(25)
+    ]
+    client = FakeMastodon(statuses)
+    client.limited = False
+    source = TruthSocialSource(client, page_size=10, max_pages=2)
+    first = await source.fetch_since(NOW - timedelta(hours=1))
+    assert [item.source_id for item in first] == [str(100 - n) for n in range(20)]
+
+    rest = await source.fetch_since(NOW)
+    assert [item.source_id for item in rest] == [str(100 - n) for n in range(20, 25)]
+    assert client.calls[-1] == ("81", None)
+    await source.fetch_since(NOW)
+    assert client.calls[-1] == (None, "100")
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_interleaves_and_isolates_failures() -> None:
+    async def slow():
+        await asyncio.sleep(0.05)
+        yield "slow"
+
+    async def fast():
+        yield "fast"
+
+    async def broken():
+        yield "partial"
+        raise RuntimeError("boom")
+
+    errors: list[int] = []
+    merged = [
+        item
+        async for item in merge_streams([slow(), fast(), broken()], on_error=lambda i, exc: errors.append(i))
+    ]
+    assert merged[-1] == "slow"
+    assert sorted(merged) == ["fast", "partial", "slow"]
+    assert errors == [2]
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_closes_with_a_full_queue() -> None:
+    async def endless():
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+    merged = merge_streams([endless(), endless()])
+    assert await merged.__anext__() == 0
+    await asyncio.sleep(0.05)  # let the drains fill the queue
+    await asyncio.wait_for(merged.aclose(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_telegram_stream_closes_with_a_full_queue() -> None:
+    client = FakeTelegram({"@a": 1100, "@b": 1100})
+    source = TelegramSource(client, ["@a", "@b"])
+
+    async def normalize_page(raws):
+        return [raw["message"].id for raw in raws]
+
+    source.normalize_page = normalize_page  # type: ignore[method-assign]
+    stream = source.stream_since(NOW - timedelta(days=30))
+    await stream.__anext__()
+    await asyncio.sleep(0.2)  # let the channels fill the queue
+    await asyncio.wait_for(stream.aclose(), timeout=1)
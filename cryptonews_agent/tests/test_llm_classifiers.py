@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.config import get_settings
+from src.llm.classifiers import ClassifierStats, classify_batch, pack_texts
+from src.utils.tokens import count_tokens
+
+RESULT = {"topics": ["crypto"], "sentiment": 1, "stance": "bullish", "impact": 1}
+
+
+class BatchClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        prompt = messages[-1]["content"]
+        self.calls.append(prompt)
+        if "Post 0:" in prompt:
+            # Entry 1 is invalid and must be retried on its own.
+            return json.dumps([{**RESULT, "index": 0}, {"index": 1, "sentiment": 5}, {**RESULT, "index": 2}])
+        return json.dumps({**RESULT, "stance": "neutral"})
+
+
+def test_pack_texts_respects_item_and_token_limits() -> None:
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 400]
+    assert pack_texts(texts, max_items=2, token_budget=1000) == [[0, 1], [2, 3]]
+    assert pack_texts(texts, max_items=8, token_budget=50) == [[0, 1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_classify_batch_falls_back_for_invalid_entries() -> None:
+    client = BatchClient()
+    stats = ClassifierStats()
+    results = await classify_batch(client, ["one", "two", "three"], stats)
+    assert len(client.calls) == 2
+    assert [result.stance for result in results] == ["bullish", "neutral", "bullish"]
+    assert (stats.requests, stats.batch_fallbacks) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_classify_batch_truncates_posts_to_their_share(monkeypatch) -> None:
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "600")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = BatchClient()
+    await classify_batch(client, ["Bitcoin rallies again " * 500, "ETF flows " * 500, "short"])
+    assert count_tokens(client.calls[0]) <= 600
+    assert "short" in client.calls[0]
+    get_settings.cache_clear()  # type: ignore[attr-defined]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.config import get_settings
+from src.llm.client import LMStudioClient
+from src.llm.pool import EndpointPool, parse_endpoints
+from src.llm.schema import ClassificationResult
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+class Delta:
+    def __init__(self, content: str) -> None:
+        self.delta = type("Delta", (), {"content": content})()
+
+
+class Chunk:
+    def __init__(self, content: str) -> None:
+        self.choices = [Delta(content)]
+
+
+class FakeStream:
+    def __init__(self, pieces: list[str]) -> None:
+        self._pieces = pieces
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Chunk:
+        if self.consumed >= len(self._pieces):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return Chunk(self._pieces[self.consumed - 1])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeCompletions:
+    def __init__(self, pieces: list[str], reject_schema: bool = False) -> None:
+        self.pieces = pieces
+        self.reject_schema = reject_schema
+        self.requests: list[dict] = []
+        self.stream: FakeStream | None = None
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if self.reject_schema and "response_format" in kwargs:
+            raise BadRequest("'response_format' is not supported")
+        self.stream = FakeStream(self.pieces)
+        return self.stream
+
+
+def _client(completions: FakeCompletions) -> LMStudioClient:
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = LMStudioClient()
+    fake = type("FakeOpenAI", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    client._chat_pool = EndpointPool(
+        "chat", parse_endpoints("http://a/v1"), "key", client_factory=lambda _: fake
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_achat_stops_streaming_after_complete_json() -> None:
+    completions = FakeCompletions(['```json\n{"sentiment": 1, ', '"stance": "bullish"}', "\n```", " more"])
+    client = _client(completions)
+
+    content = await client.achat(
+        [{"role": "user", "content": "classify"}],
+        response_format=ClassificationResult.response_format(),
+        stop_at_json=True,
+    )
+
+    assert content == '{"sentiment": 1, "stance": "bullish"}'
+    assert completions.stream is not None
+    assert completions.stream.consumed == 2 and completions.stream.closed
+    assert completions.requests[0]["response_format"]["type"] == "json_schema"
+
+
+@pytest.mark.asyncio
+async def test_achat_drops_response_format_when_server_rejects_it() -> None:
+    completions = FakeCompletions(['{"ok": true}'], reject_schema=True)
+    client = _client(completions)
+
+    for _ in range(2):
+        content = await client.achat(
+            [{"role": "user", "content": "classify"}],
+            response_format=ClassificationResult.response_format(),
+            stop_at_json=True,
+        )
+        assert content == '{"ok": true}'
+    assert ["response_format" in request for request in completions.requests] == [True, False, False]
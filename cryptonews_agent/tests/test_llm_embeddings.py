@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.llm.embeddings import SentenceTransformerBackend
+
+
+class FakeSentenceTransformer:
+    loads = 0
+
+    def __init__(self, model_name: str, **kwargs) -> None:
+        FakeSentenceTransformer.loads += 1
+        self.kwargs = kwargs
+        self.threads: set[str] = set()
+
+    def encode(self, texts, batch_size: int, convert_to_numpy: bool, show_progress_bar: bool):
+        self.threads.add(threading.current_thread().name)
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+@pytest.mark.asyncio
+async def test_sentence_transformer_backend_encodes_off_loop(monkeypatch) -> None:
+    monkeypatch.setitem(
+        sys.modules,
+        "sentence_transformers",
+        SimpleNamespace(SentenceTransformer=FakeSentenceTransformer),
+    )
+    FakeSentenceTransformer.loads = 0
+    backend = SentenceTransformerBackend(
+        "local-model", onnx=True, onnx_file="onnx/model_qint8_avx512.onnx", threads=2, batch_size=2
+    )
+
+    vectors = await backend.embed(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0], [4.0, 1.0], [5.0, 1.0]]
+    assert FakeSentenceTransformer.loads == 1
+    model = backend._model
+    assert model.kwargs["backend"] == "onnx"
+    assert model.kwargs["model_kwargs"] == {"file_name": "onnx/model_qint8_avx512.onnx"}
+    assert all(name.startswith("embed") for name in model.threads)
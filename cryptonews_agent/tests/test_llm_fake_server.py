@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("openai")
+
+from src.config import get_settings
+from src.llm.fake_server import FakeLLMServer, FakeServerConfig, hash_embedding
+
+
+@pytest.mark.asyncio
+async def test_client_stack_against_fake_server(monkeypatch) -> None:
+    config = FakeServerConfig(latency_mean=0.0, tokens_per_second=5000, seed=1)
+    async with FakeLLMServer(config) as server:
+        monkeypatch.setenv("LMSTUDIO_BASE_URL", server.base_url)
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        from src.llm.classifiers import classify_batch, classify_text
+        from src.llm.client import LMStudioClient
+
+        client = LMStudioClient()
+        await client.warmup()
+        single = await classify_text(client, "Bitcoin ETF approved")
+        batch = await classify_batch(client, ["one", "two", "three"])
+        embeddings = await client.get_embeddings(["same", "same", "other"])
+
+    assert single.topics == ["crypto"]
+    assert len(batch) == 3 and all(result is not None for result in batch)
+    assert embeddings[0] == embeddings[1] == hash_embedding("same", 768)
+    assert embeddings[0] != embeddings[2]
+    assert server.stats.streams >= 1
+    assert server.stats.embedding_requests == 1
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_fake_server_injects_errors() -> None:
+    config = FakeServerConfig(latency_mean=0.0, error_rate=1.0, error_status=429, seed=1)
+    async with FakeLLMServer(config) as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as http:
+            response = await http.post("/chat/completions", json={"messages": []})
+            models = await http.get("/models")
+    assert response.status_code == 429
+    assert models.status_code == 200
+    assert server.stats.injected_errors == 1
+    assert server.stats.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_hung_request_frees_its_slot() -> None:
+    config = FakeServerConfig(latency_mean=0.0, hang_rate=1.0, slots=1, seed=1)
+    async with FakeLLMServer(config) as server:
+        async with httpx.AsyncClient(base_url=server.base_url, timeout=0.2) as http:
+            with pytest.raises(httpx.ReadTimeout):
+                await http.post("/chat/completions", json={"messages": []})
+            config.hang_rate = 0.0
+            response = await http.post("/chat/completions", json={"messages": []})
+    assert response.status_code == 200
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.llm.limiter import AdaptiveLimiter, is_overload_error
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+async def _call(limiter: AdaptiveLimiter, delay: float, error: Exception | None = None) -> None:
+    async with limiter.slot():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+
+
+@pytest.mark.asyncio
+async def test_limiter_grows_while_saturated_and_fast() -> None:
+    limiter = AdaptiveLimiter("chat", initial=2, min_limit=1, max_limit=8, target_latency=1.0)
+    await asyncio.gather(*(_call(limiter, 0.001) for _ in range(60)))
+    assert limiter.limit > 2
+    stats = limiter.stats()
+    assert stats.in_flight == 0
+    assert stats.p50 is not None and stats.p95 is not None
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_on_overload() -> None:
+    limiter = AdaptiveLimiter("chat", initial=8, min_limit=1, max_limit=8, target_latency=1.0)
+    with pytest.raises(ServerError):
+        await _call(limiter, 0, ServerError())
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_when_a_caller_gives_up() -> None:
+    limiter = AdaptiveLimiter("chat", initial=8, min_limit=1, max_limit=8, target_latency=1.0)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(_call(limiter, 1.0), 0.01)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_ignores_client_errors() -> None:
+    limiter = AdaptiveLimiter("chat", initial=4, min_limit=1, max_limit=8, target_latency=1.0)
+    with pytest.raises(ValueError):
+        await _call(limiter, 0, ValueError("bad schema"))
+    assert limiter.limit == 4
+    assert is_overload_error(TimeoutError())
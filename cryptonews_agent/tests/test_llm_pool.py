@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.llm.pool import EndpointConfig, EndpointPool, parse_endpoints
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class FakeModels:
+    async def list(self) -> list:
+        return []
+
+
+class FakeClient:
+    def __init__(self, config: EndpointConfig) -> None:
+        self.url = config.url
+        self.models = FakeModels()
+
+
+def test_parse_endpoints_reads_weights_and_limits() -> None:
+    endpoints = parse_endpoints(
+        "http://gpu1:1234/v1;weight=2;max_concurrency=6, http://gpu2:1234/v1"
+    )
+    assert [(e.url, e.weight, e.max_concurrency) for e in endpoints] == [
+        ("http://gpu1:1234/v1", 2.0, 6),
+        ("http://gpu2:1234/v1", 1.0, 8),
+    ]
+    with pytest.raises(ValueError):
+        parse_endpoints("gpu1:1234")
+
+
+@pytest.mark.asyncio
+async def test_pool_routes_by_weighted_outstanding_requests() -> None:
+    pool = EndpointPool(
+        "chat",
+        parse_endpoints("http://a/v1;weight=2,http://b/v1"),
+        "key",
+        client_factory=FakeClient,
+    )
+    used: list[str] = []
+    release = asyncio.Event()
+
+    async def _request() -> None:
+        async with pool.acquire() as client:
+            used.append(client.url)
+            await release.wait()
+
+    tasks = [asyncio.create_task(_request()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert sorted(used) == ["http://a/v1", "http://a/v1", "http://b/v1"]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert [stats.requests for stats in pool.stats()] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_pool_ejects_failing_endpoint_and_reinstates_after_health_check() -> None:
+    pool = EndpointPool(
+        "chat",
+        parse_endpoints("http://a/v1,http://b/v1"),
+        "key",
+        eject_after=2,
+        client_factory=FakeClient,
+    )
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            async with pool.acquire() as client:
+                assert client.url == "http://a/v1"
+                raise ServerError()
+
+    healthy = {stats.url: stats.healthy for stats in pool.stats()}
+    assert healthy == {"http://a/v1": False, "http://b/v1": True}
+    async with pool.acquire() as client:
+        assert client.url == "http://b/v1"
+
+    await pool.check_health()
+    assert all(stats.healthy for stats in pool.stats())
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.llm.relevance import LinearRelevanceModel, RelevanceFilter, evaluate
+
+
+def test_keywords_and_cashtags_pass() -> None:
+    relevance = RelevanceFilter()
+    assert relevance.decide("$SOL to the moon").relevant
+    assert relevance.decide("Fed holds rates steady").relevant
+    assert relevance.decide("ФРС сохранила ставку").relevant
+    assert not relevance.decide("my cat learned to open the fridge").relevant
+    # Short keywords only match whole words.
+    assert not relevance.decide("fedora section seconds").relevant
+
+
+def test_model_rescues_posts_without_keywords() -> None:
+    model = LinearRelevanceModel(weights=[4.0, -4.0], bias=0.0)
+    relevance = RelevanceFilter(model=model, model_threshold=0.5)
+    assert relevance.decide("number go up", [1.0, 0.0]).relevant
+    assert not relevance.decide("lunch pics", [0.0, 1.0]).relevant
+    assert relevance.decide("no vector yet").relevant
+
+
+def test_fit_separates_classes_and_report_counts_false_negatives() -> None:
+    embeddings = [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9]]
+    labels = [True, True, False, False]
+    model = LinearRelevanceModel.fit(embeddings, labels)
+    scores = model.predict(embeddings)
+    assert min(scores[:2]) > 0.5 > max(scores[2:])
+
+    samples = [
+        ("BTC breaks 100k", True),
+        ("funny dog video", False),
+        ("this changes everything for holders", True),
+    ]
+    report = evaluate(RelevanceFilter(), samples)
+    assert report.skipped == 2
+    assert report.false_negatives == 1
+    assert report.false_negative_rate == pytest.approx(0.5)
+    assert report.examples == ["this changes everything for holders"]
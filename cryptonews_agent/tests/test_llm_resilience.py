@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.config import get_settings
+from src.llm.client import LMStudioClient
+from src.llm.pool import EndpointPool, parse_endpoints
+from src.llm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    TokenBucket,
+    is_transient_error,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FailingCompletions:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        raise StatusError(self.status_code)
+
+
+class FakeOpenAI:
+    def __init__(self, completions: FailingCompletions) -> None:
+        self.chat = type("Chat", (), {"completions": completions})()
+
+
+def test_is_transient_error_classification() -> None:
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(StatusError(503))
+    assert is_transient_error(StatusError(429))
+    assert not is_transient_error(StatusError(400))
+    assert not is_transient_error(ValueError("schema mismatch"))
+    assert not is_transient_error(CircuitOpenError("open"))
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("chat", failure_threshold=2, recovery_seconds=10)
+
+    breaker.record_failure(StatusError(400))
+    breaker.record_failure(StatusError(503))
+    assert breaker.state is CircuitState.closed
+    breaker.record_failure(StatusError(503))
+    assert breaker.state is CircuitState.open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 10
+    breaker.before_call()
+    assert breaker.state is CircuitState.half_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state is CircuitState.closed
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_requests() -> None:
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_retry_client_errors_and_fails_fast_when_open(monkeypatch) -> None:
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = LMStudioClient()
+
+    completions = FailingCompletions(400)
+    client._chat_pool = EndpointPool(
+        "chat", parse_endpoints("http://a/v1"), "key", client_factory=lambda _: FakeOpenAI(completions)
+    )
+    with pytest.raises(StatusError):
+        await client.achat([{"role": "user", "content": "hi"}])
+    assert completions.calls == 1
+
+    # The 503 opens the circuit, so the retry fails fast instead of calling again.
+    completions.status_code = 503
+    with pytest.raises(CircuitOpenError):
+        await asyncio.wait_for(client.achat([{"role": "user", "content": "hi"}]), timeout=5)
+    assert completions.calls == 2
+    with pytest.raises(CircuitOpenError):
+        await client.achat([{"role": "user", "content": "hi"}])
+    assert completions.calls == 2
+
+
+class HangingCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_frees_its_slot(monkeypatch) -> None:
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = LMStudioClient()
+    completions = HangingCompletions()
+    client._chat_pool = EndpointPool(
+        "chat", parse_endpoints("http://a/v1"), "key", client_factory=lambda _: FakeOpenAI(completions)
+    )
+    breaker = client._chat_breaker
+    breaker.record_failure(StatusError(503))
+    breaker._opened_at -= breaker._recovery
+    assert breaker.state is CircuitState.half_open
+
+    for expected_calls in (1, 2):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.achat([{"role": "user", "content": "hi"}]), timeout=0.05)
+        assert completions.calls == expected_calls
+        assert breaker.state is CircuitState.half_open
@@ -26,3 +26,27 @@ def test_classification_result_parse_json_valid() -> None:
 def test_classification_result_parse_json_invalid() -> None:
     with pytest.raises(ValueError):
         ClassificationResult.parse_json("not json")
+
+
+def test_classification_result_parse_json_tolerates_fences_and_prose() -> None:
+    response = 'Here you go:\n```json\n{"sentiment": -1, "stance": "bearish", "impact": 1}\n```'
+    result = ClassificationResult.parse_json(response)
+    assert result.stance == "bearish"
+
+
+def test_extract_json_ignores_brackets_inside_strings() -> None:
+    from src.llm.schema import JsonScanner, extract_json
+
+    assert extract_json('prefix {"text": "a } b", "list": [1, {"x": 2}]} tail') == (
+        '{"text": "a } b", "list": [1, {"x": 2}]}'
+    )
+    scanner = JsonScanner()
+    assert scanner.feed('{"results": [{"index"') is None
+    assert scanner.feed(': 0}]} extra') == '{"results": [{"index": 0}]}'
+
+
+def test_response_format_leaves_tickers_and_entities_to_extraction() -> None:
+    schema = ClassificationResult.response_format()["json_schema"]["schema"]
+    assert set(schema["properties"]) == {"topics", "sentiment", "stance", "impact"}
+    batch = ClassificationResult.batch_response_format()["json_schema"]["schema"]
+    assert "tickers" not in batch["properties"]["results"]["items"]["properties"]
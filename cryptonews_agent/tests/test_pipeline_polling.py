@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from src.config import get_settings
+from src.db.models import SourceEnum
+from src.ingest.base import BaseSource, NormalizedItem
+from src.pipeline.polling import AdaptiveIntervals
+from src.pipeline.worker import PipelineWorker
+
+
+def test_intervals_back_off_when_empty_and_speed_up_when_full() -> None:
+    intervals = AdaptiveIntervals(
+        120, min_seconds=30, max_seconds=600, target_items=20, full_items=100
+    )
+    assert intervals.seconds_until_due("quiet", now=0) == 0
+
+    now = 0.0
+    for _ in range(10):
+        intervals.begin("quiet")
+        assert intervals.seconds_until_due("quiet", now=now) == math.inf
+        now += intervals.interval("quiet")
+        intervals.observe("quiet", 0, now=now)
+    assert intervals.interval("quiet") == 600
+
+    assert intervals.observe("busy", 100, now=0) == 60
+    assert intervals.observe("busy", 150, now=60) == 30
+    assert intervals.seconds_until_due("busy", now=70) == pytest.approx(20)
+
+
+def test_intervals_follow_arrival_rate_toward_target() -> None:
+    intervals = AdaptiveIntervals(120, min_seconds=10, max_seconds=900, target_items=20)
+    now = 0.0
+    for _ in range(20):
+        # Steady one item every 3 seconds: 20 items per fetch needs 60s.
+        now += intervals.interval("steady")
+        intervals.observe("steady", round(intervals.interval("steady") / 3), now=now)
+    assert intervals.interval("steady") == pytest.approx(60, rel=0.1)
+    snapshot = intervals.snapshot()["steady"]
+    assert snapshot["items_per_minute"] == pytest.approx(20, rel=0.1)
+
+
+class ChannelSource(BaseSource):
+    def __init__(self) -> None:
+        super().__init__("telegram", SourceEnum.telegram)
+        self.polled: list[list[str] | None] = []
+
+    @property
+    def channels(self) -> list[str]:
+        return ["@Busy", "@quiet"]
+
+    async def fetch_since(self, since: datetime) -> list[NormalizedItem]:
+        return [item async for item in self.stream_since(since)]
+
+    async def stream_since(self, since: datetime, channels=None):
+        self.polled.append(list(channels) if channels is not None else None)
+        if "@Busy" in (channels or self.channels):
+            for index in range(100):
+                yield NormalizedItem(
+                    source=self.source_enum,
+                    source_id=f"busy:{index}:{len(self.polled)}",
+                    text=f"Bitcoin tick {index} poll {len(self.polled)}",
+                    raw={"channel": "@Busy"},
+                    published_at=since + timedelta(seconds=index + 1),
+                )
+
+    async def normalize(self, raw):
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_worker_polls_channels_on_their_own_intervals(monkeypatch) -> None:
+    monkeypatch.setenv("ADAPTIVE_POLLING", "true")
+    monkeypatch.setenv("FETCH_INTERVAL_SECONDS", "120")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    class NoLLM:
+        model = embed_model = "none"
+
+    source = ChannelSource()
+    worker = PipelineWorker([source], NoLLM(), batch_size=50, concurrency=1)
+    assert await worker.poll_if_due(source.name) == math.inf
+    job = await worker._queue.get()
+    assert job.channels == ("@Busy", "@quiet")
+    await worker._process_job(job)
+
+    intervals = worker.poll_intervals
+    assert intervals["telegram:@busy"]["interval"] == 60
+    assert intervals["telegram:@busy"]["last_items"] == 100
+    assert intervals["telegram:@quiet"]["interval"] == 180
+    assert await worker.poll_if_due(source.name) == pytest.approx(60, abs=1)
+    assert source.polled == [["@Busy", "@quiet"]]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from src.db.models import SourceEnum
+from src.ingest.base import NormalizedItem
+from src.pipeline.priority import STOP_SOURCE, EnrichBatch, FairShareQueue, Job
+
+
+def _batch(source: str, size: int, weight: float = 1.0) -> EnrichBatch:
+    items = [
+        NormalizedItem(
+            source=SourceEnum(source),
+            source_id=f"{source}-{index}",
+            text="text",
+            raw={},
+            published_at=datetime.now(tz=timezone.utc),
+        )
+        for index in range(size)
+    ]
+    return EnrichBatch(source_name=source, items=items, weight=weight)
+
+
+def test_fair_share_queue_serves_jobs_first_and_stops_last() -> None:
+    queue = FairShareQueue()
+    now = datetime.now(tz=timezone.utc)
+    queue.put_nowait(Job(source_name=STOP_SOURCE, since=now))
+    queue.put_nowait(_batch("reddit", 2))
+    queue.put_nowait(Job(source_name="telegram", since=now))
+
+    assert queue.pending_items == 2
+    assert isinstance(queue.get_nowait(), Job)
+    assert isinstance(queue.get_nowait(), EnrichBatch)
+    assert queue.pending_items == 0
+    assert queue.get_nowait().source_name == STOP_SOURCE
+
+
+def test_fair_share_queue_weights_sources() -> None:
+    queue = FairShareQueue({"telegram": 3.0, "reddit": 1.0})
+    for _ in range(4):
+        queue.put_nowait(_batch("reddit", 10))
+    for _ in range(4):
+        queue.put_nowait(_batch("telegram", 10))
+
+    order = [queue.get_nowait().source_name for _ in range(4)]
+    assert order.count("telegram") == 3
+
+
+def test_fair_share_queue_orders_by_channel_weight_within_source() -> None:
+    queue = FairShareQueue()
+    queue.put_nowait(_batch("telegram", 1, weight=0.5))
+    queue.put_nowait(_batch("telegram", 1, weight=2.0))
+
+    assert queue.get_nowait().weight == 2.0
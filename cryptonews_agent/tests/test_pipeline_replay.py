@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("langdetect")
+
+from sqlalchemy import select
+
+from src.config import get_settings
+from src.db import base
+from src.db.base import Base, get_engine, get_session
+from src.db.models import Item, SourceEnum
+from src.ingest.replay_source import DEFAULT_MAPPINGS, ReplaySource
+from src.pipeline.replay import replay_source
+from src.pipeline.worker import PipelineWorker
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class ReplayLMClient:
+    model = "replay-llm"
+    embed_model = "replay-embed"
+
+    async def warmup(self) -> None:
+        return None
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        return json.dumps({"topics": ["crypto"], "sentiment": 0, "stance": "neutral", "impact": 1})
+
+    async def get_embeddings(self, texts):
+        return [[0.5, 0.5] for _ in texts]
+
+
+def _write_reddit_dump(path) -> None:
+    records = [
+        {
+            "id": f"p{index}",
+            "title": f"Bitcoin post {index}",
+            "selftext": "",
+            "author": "satoshi",
+            "created_utc": int(SINCE.timestamp()) + 60 * index,
+        }
+        for index in range(1, 8)
+    ]
+    records.append({"id": "old", "title": "Too old", "created_utc": int(SINCE.timestamp()) - 60})
+    records.append({"id": "empty", "created_utc": int(SINCE.timestamp()) + 60})
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+        handle.write("{not json\n")
+
+
+@pytest.mark.asyncio
+async def test_replay_source_maps_and_filters_records(tmp_path) -> None:
+    archive = tmp_path / "RS_2024-01.jsonl.gz"
+    _write_reddit_dump(archive)
+    mapping = DEFAULT_MAPPINGS[SourceEnum.reddit].with_overrides({"author": "missing|author"})
+    source = ReplaySource(tmp_path, SourceEnum.reddit, mapping, page_size=3, limit=5)
+
+    items = await source.fetch_since(SINCE)
+
+    assert source.files == [archive]
+    assert [item.source_id for item in items] == [f"t3_p{index}" for index in range(1, 6)]
+    assert items[0].published_at == datetime(2024, 1, 1, 0, 1, tzinfo=timezone.utc)
+    assert items[0].author == "satoshi"
+    assert items[0].tickers == ["BTC"]
+    assert source.counters.items == 5
+    with pytest.raises(ValueError):
+        mapping.with_overrides({"body": "text"})
+
+
+@pytest.mark.asyncio
+async def test_replay_pushes_archive_through_enrichment(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    archive = tmp_path / "dump.jsonl.gz"
+    _write_reddit_dump(archive)
+    source = ReplaySource(archive, SourceEnum.reddit, page_size=4)
+    worker = PipelineWorker([source], ReplayLMClient(), batch_size=3, concurrency=1)
+    progress: list[int] = []
+
+    stats = await replay_source(
+        worker,
+        source,
+        SINCE,
+        batch_size=3,
+        concurrency=1,
+        on_batch=lambda s: progress.append(s.processed),
+    )
+
+    assert stats.processed == 7
+    assert progress[-1] == 7 and stats.batches == 3
+    assert source.counters.records == 9
+    assert source.counters.skipped == 2
+    async with get_session() as session:
+        rows = (await session.execute(select(Item))).scalars().all()
+    assert len(rows) == 7
+    assert {row.classified_with for row in rows} == {"replay-llm"}
+
+
+@pytest.mark.asyncio
+async def test_replay_bounds_batches_in_flight(tmp_path) -> None:
+    archive = tmp_path / "dump.jsonl.gz"
+    _write_reddit_dump(archive)
+    source = ReplaySource(archive, SourceEnum.reddit, page_size=4)
+    worker = PipelineWorker([source], ReplayLMClient(), batch_size=2, concurrency=1)
+    active: list[int] = []
+    peak = 0
+
+    async def enrich_and_store(items) -> None:
+        nonlocal peak
+        active.append(len(items))
+        peak = max(peak, len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+
+    worker.enrich_and_store = enrich_and_store  # type: ignore[method-assign]
+    stats = await replay_source(worker, source, SINCE, batch_size=2, concurrency=2)
+
+    assert stats.processed == 7 and stats.batches == 4
+    assert peak == 2
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import select
+
+from src.config import get_settings
+from src.db import base, crud
+from src.db.base import Base, get_engine, get_session
+from src.db.models import Item, SourceEnum
+from src.ingest.base import NormalizedItem
+from src.llm.relevance import RELEVANCE_FILTER_MODEL, default_result
+from src.pipeline.reprocess import reprocess_items
+from src.pipeline.worker import PipelineWorker
+
+
+class UpgradedLMClient:
+    model = "new-llm"
+    embed_model = "new-embed"
+
+    async def warmup(self) -> None:
+        return None
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        return json.dumps({"topics": ["macro"], "sentiment": 0, "stance": "neutral", "impact": 1})
+
+    async def get_embeddings(self, texts):
+        return [[0.3, 0.4] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_reprocess_updates_stale_rows_and_checkpoints(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rows = [
+        NormalizedItem(
+            source=SourceEnum.reddit,
+            source_id=str(index),
+            text=f"Post {index}",
+            raw={},
+            published_at=datetime.now(tz=timezone.utc),
+        )
+        for index in range(5)
+    ]
+    async with get_session() as session:
+        await crud.upsert_items(
+            session,
+            [(row, None, [0.1, 0.2]) for row in rows],
+            embedded_with="old-embed",
+        )
+        off_topic = NormalizedItem(
+            source=SourceEnum.reddit,
+            source_id="off-topic",
+            text="Match report",
+            raw={},
+            published_at=datetime.now(tz=timezone.utc),
+        )
+        await crud.upsert_items(
+            session,
+            [(off_topic, default_result(), [0.3, 0.4])],
+            classified_with=RELEVANCE_FILTER_MODEL,
+            embedded_with="new-embed",
+        )
+
+    checkpoint = tmp_path / "reprocess.json"
+    worker = PipelineWorker([], UpgradedLMClient(), batch_size=2, concurrency=1)
+    selection = crud.ItemSelection(stale_llm_model="new-llm", stale_embed_model="new-embed")
+    stats = await reprocess_items(worker, selection, batch_size=2, checkpoint=checkpoint)
+
+    assert stats.processed == 5
+    assert stats.batches == 3
+    assert json.loads(checkpoint.read_text())["last_id"] == stats.last_id
+
+    async with get_session() as session:
+        items = (await session.execute(select(Item))).scalars().all()
+    assert {item.classified_with for item in items} == {"new-llm", RELEVANCE_FILTER_MODEL}
+    assert {item.embedded_with for item in items} == {"new-embed"}
+    assert all(item.topics == ["macro"] for item in items if item.source_id != "off-topic")
+
+    rerun = await reprocess_items(
+        worker,
+        crud.ItemSelection(stale_llm_model="new-llm", stale_embed_model="new-embed"),
+        batch_size=2,
+    )
+    assert rerun.processed == 0
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+pytest.importorskip("apscheduler")
+pytest.importorskip("openai")
+
+from src.config import get_settings
+from src.llm.client import LMStudioClient
+from src.pipeline.scheduler import log_llm_stats
+from src.pipeline.worker import PipelineWorker
+
+
+def test_log_llm_stats_logs_every_section(monkeypatch, caplog) -> None:
+    monkeypatch.setenv("RELEVANCE_FILTER", "false")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = LMStudioClient()
+    worker = PipelineWorker([], client, batch_size=10, concurrency=1)
+
+    with caplog.at_level(logging.INFO, logger="src.pipeline.scheduler"):
+        log_llm_stats(client, worker)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages.count("LLM concurrency") == 2
+    assert {"LLM circuits", "Classifier", "LLM endpoint"} <= set(messages)
+    limiters = [record for record in caplog.records if record.getMessage() == "LLM concurrency"]
+    assert [record.limiter for record in limiters] == ["chat", "embeddings"]
@@ -15,6 +15,7 @@ from src.db import base
 from src.db.base import Base, get_engine, get_session
 from src.db.models import Item, SourceEnum
 from src.ingest.base import BaseSource, NormalizedItem
+from src.pipeline.priority import Job
 from src.pipeline.worker import PipelineWorker
 
 
@@ -43,10 +44,13 @@ class DummySource(BaseSource):
 
 
 class DummyLMClient:
+    model = "dummy-llm"
+    embed_model = "dummy-embed"
+
     async def warmup(self) -> None:
         return None
 
-    async def achat(self, messages, max_tokens: int | None = None) -> str:
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
         return json.dumps(
             {
                 "topics": ["crypto"],
@@ -87,3 +91,218 @@ async def test_pipeline_worker_persists_items(monkeypatch) -> None:
         assert len(items) == 1
         assert items[0].topics == ["crypto"]
         assert items[0].embedding is not None
+
+
+class SlowLMClient(DummyLMClient):
+    def __init__(self) -> None:
+        self.slow = True
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        if self.slow:
+            await asyncio.sleep(10)
+        return await super().achat(messages, max_tokens, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_enrich_deadline_stores_pending_then_sweeps(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    monkeypatch.setenv("ITEM_ENRICH_TIMEOUT_SECONDS", "0.05")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    client = SlowLMClient()
+    worker = PipelineWorker([], client, batch_size=10, concurrency=1)
+    item = NormalizedItem(
+        source=SourceEnum.reddit,
+        source_id="slow",
+        text="ETF approval delayed",
+        raw={},
+        published_at=datetime.now(tz=timezone.utc),
+    )
+    await asyncio.wait_for(worker.enrich_and_store([item]), timeout=2)
+
+    async with get_session() as session:
+        stored = (await session.execute(select(Item))).scalar_one()
+        assert stored.enrichment_pending is True
+        assert stored.sentiment is None
+
+    client.slow = False
+    assert await worker.sweep_pending() == 1
+
+    async with get_session() as session:
+        stored = (await session.execute(select(Item))).scalar_one()
+        assert stored.enrichment_pending is False
+        assert stored.topics == ["crypto"]
+        assert stored.classified_with == "dummy-llm"
+
+
+@pytest.mark.asyncio
+async def test_sweep_takes_least_retried_oldest_first(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    monkeypatch.setenv("ITEM_ENRICH_TIMEOUT_SECONDS", "0.05")
+    monkeypatch.setenv("CLASSIFY_BATCH_SIZE", "1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    worker = PipelineWorker([], SlowLMClient(), batch_size=10, concurrency=1)
+    now = datetime.now(tz=timezone.utc)
+    items = [
+        NormalizedItem(source=SourceEnum.reddit, source_id=source_id, text="ETF news", raw={}, published_at=published_at)
+        for source_id, published_at in [("new", now), ("old", now - timedelta(days=1))]
+    ]
+    await worker.enrich_and_store(items)
+
+    async def attempts() -> dict[str, int]:
+        async with get_session() as session:
+            rows = (await session.execute(select(Item))).scalars()
+            return {row.source_id: row.enrichment_attempts for row in rows}
+
+    assert await worker.sweep_pending(limit=1) == 1
+    assert await attempts() == {"old": 1, "new": 0}
+    assert await worker.sweep_pending(limit=1) == 1
+    assert await attempts() == {"old": 1, "new": 1}
+
+
+class SlowBatchLMClient(DummyLMClient):
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        await asyncio.sleep(0.2)
+        result = json.loads(await super().achat(messages, max_tokens, **kwargs))
+        return json.dumps({"results": [{"index": index, **result} for index in range(4)]})
+
+
+@pytest.mark.asyncio
+async def test_pack_timeout_scales_with_pack_size(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    monkeypatch.setenv("ITEM_ENRICH_TIMEOUT_SECONDS", "0.1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    worker = PipelineWorker([], SlowBatchLMClient(), batch_size=10, concurrency=1)
+    now = datetime.now(tz=timezone.utc)
+    items = [
+        NormalizedItem(source=SourceEnum.reddit, source_id=f"p{index}", text=f"BTC news {index}", raw={}, published_at=now)
+        for index in range(4)
+    ]
+    # One batched request for four posts outlasts a single post's budget.
+    await worker.enrich_and_store(items)
+
+    async with get_session() as session:
+        rows = (await session.execute(select(Item))).scalars().all()
+    assert len(rows) == 4
+    assert all(row.enrichment_pending is False for row in rows)
+
+
+class CountingLMClient(DummyLMClient):
+    def __init__(self) -> None:
+        self.chat_calls = 0
+
+    async def achat(self, messages, max_tokens: int | None = None, **kwargs) -> str:
+        self.chat_calls += 1
+        return await super().achat(messages, max_tokens, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_relevance_filter_skips_llm_for_off_topic_posts(monkeypatch) -> None:
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    monkeypatch.setenv("RELEVANCE_FILTER", "true")
+    monkeypatch.setenv("CLASSIFY_BATCH_SIZE", "1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    base._engine = None  # type: ignore[attr-defined]
+    base._session_factory = None  # type: ignore[attr-defined]
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    client = CountingLMClient()
+    worker = PipelineWorker([], client, batch_size=10, concurrency=1)
+    now = datetime.now(tz=timezone.utc)
+    items = [
+        NormalizedItem(source=SourceEnum.reddit, source_id=source_id, text=text, raw={}, published_at=now)
+        for source_id, text in [("on", "SEC approves spot ETH ETF"), ("off", "Look at my new sourdough")]
+    ]
+    await worker.enrich_and_store(items)
+
+    assert client.chat_calls == 1
+    assert worker.relevance_stats is not None
+    assert worker.relevance_stats.skipped == 1
+    async with get_session() as session:
+        rows = {row.source_id: row for row in (await session.execute(select(Item))).scalars()}
+    assert rows["on"].classified_with == "dummy-llm"
+    assert rows["off"].classified_with == "relevance-filter"
+    assert rows["off"].stance == "neutral"
+    assert rows["off"].embedding is not None
+
+
+class StreamingSource(BaseSource):
+    def __init__(self) -> None:
+        super().__init__("reddit", SourceEnum.reddit)
+        self.release = asyncio.Event()
+
+    async def fetch_since(self, since: datetime) -> list[NormalizedItem]:
+        return [item async for item in self.stream_since(since)]
+
+    async def stream_since(self, since: datetime):
+        for index in range(5):
+            if index == 2:
+                await self.release.wait()
+            yield NormalizedItem(
+                source=self.source_enum,
+                source_id=f"s{index}",
+                text=f"Bitcoin update {index}",
+                raw={},
+                published_at=since + timedelta(minutes=index + 1),
+            )
+
+    async def normalize(self, raw):
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_process_job_queues_micro_batches_while_streaming(monkeypatch) -> None:
+    monkeypatch.setenv("OVERLOAD_QUEUE_DEPTH", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    source = StreamingSource()
+    worker = PipelineWorker([source], DummyLMClient(), batch_size=2, concurrency=1)
+    since = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+
+    task = asyncio.create_task(worker._process_job(Job(source_name=source.name, since=since)))
+    for _ in range(50):
+        if worker.queue_depth:
+            break
+        await asyncio.sleep(0.01)
+    # The first chunk is queued while the source is still blocked mid-stream.
+    assert worker.queue_depth == 2
+    assert not task.done()
+    assert source.name not in worker._last_seen
+
+    source.release.set()
+    await asyncio.wait_for(task, timeout=2)
+    assert worker.queue_depth == 5
+
+    # Pushed items skip the fetch and go straight to the enrichment queue.
+    pushed = NormalizedItem(
+        source=source.source_enum, source_id="push", text="ETH breaks out", raw={}, published_at=since
+    )
+    await worker.submit_items(source.name, [pushed])
+    assert worker.queue_depth == 6
+    assert worker._last_seen[source.name] == since + timedelta(minutes=5)
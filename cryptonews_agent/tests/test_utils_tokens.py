@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.llm import classifiers
+from src.utils.tokens import ApproxTokenizer, get_tokenizer
+
+
+def test_approx_tokenizer_counts_words_and_cyrillic() -> None:
+    tokenizer = ApproxTokenizer()
+    assert tokenizer.count("bitcoin") == 2
+    assert tokenizer.count("биткоин") == 4
+    assert tokenizer.count("BTC $70k!") == 5
+    assert tokenizer.truncate("bitcoin etf approved", 3) == "bitcoin etf"
+
+
+def test_unknown_tokenizer_falls_back_to_approximation() -> None:
+    assert isinstance(get_tokenizer("tiktoken:no_such_encoding"), ApproxTokenizer)
+
+
+def test_output_budget_scales_with_input() -> None:
+    small = classifiers.output_token_budget(10)
+    large = classifiers.output_token_budget(100_000)
+    assert small < large
+    assert large == classifiers.get_settings().classify_output_tokens_max